@@ -0,0 +1,293 @@
+import weakref
+from itertools import compress
+from array import array
+
+from libro import Libro
+
+
+class CodificadorDiccionario:
+    """
+    Codificación por diccionario: cada valor distinto (autor, género) se guarda
+    una sola vez y los registros guardan solo su código entero.
+    """
+
+    def __init__(self):
+        self.valores = []    # código -> valor
+        self._codigos = {}   # valor -> código
+
+    def __len__(self):
+        return len(self.valores)
+
+    def codificar(self, valor):
+        # Retorna el código del valor, asignando uno nuevo si no existía
+        codigo = self._codigos.get(valor)
+        if codigo is None:
+            codigo = self._codigos[valor] = len(self.valores)
+            self.valores.append(valor)
+        return codigo
+
+    def decodificar(self, codigo):
+        # Retorna el valor correspondiente a un código
+        return self.valores[codigo]
+
+
+def _columna(nombre):
+    # Crea la propiedad que lee/escribe un atributo del libro en la columna del almacén.
+    # Si el libro fue eliminado del almacén, usa la copia guardada en el slot heredado de Libro
+    slot = getattr(Libro, nombre)
+
+    def obtener(self):
+        if self._fila is None:
+            return slot.__get__(self)
+        return self._almacen._leer(nombre, self._fila)
+
+    def asignar(self, valor):
+        if self._fila is None:
+            slot.__set__(self, valor)
+        else:
+            self._almacen._escribir(nombre, self._fila, valor)
+
+    return property(obtener, asignar)
+
+
+class LibroColumnar(Libro):
+    """
+    Vista de un libro guardado en un AlmacenColumnarLibros.
+    Se comporta como un Libro (str, to_dict, setattr) pero lee y escribe
+    directamente en las columnas del almacén.
+    """
+
+    __slots__ = ('_almacen', '_fila', '__weakref__')
+
+    isbn = _columna('isbn')
+    titulo = _columna('titulo')
+    autor = _columna('autor')
+    año_publicacion = _columna('año_publicacion')
+    genero = _columna('genero')
+    disponible = _columna('disponible')
+
+    def __init__(self, almacen, fila):
+        # No llama a Libro.__init__: los datos ya están en las columnas
+        self._almacen = almacen
+        self._fila = fila
+
+    def _desvincular(self):
+        # Copia los valores actuales a los slots propios y se separa del almacén
+        valores = [(nombre, getattr(self, nombre)) for nombre in Libro.__slots__]
+        self._fila = None
+        for nombre, valor in valores:
+            setattr(self, nombre, valor)
+
+
+class AlmacenColumnarLibros:
+    """
+    Almacén principal de libros en columnas paralelas.
+    Año y disponibilidad se guardan en arreglos compactos (módulo array),
+    autor y género codificados por diccionario, y los objetos Libro se
+    materializan solo cuando se consultan. El almacén no retiene las vistas:
+    duran lo que dure la referencia de quien las pidió (los índices del sistema
+    guardan ISBN, no libros). Misma interfaz que AlmacenRegistros.
+    """
+
+    atributo_clave = 'isbn'
+
+    def __init__(self):
+        self.vaciar()
+
+    def vaciar(self):
+        # Elimina todos los libros y reinicia las columnas
+        self._filas = {}                  # isbn -> fila (mantiene el orden de inserción)
+        self._libres = []                 # Filas liberadas que se pueden reutilizar
+        self._vistas = weakref.WeakValueDictionary()  # fila -> LibroColumnar todavía en uso
+        self._isbn = []
+        self._titulo = []
+        self._autor = array('I')          # Códigos de autor
+        self._genero = array('I')         # Códigos de género
+        self._año = array('i')
+        self._disponible = array('b')
+        self.autores = CodificadorDiccionario()
+        self.generos = CodificadorDiccionario()
+
+    def copia_vacia(self):
+        # Nuevo almacén vacío del mismo tipo (para cargar datos sin tocar los actuales)
+        return AlmacenColumnarLibros()
+
+    # ----- Acceso a columnas (usado por LibroColumnar) -----
+
+    def _leer(self, nombre, fila):
+        if nombre == 'isbn':
+            return self._isbn[fila]
+        if nombre == 'titulo':
+            return self._titulo[fila]
+        if nombre == 'autor':
+            return self.autores.decodificar(self._autor[fila])
+        if nombre == 'año_publicacion':
+            return self._año[fila]
+        if nombre == 'genero':
+            return self.generos.decodificar(self._genero[fila])
+        return bool(self._disponible[fila])
+
+    def _escribir(self, nombre, fila, valor):
+        if nombre == 'isbn':
+            self._isbn[fila] = valor
+        elif nombre == 'titulo':
+            self._titulo[fila] = valor
+        elif nombre == 'autor':
+            self._autor[fila] = self.autores.codificar(valor)
+        elif nombre == 'año_publicacion':
+            self._año[fila] = valor
+        elif nombre == 'genero':
+            self._genero[fila] = self.generos.codificar(valor)
+        else:
+            self._disponible[fila] = 1 if valor else 0
+
+    def _vista(self, fila):
+        # Materializa el Libro de una fila; mientras alguien use la vista se retorna la misma
+        vista = self._vistas.get(fila)
+        if vista is None:
+            vista = self._vistas[fila] = LibroColumnar(self, fila)
+        return vista
+
+    # ----- Interfaz de almacén (igual que AlmacenRegistros) -----
+
+    @property
+    def tamanio(self):
+        return len(self._filas)
+
+    def __len__(self):
+        return len(self._filas)
+
+    def __iter__(self):
+        # Recorre los libros en orden de inserción
+        for fila in list(self._filas.values()):
+            yield self._vista(fila)
+
+    def __contains__(self, isbn):
+        return isbn in self._filas
+
+    def esta_vacia(self):
+        return not self._filas
+
+    def obtener_clave(self, libro):
+        return libro.isbn
+
+    def agregar(self, libro):
+        # Copia los datos del libro a las columnas en O(1)
+        if libro.isbn in self._filas:
+            return False
+        valores = (libro.isbn, libro.titulo, self.autores.codificar(libro.autor),
+                   self.generos.codificar(libro.genero), libro.año_publicacion,
+                   1 if libro.disponible else 0)
+        if self._libres:
+            fila = self._libres.pop()
+            (self._isbn[fila], self._titulo[fila], self._autor[fila], self._genero[fila],
+             self._año[fila], self._disponible[fila]) = valores
+        else:
+            fila = len(self._isbn)
+            for columna, valor in zip((self._isbn, self._titulo, self._autor, self._genero,
+                                       self._año, self._disponible), valores):
+                columna.append(valor)
+        self._filas[libro.isbn] = fila
+        return True
+
+    def eliminar(self, isbn):
+        # Libera la fila del libro (se reutiliza en la próxima inserción)
+        fila = self._filas.pop(isbn, None)
+        if fila is None:
+            return False
+        vista = self._vistas.pop(fila, None)
+        if vista is not None:
+            vista._desvincular()  # Quien conserve la referencia sigue viendo los datos
+        self._isbn[fila] = None
+        self._titulo[fila] = None
+        self._libres.append(fila)
+        return True
+
+    def buscar(self, isbn):
+        fila = self._filas.get(isbn)
+        return None if fila is None else self._vista(fila)
+
+    def listar(self):
+        return list(self)
+
+    def actualizar(self, isbn, nuevos_datos):
+        libro = self.buscar(isbn)
+        if libro is None:
+            return False
+        if nuevos_datos.get('isbn', isbn) != isbn and nuevos_datos['isbn'] in self._filas:
+            return False  # El ISBN nuevo ya es de otro libro
+        for campo, valor in nuevos_datos.items():
+            if hasattr(libro, campo):
+                setattr(libro, campo, valor)
+        if libro.isbn != isbn:
+            self.reubicar(isbn, libro)
+        return True
+
+    def reubicar(self, isbn_anterior, libro):
+        # Vuelve a indexar la fila de un libro cuyo ISBN cambió; si el ISBN nuevo
+        # ya es de otra fila no cambia nada y retorna False
+        fila = self._filas.get(isbn_anterior)
+        if self._filas.get(libro.isbn, fila) != fila:
+            return False
+        if fila is not None:
+            del self._filas[isbn_anterior]
+            self._filas[libro.isbn] = fila
+        return True
+
+    # ----- Recorridos sobre columnas -----
+
+    def _filas_disponibles(self):
+        # Filas de los libros disponibles
+        if not self._libres:
+            # Sin filas liberadas todas las filas están ocupadas: se filtra el arreglo directamente
+            return compress(range(len(self._disponible)), self._disponible)
+        disponible = self._disponible
+        return (fila for fila in self._filas.values() if disponible[fila])
+
+    def listar_disponibles(self):
+        # Recorre solo la columna de disponibilidad y materializa los libros que coinciden
+        vista = self._vista
+        return [vista(fila) for fila in self._filas_disponibles()]
+
+    def contar_disponibles(self):
+        # Cuenta los libros disponibles sin materializar ninguno
+        if not self._libres:
+            return self._disponible.count(1)
+        return sum(1 for _ in self._filas_disponibles())
+
+    def listar_por_rango_años(self, año_inicio, año_fin):
+        # Recorre la columna de años y materializa solo los libros del rango, ordenados
+        # por año y por ISBN dentro de cada año (como IndiceAños)
+        años = self._año
+        filas = sorted((años[fila], isbn, fila) for isbn, fila in self._filas.items()
+                       if año_inicio <= años[fila] <= año_fin)
+        vista = self._vista
+        return [vista(fila) for _, _, fila in filas]
+
+    def __str__(self):
+        elementos = [str(libro) for libro in self]
+        return " -> ".join(elementos) if elementos else "Almacén vacío"
+
+
+# Bloque de prueba para verificar el funcionamiento del almacén columnar
+if __name__ == "__main__":
+    print("=== Prueba del almacén columnar ===")
+
+    almacen = AlmacenColumnarLibros()
+    almacen.agregar(Libro("978-0142437230", "1984", "George Orwell", 1949, "Ciencia Ficción"))
+    almacen.agregar(Libro("978-0451526342", "Animal Farm", "George Orwell", 1945, "Sátira"))
+    print(f"Almacén: {almacen}")
+    print(f"Autores distintos: {len(almacen.autores)}")
+
+    # Modificar un libro a través de su vista
+    libro = almacen.buscar("978-0142437230")
+    libro.disponible = False
+    print(f"Después de prestar: {almacen.buscar('978-0142437230')}")
+    print(f"Disponibles: {[l.titulo for l in almacen.listar_disponibles()]}")
+
+    # Eliminar un libro: la referencia conserva sus datos
+    almacen.eliminar("978-0142437230")
+    print(f"Libro eliminado (copia): {libro}")
+    print(f"Almacén final: {almacen}")
+
+    print("=== Prueba completada ===")
@@ -0,0 +1,361 @@
+import contextlib
+import heapq
+import multiprocessing
+import os
+import threading
+import zlib
+from itertools import islice
+from multiprocessing.reduction import ForkingPickler
+
+from estructuras import ArbolAVLLibros, IndiceAños
+from libro import Libro
+from persistencia import sin_recolector
+
+
+def particion_de(isbn, particiones):
+    """
+    Partición dueña de un ISBN. Usa un hash estable (CRC32) y no hash(), que cambia
+    de un proceso a otro.
+
+    Args:
+        isbn (str): ISBN del libro
+        particiones (int): Cantidad de particiones
+
+    Returns:
+        int: Número de partición (0 .. particiones - 1)
+    """
+    return zlib.crc32(isbn.encode('utf-8')) % particiones
+
+
+def _registro(libro):
+    # Campos que indexa una partición (el libro completo sigue en el sistema)
+    return (libro.isbn, libro.titulo, libro.autor, libro.año_publicacion)
+
+
+class ParticionCatalogo:
+    """
+    Una partición del catálogo: los libros cuyo ISBN le corresponde, con sus propios
+    árboles AVL (ISBN, título y autor) y su índice por año. Vive en un proceso
+    trabajador y solo guarda los campos indexados.
+    """
+
+    TIPOS = ('isbn', 'titulo', 'autor')
+
+    def __init__(self):
+        self.libros = {}
+        self.arboles = {tipo: ArbolAVLLibros(tipo) for tipo in self.TIPOS}
+        self.indice_años = IndiceAños()
+
+    def cargar(self, registros):
+        # Reemplaza el contenido y arma los índices en bloque
+        with sin_recolector():
+            self.libros = {registro[0]: Libro(*registro, '') for registro in registros}
+            for arbol in self.arboles.values():
+                arbol.construir(self.libros.values())
+            self.indice_años = IndiceAños()
+            self.indice_años.construir(self.libros.values())
+        return len(self.libros)
+
+    def agregar(self, registro):
+        libro = self.libros[registro[0]] = Libro(*registro, '')
+        for arbol in self.arboles.values():
+            arbol.insertar(libro)
+        self.indice_años.agregar(libro)
+        return True
+
+    def eliminar(self, isbn):
+        libro = self.libros.pop(isbn, None)
+        if libro is None:
+            return False
+        for arbol in self.arboles.values():
+            arbol.eliminar(arbol.obtener_clave(libro), libro)
+        self.indice_años.eliminar(isbn, libro.año_publicacion)
+        return True
+
+    def actualizar(self, isbn_anterior, registro):
+        # Cambio de un libro que sigue en esta partición: se reemplaza en un solo mensaje
+        self.eliminar(isbn_anterior)
+        return self.agregar(registro)
+
+    def buscar_isbn(self, isbn):
+        libro = self.libros.get(isbn)
+        return _registro(libro) if libro is not None else None
+
+    def buscar_prefijo(self, tipo, prefijo, limite, cursor):
+        # Pares (clave, ISBN) en el orden del árbol: se pueden mezclar con los de otras particiones
+        arbol = self.arboles[tipo]
+        obtener_clave, libros = arbol.obtener_clave, self.libros
+        return [(obtener_clave(libros[isbn]), isbn) for isbn in arbol.buscar_prefijo(prefijo, limite, 0, cursor)]
+
+    def rango_años(self, año_inicio, año_fin):
+        # Un par (año, ISBN de ese año) por año: menos objetos que enviar que un par por libro
+        return [(año, list(grupo)) for año, grupo in self.indice_años.grupos_rango(año_inicio, año_fin)]
+
+    def contar(self):
+        return len(self.libros)
+
+
+def _atender_particion(conexion):
+    # Bucle del proceso trabajador: recibe (operación, argumentos) y responde (éxito, resultado)
+    particion = ParticionCatalogo()
+    while True:
+        try:
+            mensaje = conexion.recv()
+        except EOFError:
+            break
+        if mensaje is None:
+            break
+        operacion, args = mensaje
+        try:
+            respuesta = (True, getattr(particion, operacion)(*args))
+        except Exception as e:
+            respuesta = (False, f"{type(e).__name__}: {e}")
+        conexion.send(respuesta)
+    conexion.close()
+
+
+class CatalogoParticionado:
+    """
+    Índices de búsqueda de libros repartidos en particiones por hash del ISBN, cada
+    una en su propio proceso (sin compartir el GIL con el sistema ni entre ellas).
+
+    Las búsquedas por ISBN van a una sola partición. Las búsquedas por título, autor
+    y rango de años se envían a todas a la vez, cada proceso busca en paralelo en
+    sus índices, y los resultados parciales, ya ordenados, se mezclan con
+    heapq.merge. Los resultados son ISBN: los libros completos los tiene el sistema.
+
+    Cada consulta paga el envío entre procesos y la mezcla de resultados: con el
+    catálogo en memoria, una búsqueda repartida es del orden de 8 a 15 veces más
+    lenta que la misma búsqueda en los índices locales (ver prueba_catalogo_particionado
+    en pruebas_rendimiento.py). Por eso es opcional; conviene solo cuando las búsquedas
+    de muchos hilos a la vez compiten por el GIL y hay núcleos libres.
+
+    Si una partición falla a mitad de una operación, su conexión se cierra (las
+    operaciones siguientes que la necesiten fallan con RuntimeError) y las respuestas
+    pendientes de las demás se descartan, para que ninguna quede desfasada.
+    """
+
+    def __init__(self, particiones=None):
+        """
+        Inicia un proceso trabajador por partición.
+
+        Args:
+            particiones (int, optional): Cantidad de particiones (por defecto, una por núcleo)
+        """
+        self.particiones = particiones or os.cpu_count() or 1
+        # 'spawn' y no 'fork': el proceso principal tiene hilos (autoguardado, interfaz)
+        contexto = multiprocessing.get_context('spawn')
+        self._conexiones = []
+        self._procesos = []
+        # Un cerrojo por conexión: varios hilos pueden consultar a la vez sin mezclar respuestas
+        self._cerrojos = [threading.Lock() for _ in range(self.particiones)]
+        self._claves = {tipo: ArbolAVLLibros(tipo) for tipo in ParticionCatalogo.TIPOS}
+        for _ in range(self.particiones):
+            local, remota = contexto.Pipe()
+            proceso = contexto.Process(target=_atender_particion, args=(remota,), daemon=True)
+            proceso.start()
+            remota.close()
+            self._conexiones.append(local)
+            self._procesos.append(proceso)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+    def _conexion(self, particion):
+        # Conexión con una partición, si sigue en uso
+        conexion = self._conexiones[particion]
+        if conexion.closed:
+            raise RuntimeError(f"La partición {particion} dejó de responder; vuelva a particionar el catálogo")
+        return conexion
+
+    def _descartar_respuesta(self, particion):
+        # Lee y descarta una respuesta pendiente; si no llega, la conexión se cierra
+        conexion = self._conexiones[particion]
+        try:
+            conexion.recv()
+        except Exception:
+            conexion.close()
+
+    def _pedir(self, particion, operacion, *args):
+        # Envía una operación a una partición y espera su respuesta
+        mensaje = ForkingPickler.dumps((operacion, args))
+        with self._cerrojos[particion]:
+            conexion = self._conexion(particion)
+            try:
+                conexion.send_bytes(mensaje)
+                exito, resultado = conexion.recv()
+            except BaseException:
+                # Una respuesta sin leer o a medio leer desfasaría las siguientes
+                conexion.close()
+                raise
+        if not exito:
+            raise RuntimeError(resultado)
+        return resultado
+
+    def _difundir(self, operacion, args_por_particion):
+        """
+        Envía una operación a todas las particiones antes de esperar la primera
+        respuesta, para que trabajen a la vez.
+
+        Returns:
+            list: Resultado de cada partición, en orden de partición
+        """
+        # Los mensajes se serializan antes de enviar nada: un argumento que no se puede
+        # enviar no deja a ninguna partición con la operación a medias
+        mensajes = [ForkingPickler.dumps((operacion, args)) for args in args_por_particion]
+        # Los cerrojos se toman siempre en el mismo orden: dos hilos no se bloquean cruzados
+        tomados = 0
+        enviados = 0
+        fallida = None
+        respuestas = []
+        try:
+            for particion, mensaje in enumerate(mensajes):
+                self._cerrojos[particion].acquire()
+                tomados += 1
+                fallida = particion
+                self._conexion(particion).send_bytes(mensaje)
+                enviados += 1
+                fallida = None
+            for particion in range(self.particiones):
+                fallida = particion
+                respuestas.append(self._conexiones[particion].recv())
+                fallida = None
+                self._cerrojos[particion].release()
+        except BaseException:
+            # La conexión que falló queda en un estado desconocido y se cierra; las otras
+            # que recibieron la operación tienen su respuesta pendiente: se lee y se descarta
+            if fallida is not None:
+                self._conexiones[fallida].close()
+            for particion in range(len(respuestas), enviados):
+                if particion != fallida:
+                    self._descartar_respuesta(particion)
+            raise
+        finally:
+            for particion in range(len(respuestas), tomados):
+                self._cerrojos[particion].release()
+        for exito, resultado in respuestas:
+            if not exito:
+                raise RuntimeError(resultado)
+        return [resultado for _, resultado in respuestas]
+
+    def cargar(self, libros):
+        """
+        Reemplaza el contenido de todas las particiones.
+
+        Args:
+            libros (iterable): Libros del catálogo completo
+        """
+        registros = [[] for _ in range(self.particiones)]
+        for libro in libros:
+            registros[particion_de(libro.isbn, self.particiones)].append(_registro(libro))
+        return sum(self._difundir('cargar', [(tanda,) for tanda in registros]))
+
+    def agregar(self, libro):
+        return self._pedir(particion_de(libro.isbn, self.particiones), 'agregar', _registro(libro))
+
+    def eliminar(self, isbn):
+        return self._pedir(particion_de(isbn, self.particiones), 'eliminar', isbn)
+
+    def actualizar(self, isbn_anterior, libro):
+        # Un cambio de ISBN puede mover el libro a otra partición; si la de destino
+        # falla, el libro vuelve a la de origen
+        origen = particion_de(isbn_anterior, self.particiones)
+        destino = particion_de(libro.isbn, self.particiones)
+        if origen == destino:
+            return self._pedir(origen, 'actualizar', isbn_anterior, _registro(libro))
+        anterior = self._pedir(origen, 'buscar_isbn', isbn_anterior)
+        self._pedir(origen, 'eliminar', isbn_anterior)
+        try:
+            return self._pedir(destino, 'agregar', _registro(libro))
+        except BaseException:
+            if anterior is not None:
+                with contextlib.suppress(Exception):
+                    self._pedir(origen, 'agregar', anterior)
+            raise
+
+    def buscar_isbn(self, isbn):
+        """
+        Busca un ISBN consultando solo a la partición que le corresponde.
+
+        Returns:
+            tuple: (isbn, titulo, autor, año_publicacion) o None si no está
+        """
+        return self._pedir(particion_de(isbn, self.particiones), 'buscar_isbn', isbn)
+
+    def buscar_prefijo(self, tipo, prefijo, limite=None, desplazamiento=0, cursor=None):
+        """
+        Búsqueda por prefijo en todas las particiones, con la misma paginación que
+        ArbolAVLLibros.buscar_prefijo.
+
+        Args:
+            tipo (str): Índice a consultar: 'isbn', 'titulo' o 'autor'
+            prefijo (str): Prefijo a buscar
+            limite (int, optional): Máximo de resultados (None = todos)
+            desplazamiento (int): Cantidad de coincidencias a saltar
+            cursor (tuple, optional): Cursor (cursor_de) del último libro ya mostrado
+
+        Returns:
+            list: ISBN de los libros que coinciden, ordenados por (clave, ISBN)
+        """
+        if limite is not None and limite <= 0:
+            return []
+        # Cada partición aporta como mucho desplazamiento + limite: el resto no puede entrar en la página
+        fin = None if limite is None else desplazamiento + limite
+        parciales = self._difundir('buscar_prefijo', [(tipo, prefijo, fin, cursor)] * self.particiones)
+        return [isbn for _, isbn in islice(heapq.merge(*parciales), desplazamiento, fin)]
+
+    def rango_años(self, año_inicio, año_fin):
+        """
+        Libros publicados entre dos años (inclusive) en todas las particiones.
+
+        Returns:
+            list: ISBN de los libros del rango, en orden de año (y de ISBN dentro de cada año)
+        """
+        parciales = self._difundir('rango_años', [(año_inicio, año_fin)] * self.particiones)
+        pares = (((año, isbn) for año, isbns in parcial for isbn in isbns) for parcial in parciales)
+        return [isbn for _, isbn in heapq.merge(*pares)]
+
+    def cursor_de(self, libro, tipo='titulo'):
+        # Cursor de paginación de un libro, igual al de ArbolAVLLibros.cursor_de
+        return self._claves[tipo].cursor_de(libro)
+
+    def contar(self):
+        return sum(self._difundir('contar', [()] * self.particiones))
+
+    def cerrar(self):
+        # Termina los procesos trabajadores
+        for cerrojo, conexion in zip(self._cerrojos, self._conexiones):
+            with cerrojo:
+                if not conexion.closed:
+                    try:
+                        conexion.send(None)
+                    except OSError:
+                        pass
+                    conexion.close()
+        for proceso in self._procesos:
+            proceso.join(timeout=5)
+            if proceso.is_alive():
+                proceso.terminate()
+
+
+# Bloque de prueba para verificar el funcionamiento del catálogo particionado
+if __name__ == "__main__":
+    print("=== Prueba del catálogo particionado ===")
+    libros = [
+        Libro("978-0142437230", "1984", "George Orwell", 1949, "Ciencia Ficción"),
+        Libro("978-0061120084", "To Kill a Mockingbird", "Harper Lee", 1960, "Ficción"),
+        Libro("978-0544003415", "The Hobbit", "J.R.R. Tolkien", 1937, "Fantasía"),
+        Libro("978-0451524935", "The Great Gatsby", "F. Scott Fitzgerald", 1925, "Ficción"),
+        Libro("978-0141439518", "Pride and Prejudice", "Jane Austen", 1813, "Romance"),
+    ]
+    with CatalogoParticionado(3) as catalogo:
+        print(f"Libros cargados: {catalogo.cargar(libros)}")
+        for libro in libros:
+            print(f"{libro.isbn} -> partición {particion_de(libro.isbn, catalogo.particiones)}")
+        print(f"Títulos que empiezan con 'the': {catalogo.buscar_prefijo('titulo', 'the')}")
+        print(f"Publicados entre 1900 y 1960: {catalogo.rango_años(1900, 1960)}")
+        print(f"Buscar ISBN 978-0544003415: {catalogo.buscar_isbn('978-0544003415')}")
+    print("=== Prueba completada ===")
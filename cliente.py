@@ -0,0 +1,149 @@
+import functools
+import socket
+import threading
+
+from estructuras import ArbolAVLLibros
+from protocolo import PUERTO, codificar, decodificar
+
+
+class ErrorServidor(Exception):
+    """Error que el servidor retornó para una solicitud"""
+
+
+class ClienteBiblioteca:
+    """
+    Cliente del servidor de biblioteca (servidor.py) con los mismos métodos que
+    SistemaBiblioteca: cada llamada es una solicitud al servidor y retorna lo mismo
+    que el método del sistema (libros, usuarios y préstamos como objetos). La
+    interfaz gráfica lo puede usar en lugar de un sistema propio, y así todos los
+    mostradores comparten los mismos datos.
+
+    Se puede usar desde varios hilos: las llamadas de una misma conexión se
+    envían de a una.
+    """
+
+    def __init__(self, host='127.0.0.1', puerto=PUERTO, ruta_socket=None, tiempo_espera=60.0):
+        """
+        Se conecta al servidor por TCP o, si se indica ruta_socket, por un socket Unix.
+
+        Args:
+            host (str): Dirección del servidor
+            puerto (int): Puerto TCP del servidor
+            ruta_socket (str, optional): Ruta del socket Unix del servidor
+            tiempo_espera (float): Segundos máximos de espera por una respuesta
+        """
+        if ruta_socket is not None:
+            self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._socket.settimeout(tiempo_espera)
+            self._socket.connect(ruta_socket)
+        else:
+            self._socket = socket.create_connection((host, puerto), timeout=tiempo_espera)
+            self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._entrada = self._socket.makefile('rb')
+        self._cerrojo = threading.Lock()
+        self._ultimo_id = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+    def cerrar(self):
+        # Cierra la conexión con el servidor
+        self._entrada.close()
+        self._socket.close()
+
+    def llamar(self, operacion, *args, **kwargs):
+        """
+        Ejecuta un método del sistema en el servidor y espera su resultado.
+
+        Raises:
+            ErrorServidor: Si el servidor no pudo ejecutar la operación
+        """
+        return self.llamar_varias([(operacion, args, kwargs)])[0]
+
+    def llamar_varias(self, solicitudes):
+        """
+        Envía varias solicitudes juntas, sin esperar cada respuesta antes de enviar la
+        siguiente (una sola ida y vuelta). Las escrituras se ejecutan en el orden dado;
+        las consultas pueden ejecutarse antes que escrituras anteriores del mismo lote.
+
+        Args:
+            solicitudes (list): Tuplas (operación, args, kwargs)
+
+        Returns:
+            list: Resultado de cada solicitud, en el mismo orden
+
+        Raises:
+            ErrorServidor: Si el servidor no pudo ejecutar alguna de las operaciones
+        """
+        with self._cerrojo:
+            ids = []
+            lote = []
+            for operacion, args, kwargs in solicitudes:
+                self._ultimo_id += 1
+                ids.append(self._ultimo_id)
+                lote.append(codificar({'id': self._ultimo_id, 'op': operacion, 'args': list(args),
+                                       'kwargs': kwargs}))
+            self._socket.sendall(b''.join(lote))
+            # Las respuestas pueden llegar en otro orden: se ubican por id
+            respuestas = {}
+            while len(respuestas) < len(ids):
+                linea = self._entrada.readline()
+                if not linea:
+                    raise ConnectionError("El servidor cerró la conexión")
+                respuesta = decodificar(linea)
+                respuestas[respuesta['id']] = respuesta
+        resultados = []
+        for id_solicitud in ids:
+            respuesta = respuestas[id_solicitud]
+            if not respuesta['ok']:
+                raise ErrorServidor(respuesta['error'])
+            # JSON no tiene tuplas: (éxito, mensaje) llega como lista [éxito, mensaje]
+            resultados.append(respuesta['resultado'])
+        return resultados
+
+    def __getattr__(self, nombre):
+        # Cualquier otro método público del sistema se pide al servidor
+        if nombre.startswith('_'):
+            raise AttributeError(nombre)
+        return functools.partial(self.llamar, nombre)
+
+    # ===== MÉTODOS QUE EL CLIENTE RESUELVE DE OTRA FORMA =====
+
+    def cursor_libro(self, libro, indice='titulo'):
+        # El cursor solo depende del libro: se calcula aquí, sin ir al servidor
+        return ArbolAVLLibros('autor' if indice == 'autor' else 'titulo').cursor_de(libro)
+
+    def guardar_cambios(self, archivo=None, compacto=False, forzar=False):
+        # El servidor guarda en su propio archivo de datos
+        return self.llamar('guardar_cambios')
+
+    def cargar_datos(self, archivo=None):
+        # El servidor vuelve a cargar su propio archivo de datos
+        return self.llamar('cargar_datos')
+
+    def iniciar_autoguardado(self, archivo=None, intervalo=30.0, compacto=True):
+        # El autoguardado lo hace el servidor
+        return True, "El servidor guarda los datos periódicamente"
+
+    def detener_autoguardado(self):
+        pass
+
+    def precalentar_indices(self, nombres=None, en_segundo_plano=False):
+        # El servidor construye sus índices al iniciar
+        return True, "Índices construidos por el servidor"
+
+
+# Bloque de prueba: requiere un servidor en marcha (python servidor.py)
+if __name__ == "__main__":
+    print("=== Prueba del cliente de biblioteca ===")
+    with ClienteBiblioteca() as cliente:
+        for libro in cliente.buscar_libros_por_titulo("the", 5):
+            print(f"Libro: {libro}")
+        print(f"Estadísticas 1900-2000: {cliente.generar_estadisticas_por_año(1900, 2000)}")
+        resultados = cliente.llamar_varias([('buscar_libro_por_isbn', ("978-0142437230",), {}),
+                                            ('listar_usuarios', (), {})])
+        print(f"Dos solicitudes en una ida y vuelta: {resultados}")
+    print("=== Prueba completada ===")
@@ -0,0 +1,137 @@
+import threading
+
+
+class CerrojoLecturaEscritura:
+    """
+    Cerrojo de lectura/escritura: muchos lectores a la vez o un único escritor.
+
+    - Los escritores tienen preferencia: mientras uno espera, los lectores nuevos
+      esperan detrás de él (un flujo continuo de consultas no lo deja sin turno).
+    - Es reentrante: un hilo que lee puede volver a leer, y un hilo que escribe
+      puede volver a escribir o leer (una operación puede llamar a otras).
+    - Un lector no puede pasar a escritor: dos lectores que lo intentaran a la vez
+      se esperarían mutuamente para siempre, así que se rechaza con RuntimeError.
+
+    Uso:
+        with cerrojo.lectura(): ...
+        with cerrojo.escritura(): ...
+    """
+
+    def __init__(self):
+        # El estado se protege con _mutex; _condicion (sobre el mismo mutex) solo se usa para esperar
+        self._mutex = threading.Lock()
+        self._condicion = threading.Condition(self._mutex)
+        self._lectores = {}               # Identificador de hilo -> lecturas anidadas
+        self._escritor = None             # Identificador del hilo que escribe
+        self._escrituras = 0              # Escrituras anidadas del escritor actual
+        self._escritores_esperando = 0
+        self._modo_lectura = _Modo(self.adquirir_lectura, self.liberar_lectura)
+        self._modo_escritura = _Modo(self.adquirir_escritura, self.liberar_escritura)
+
+    def lectura(self):
+        # Administrador de contexto para leer (se reutiliza: no crea objetos por llamada)
+        return self._modo_lectura
+
+    def escritura(self):
+        # Administrador de contexto para escribir
+        return self._modo_escritura
+
+    def adquirir_lectura(self):
+        hilo = threading.get_ident()
+        with self._mutex:
+            anidadas = self._lectores.get(hilo)
+            if anidadas is None and self._escritor != hilo:
+                while self._escritor is not None or self._escritores_esperando:
+                    self._condicion.wait()
+            self._lectores[hilo] = (anidadas or 0) + 1
+
+    def liberar_lectura(self):
+        hilo = threading.get_ident()
+        with self._mutex:
+            anidadas = self._lectores.get(hilo)
+            if anidadas is None:
+                raise RuntimeError("El hilo no tiene el cerrojo de lectura")
+            if anidadas > 1:
+                self._lectores[hilo] = anidadas - 1
+            else:
+                del self._lectores[hilo]
+                if not self._lectores:
+                    self._condicion.notify_all()
+
+    def adquirir_escritura(self):
+        hilo = threading.get_ident()
+        with self._mutex:
+            if self._escritor == hilo:
+                self._escrituras += 1
+                return
+            if hilo in self._lectores:
+                raise RuntimeError("No se puede pasar de lectura a escritura")
+            self._escritores_esperando += 1
+            try:
+                while self._escritor is not None or self._lectores:
+                    self._condicion.wait()
+            finally:
+                self._escritores_esperando -= 1
+            self._escritor = hilo
+            self._escrituras = 1
+
+    def liberar_escritura(self):
+        with self._mutex:
+            if self._escritor != threading.get_ident():
+                raise RuntimeError("El hilo no tiene el cerrojo de escritura")
+            self._escrituras -= 1
+            if not self._escrituras:
+                self._escritor = None
+                self._condicion.notify_all()
+
+
+class _Modo:
+    # Administrador de contexto de un modo (lectura o escritura) del cerrojo
+    __slots__ = ('_adquirir', '_liberar')
+
+    def __init__(self, adquirir, liberar):
+        self._adquirir = adquirir
+        self._liberar = liberar
+
+    def __enter__(self):
+        self._adquirir()
+
+    def __exit__(self, *excepcion):
+        self._liberar()
+
+
+# Bloque de prueba para verificar el funcionamiento del cerrojo
+if __name__ == "__main__":
+    import time
+
+    print("=== Prueba del cerrojo de lectura/escritura ===")
+    cerrojo = CerrojoLecturaEscritura()
+    eventos = []
+
+    def lector(nombre):
+        with cerrojo.lectura():
+            eventos.append(f"{nombre} empieza a leer")
+            time.sleep(0.1)
+            eventos.append(f"{nombre} termina de leer")
+
+    def escritor():
+        with cerrojo.escritura():
+            with cerrojo.lectura():  # Un escritor también puede leer
+                eventos.append("escritor escribe")
+
+    hilos = [threading.Thread(target=lector, args=(f"lector {i}",)) for i in range(3)]
+    hilos.append(threading.Thread(target=escritor))
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    for evento in eventos:
+        print(evento)
+
+    with cerrojo.lectura():
+        try:
+            cerrojo.adquirir_escritura()
+        except RuntimeError as e:
+            print(f"Lectura -> escritura rechazada: {e}")
+
+    print("=== Prueba completada ===")
@@ -0,0 +1,152 @@
+import json
+import os
+import time
+
+# Políticas de sincronización con el disco (fsync) después de cada registro
+SINCRONIZAR_SIEMPRE = 'siempre'      # fsync en cada operación: no se pierde nada confirmado
+SINCRONIZAR_INTERVALO = 'intervalo'  # fsync como mucho una vez por intervalo
+SINCRONIZAR_NUNCA = 'nunca'          # Solo flush: el sistema operativo decide cuándo escribir
+
+_codificador = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+
+
+class DiarioOperaciones:
+    """
+    Diario de solo anexado: una línea JSON compacta por operación que modificó
+    el sistema ({"n": secuencia, "op": método, "args": [...], "kwargs": {...}}).
+    Tras una caída, reaplicar el diario sobre la última instantánea recupera
+    todas las operaciones confirmadas.
+    """
+
+    def __init__(self, ruta, sincronizar=SINCRONIZAR_SIEMPRE, intervalo=1.0, secuencia=0):
+        """
+        Abre (o crea) el diario para agregar operaciones al final.
+
+        Args:
+            ruta (str): Ruta del archivo del diario
+            sincronizar (str): Política de fsync ('siempre', 'intervalo' o 'nunca')
+            intervalo (float): Segundos entre fsync con la política 'intervalo'
+            secuencia (int): Último número de secuencia ya usado
+        """
+        if sincronizar not in (SINCRONIZAR_SIEMPRE, SINCRONIZAR_INTERVALO, SINCRONIZAR_NUNCA):
+            raise ValueError(f"Política de sincronización desconocida: {sincronizar}")
+        self.ruta = ruta
+        self.sincronizar = sincronizar
+        self.intervalo = intervalo
+        self.secuencia = secuencia
+        self._ultima_sincronizacion = time.monotonic()
+        # Operaciones en este archivo, incluidas las que ya tenía al abrirlo
+        self.operaciones = _descartar_linea_incompleta(ruta)
+        self._archivo = open(ruta, 'a', encoding='utf-8')
+
+    def registrar(self, operacion, args=(), kwargs=None):
+        """
+        Agrega una operación al final del diario y la sincroniza según la política.
+
+        Args:
+            operacion (str): Nombre del método de SistemaBiblioteca
+            args (tuple): Argumentos posicionales de la llamada
+            kwargs (dict): Argumentos por nombre de la llamada
+
+        Returns:
+            int: Número de secuencia asignado a la operación
+        """
+        self.secuencia += 1
+        entrada = {'n': self.secuencia, 'op': operacion, 'args': list(args)}
+        if kwargs:
+            entrada['kwargs'] = kwargs
+        self._archivo.write(_codificador.encode(entrada) + '\n')
+        self._archivo.flush()
+        self.operaciones += 1
+
+        if self.sincronizar == SINCRONIZAR_SIEMPRE:
+            os.fsync(self._archivo.fileno())
+        elif self.sincronizar == SINCRONIZAR_INTERVALO:
+            ahora = time.monotonic()
+            if ahora - self._ultima_sincronizacion >= self.intervalo:
+                os.fsync(self._archivo.fileno())
+                self._ultima_sincronizacion = ahora
+        return self.secuencia
+
+    def rotar(self, ruta_anterior):
+        """
+        Cierra el archivo actual renombrándolo y empieza uno vacío en la misma ruta.
+        Las operaciones del archivo renombrado quedan pendientes de compactar.
+
+        Args:
+            ruta_anterior (str): Nueva ruta del archivo que se cierra
+        """
+        self.cerrar()
+        os.replace(self.ruta, ruta_anterior)
+        self.operaciones = 0
+        self._archivo = open(self.ruta, 'a', encoding='utf-8')
+
+    def cerrar(self):
+        # Sincroniza y cierra el archivo del diario
+        if not self._archivo.closed:
+            self._archivo.flush()
+            os.fsync(self._archivo.fileno())
+            self._archivo.close()
+
+
+def _descartar_linea_incompleta(ruta):
+    # Recorta una última línea sin terminar (caída a mitad de una escritura) para
+    # que la siguiente operación no quede pegada a ella; retorna las líneas completas
+    if not os.path.exists(ruta):
+        return 0
+    with open(ruta, 'rb+') as f:
+        contenido = f.read()
+        if contenido and not contenido.endswith(b'\n'):
+            f.truncate(contenido.rfind(b'\n') + 1)
+        return contenido.count(b'\n')
+
+
+def leer_diario(ruta):
+    """
+    Lee las operaciones de un diario en orden.
+    Una última línea incompleta (caída a mitad de una escritura) se descarta:
+    esa operación nunca llegó a confirmarse.
+
+    Args:
+        ruta (str): Ruta del archivo del diario
+
+    Yields:
+        dict: Entradas con 'n', 'op', 'args' y opcionalmente 'kwargs'
+    """
+    if not os.path.exists(ruta):
+        return
+    with open(ruta, 'r', encoding='utf-8') as f:
+        for linea in f:
+            if not linea.endswith('\n'):
+                return
+            try:
+                yield json.loads(linea)
+            except json.JSONDecodeError:
+                return
+
+
+# Bloque de prueba para verificar el funcionamiento del diario
+if __name__ == "__main__":
+    import tempfile
+
+    print("=== Prueba del diario de operaciones ===")
+    ruta = os.path.join(tempfile.mkdtemp(), "prueba.diario")
+
+    diario = DiarioOperaciones(ruta)
+    diario.registrar('agregar_usuario', ("U010", "Ana Pérez", "ana@email.com"))
+    diario.registrar('registrar_devolucion', ("P001", "2024-01-20"))
+    diario.cerrar()
+
+    # Simular una caída a mitad de una escritura
+    with open(ruta, 'a', encoding='utf-8') as f:
+        f.write('{"n":3,"op":"agregar_li')
+
+    # Al reabrir, la línea incompleta se descarta y el diario sigue siendo legible
+    diario = DiarioOperaciones(ruta, secuencia=2)
+    diario.registrar('eliminar_usuario', ("U010",))
+    diario.cerrar()
+
+    for entrada in leer_diario(ruta):
+        print(f"Entrada: {entrada}")
+
+    print("=== Prueba completada ===")
@@ -1,8 +1,18 @@
+import heapq
+import re
+import unicodedata
+from bisect import bisect_left, bisect_right, insort
+from itertools import islice
+from operator import itemgetter
+
+
 class Nodo:
     """
     Clase que representa un nodo en una lista enlazada.
     """
     
+    __slots__ = ('dato', 'siguiente')  # Sin __dict__ por nodo
+    
     def __init__(self, dato):
         # Constructor del nodo - inicializa con un dato y sin nodo siguiente
         self.dato = dato  # Almacena el dato en el nodo
@@ -118,19 +128,121 @@ class ListaEnlazada:
         return " -> ".join(elementos) if elementos else "Lista vacía"
 
 
+class AlmacenRegistros:
+    """
+    Almacén principal de registros indexado por clave (tabla hash).
+    Ofrece inserción, búsqueda y eliminación en O(1) conservando el orden de inserción.
+    """
+
+    def __init__(self, atributo_clave):
+        # Constructor del almacén - se indica el atributo que identifica a cada registro
+        self.atributo_clave = atributo_clave  # Ej: 'isbn' para libros, 'id_usuario' para usuarios
+        self._registros = {}  # Diccionario clave -> registro (mantiene el orden de inserción)
+
+    @property
+    def tamanio(self):
+        # Cantidad de registros almacenados (mismo nombre que en ListaEnlazada)
+        return len(self._registros)
+
+    def __len__(self):
+        return len(self._registros)
+
+    def __iter__(self):
+        # Recorre los registros en orden de inserción
+        return iter(self._registros.values())
+
+    def __contains__(self, clave):
+        return clave in self._registros
+
+    def esta_vacia(self):
+        # Verifica si el almacén está vacío
+        return not self._registros
+
+    def obtener_clave(self, dato):
+        # Obtiene la clave primaria de un registro
+        return getattr(dato, self.atributo_clave)
+
+    def agregar(self, dato):
+        # Agrega un registro al final del orden de iteración en O(1)
+        clave = self.obtener_clave(dato)
+        if clave in self._registros:
+            return False  # Ya existe un registro con esa clave
+        self._registros[clave] = dato
+        return True
+
+    def eliminar(self, clave):
+        # Elimina el registro con la clave indicada en O(1)
+        return self._registros.pop(clave, None) is not None
+
+    def buscar(self, clave):
+        # Busca un registro por su clave en O(1)
+        return self._registros.get(clave)
+
+    def listar(self):
+        # Retorna todos los registros como una lista Python (orden de inserción)
+        return list(self._registros.values())
+
+    def actualizar(self, clave, nuevos_datos):
+        # Actualiza los campos del registro con la clave indicada
+        elemento = self._registros.get(clave)
+        if elemento is None:
+            return False  # No se encontró el registro
+        nueva_clave = nuevos_datos.get(self.atributo_clave, clave)
+        if nueva_clave != clave and nueva_clave in self._registros:
+            return False  # La clave nueva ya es de otro registro
+
+        for campo, valor in nuevos_datos.items():
+            if hasattr(elemento, campo):
+                setattr(elemento, campo, valor)
+
+        # Si cambió la clave primaria, se reubica el registro bajo la nueva clave
+        nueva_clave = self.obtener_clave(elemento)
+        if nueva_clave != clave:
+            del self._registros[clave]
+            self._registros[nueva_clave] = elemento
+        return True
+
+    def reubicar(self, clave_anterior, dato):
+        # Vuelve a indexar un registro cuya clave primaria cambió; si la clave nueva
+        # ya es de otro registro no cambia nada y retorna False
+        nueva_clave = self.obtener_clave(dato)
+        if self._registros.get(nueva_clave, dato) is not dato:
+            return False
+        if self._registros.get(clave_anterior) is dato:
+            del self._registros[clave_anterior]
+        self._registros[nueva_clave] = dato
+        return True
+
+    def vaciar(self):
+        # Elimina todos los registros
+        self._registros.clear()
+
+    def copia_vacia(self):
+        # Nuevo almacén vacío del mismo tipo (para cargar datos sin tocar los actuales)
+        return AlmacenRegistros(self.atributo_clave)
+
+    def __str__(self):
+        # Representación en string del almacén (para debugging)
+        elementos = [str(dato) for dato in self._registros.values()]
+        return " -> ".join(elementos) if elementos else "Almacén vacío"
+
+
 # ================= ESTRUCTURAS DE ÁRBOLES =================
 
 class NodoAVL:
-    # Nodo para árbol AVL - almacena libro y clave para búsqueda
-    def __init__(self, clave, libro):
+    # Nodo para árbol AVL - almacena la clave de búsqueda y el ISBN del libro
+    __slots__ = ('clave', 'isbn', 'izquierda', 'derecha', 'altura')  # Sin __dict__ por nodo
+    
+    def __init__(self, clave, isbn):
         self.clave = clave      # Clave para ordenar (ISBN, título o autor)
-        self.libro = libro      # Objeto Libro almacenado
+        self.isbn = isbn        # ISBN del libro (el libro completo está en el almacén principal)
         self.izquierda = None   # Hijo izquierdo
         self.derecha = None     # Hijo derecho
         self.altura = 1         # Altura del nodo (para balanceo AVL)
 
 class ArbolAVLLibros:
-    # Árbol AVL balanceado para búsquedas eficientes de libros
+    # Árbol AVL balanceado para búsquedas eficientes de libros. Guarda solo claves e ISBN
+    # y retorna ISBN: quien lo usa obtiene los libros de su almacén
     def __init__(self, tipo_clave='isbn'):
         self.raiz = None           # Raíz del árbol
         self.tipo_clave = tipo_clave  # Tipo de clave: 'isbn', 'titulo' o 'autor'
@@ -191,172 +303,773 @@ class ArbolAVLLibros:
         
         return y  # Retorna la nueva raíz del subárbol
     
-    def insertar(self, libro):
-        # Inserta un libro en el árbol (método público)
-        clave = self.obtener_clave(libro)  # Obtiene la clave del libro
-        self.raiz = self._insertar(self.raiz, clave, libro)  # Inserta recursivamente
-    
-    def _insertar(self, nodo, clave, libro):
-        # Inserta recursivamente en el árbol AVL
-        if not nodo:
-            # Si llegamos a un nodo vacío, creamos uno nuevo
-            return NodoAVL(clave, libro)
-        
-        # Inserta en el subárbol apropiado
-        if clave < nodo.clave:
-            # Si la clave es menor, inserta en el subárbol izquierdo
-            nodo.izquierda = self._insertar(nodo.izquierda, clave, libro)
-        else:
-            # Si la clave es mayor o igual, inserta en el subárbol derecho
-            nodo.derecha = self._insertar(nodo.derecha, clave, libro)
-        
-        # Actualiza la altura del nodo actual
+    def _actualizar_altura(self, nodo):
+        # Recalcula la altura de un nodo a partir de la de sus hijos
         nodo.altura = 1 + max(self._obtener_altura(nodo.izquierda), 
                              self._obtener_altura(nodo.derecha))
-        
-        # Calcula el factor de balance
+    
+    def _balancear(self, nodo):
+        # Actualiza la altura del nodo y aplica la rotación que corresponda
+        # (sirve tanto después de insertar como después de eliminar)
+        self._actualizar_altura(nodo)
         balance = self._obtener_balance(nodo)
         
-        # Caso 1: Rotación simple derecha (izquierda-izquierda)
-        if balance > 1 and clave < nodo.izquierda.clave:
+        if balance > 1:
+            # Subárbol izquierdo más alto: caso izquierda-derecha requiere rotación doble
+            if self._obtener_balance(nodo.izquierda) < 0:
+                nodo.izquierda = self._rotar_izquierda(nodo.izquierda)
             return self._rotar_derecha(nodo)
         
-        # Caso 2: Rotación simple izquierda (derecha-derecha)
-        if balance < -1 and clave > nodo.derecha.clave:
+        if balance < -1:
+            # Subárbol derecho más alto: caso derecha-izquierda requiere rotación doble
+            if self._obtener_balance(nodo.derecha) > 0:
+                nodo.derecha = self._rotar_derecha(nodo.derecha)
             return self._rotar_izquierda(nodo)
         
-        # Caso 3: Rotación doble izquierda-derecha
-        if balance > 1 and clave > nodo.izquierda.clave:
-            nodo.izquierda = self._rotar_izquierda(nodo.izquierda)
-            return self._rotar_derecha(nodo)
+        return nodo  # El nodo ya estaba balanceado
+    
+    def _es_menor(self, clave, isbn, nodo):
+        # Orden total del árbol: primero por clave y, a igual clave, por ISBN.
+        # Así los títulos/autores repetidos tienen una posición única y se pueden eliminar
+        return clave < nodo.clave or (clave == nodo.clave and isbn < nodo.isbn)
+    
+    def _rebalancear_camino(self, camino):
+        # Sube por el camino recorrido (de la hoja a la raíz) recalculando alturas y
+        # rotando donde haga falta; cada subárbol rebalanceado se re-enlaza a su padre
+        for i in range(len(camino) - 1, -1, -1):
+            nodo = camino[i]
+            altura_anterior = nodo.altura
+            nuevo = self._balancear(nodo)
+            if i == 0:
+                self.raiz = nuevo
+            elif camino[i - 1].izquierda is nodo:
+                camino[i - 1].izquierda = nuevo
+            else:
+                camino[i - 1].derecha = nuevo
+            if nuevo.altura == altura_anterior:
+                # Si la altura del subárbol no cambió, los ancestros no se ven afectados
+                break
+    
+    def insertar(self, libro):
+        # Inserta un libro en el árbol de forma iterativa (sin recursión)
+        clave = self.obtener_clave(libro)  # Obtiene la clave del libro
+        isbn = libro.isbn
+        nuevo = NodoAVL(clave, isbn)
+        if not self.raiz:
+            self.raiz = nuevo
+            return
         
-        # Caso 4: Rotación doble derecha-izquierda
-        if balance < -1 and clave < nodo.derecha.clave:
-            nodo.derecha = self._rotar_derecha(nodo.derecha)
-            return self._rotar_izquierda(nodo)
+        # Desciende hasta la hoja guardando el camino según el orden (clave, ISBN)
+        camino = []
+        nodo = self.raiz
+        while nodo:
+            camino.append(nodo)
+            if clave < nodo.clave or (clave == nodo.clave and isbn < nodo.isbn):
+                nodo = nodo.izquierda
+            else:
+                nodo = nodo.derecha
+        
+        # Enlaza el nuevo nodo como hijo del último nodo visitado
+        padre = camino[-1]
+        if clave < padre.clave or (clave == padre.clave and isbn < padre.isbn):
+            padre.izquierda = nuevo
+        else:
+            padre.derecha = nuevo
         
-        return nodo  # Retorna el nodo (posiblemente balanceado)
+        # Actualiza alturas y rebalancea desde el padre hacia la raíz
+        self._rebalancear_camino(camino)
     
-    def buscar(self, clave):
-        # Búsqueda pública de un libro por clave exacta
-        return self._buscar(self.raiz, clave.lower() if isinstance(clave, str) else clave)
+    def eliminar(self, clave, libro):
+        """
+        Elimina un libro del árbol en O(log N) con rebalanceo.
+        
+        Args:
+            clave: Clave con la que el libro fue indexado (antes de modificarlo)
+            libro (Libro): Libro a eliminar
+            
+        Returns:
+            bool: True si el libro estaba en el árbol y se eliminó
+        """
+        return self._eliminar_clave(clave, libro.isbn)
     
-    def _buscar(self, nodo, clave):
-        # Búsqueda recursiva en el árbol
+    def _eliminar_clave(self, clave, isbn):
+        # Elimina de forma iterativa el nodo identificado por el par (clave, ISBN)
+        camino = []
+        nodo = self.raiz
+        while nodo and not (clave == nodo.clave and isbn == nodo.isbn):
+            camino.append(nodo)
+            if self._es_menor(clave, isbn, nodo):
+                nodo = nodo.izquierda
+            else:
+                nodo = nodo.derecha
         if not nodo:
-            return None  # No se encontró
+            return False  # No se encontró el nodo
+        
+        if nodo.izquierda and nodo.derecha:
+            # Nodo con dos hijos: se copia el sucesor en orden y se elimina el sucesor
+            camino.append(nodo)
+            sucesor = nodo.derecha
+            while sucesor.izquierda:
+                camino.append(sucesor)
+                sucesor = sucesor.izquierda
+            nodo.clave, nodo.isbn = sucesor.clave, sucesor.isbn
+            nodo = sucesor
         
-        if clave == nodo.clave:
-            return nodo.libro  # Encontró el libro
-        elif clave < nodo.clave:
-            # Busca en el subárbol izquierdo
-            return self._buscar(nodo.izquierda, clave)
+        # El nodo a quitar tiene a lo sumo un hijo: se reemplaza por ese hijo
+        hijo = nodo.izquierda or nodo.derecha
+        if not camino:
+            self.raiz = hijo
+        elif camino[-1].izquierda is nodo:
+            camino[-1].izquierda = hijo
         else:
-            # Busca en el subárbol derecho
-            return self._buscar(nodo.derecha, clave)
+            camino[-1].derecha = hijo
+        
+        self._rebalancear_camino(camino)
+        return True
+    
+    def reindexar(self, clave_anterior, libro, isbn_anterior=None):
+        """
+        Mueve un libro cuya clave cambió a su nueva posición en el árbol.
+        
+        Args:
+            clave_anterior: Clave con la que el libro estaba indexado
+            libro (Libro): Libro ya modificado
+            isbn_anterior (str, optional): ISBN anterior si también cambió
+            
+        Returns:
+            bool: True si el libro estaba indexado con la clave anterior
+        """
+        if isbn_anterior is None:
+            isbn_anterior = libro.isbn
+        encontrado = self._eliminar_clave(clave_anterior, isbn_anterior)
+        self.insertar(libro)  # Reinserta con la clave actual
+        return encontrado
+    
+    def construir(self, libros):
+        """
+        Reemplaza el contenido del árbol construyendo un árbol perfectamente
+        balanceado a partir de una colección completa de libros.
+        
+        Ordena una sola vez y luego arma el árbol en O(N), sin rotaciones.
+        
+        Args:
+            libros (iterable): Libros a indexar
+        """
+        pares = [(self.obtener_clave(libro), libro.isbn) for libro in libros]
+        pares.sort(key=itemgetter(0, 1))  # Mismo orden (clave, ISBN) que usa el árbol
+        self.construir_desde_ordenados(pares)
+    
+    def construir_con_orden(self, libros, orden):
+        """
+        Construye el árbol con un orden ya conocido (por ejemplo, el guardado junto al
+        archivo de datos) sin volver a ordenar: O(N).
+        
+        Args:
+            libros (list): Libros a indexar
+            orden (iterable): Posiciones de `libros` en el orden (clave, ISBN) del árbol
+        """
+        obtener_clave = self.obtener_clave
+        self.construir_desde_ordenados([(obtener_clave(libros[i]), libros[i].isbn) for i in orden])
+    
+    def orden_de(self, posiciones):
+        # Posiciones de los libros del árbol en orden (posiciones: isbn -> posición)
+        return [posiciones[nodo.isbn] for nodo in self.recorrer_desde('')]
+    
+    def construir_desde_ordenados(self, pares):
+        # Construye el árbol a partir de pares (clave, isbn) ya ordenados
+        self.raiz = self._construir_balanceado(pares, 0, len(pares) - 1)
+    
+    def _construir_balanceado(self, pares, inicio, fin):
+        # El elemento central de cada rango es la raíz del subárbol (profundidad O(log N))
+        if inicio > fin:
+            return None
+        medio = (inicio + fin) // 2
+        nodo = NodoAVL(*pares[medio])
+        nodo.izquierda = self._construir_balanceado(pares, inicio, medio - 1)
+        nodo.derecha = self._construir_balanceado(pares, medio + 1, fin)
+        # Un subárbol balanceado de n nodos construido así tiene altura floor(log2 n) + 1
+        nodo.altura = (fin - inicio + 1).bit_length()
+        return nodo
+    
+    def buscar(self, clave):
+        # Búsqueda iterativa del ISBN de un libro por clave exacta
+        clave = clave.lower() if isinstance(clave, str) else clave
+        nodo = self.raiz
+        while nodo:
+            if clave == nodo.clave:
+                return nodo.isbn  # Encontró el libro
+            # Desciende al subárbol izquierdo o derecho
+            nodo = nodo.izquierda if clave < nodo.clave else nodo.derecha
+        return None  # No se encontró
+    
+    def cursor_de(self, libro):
+        # Cursor de paginación: posición (clave, ISBN) de un libro dentro del árbol
+        return (self.obtener_clave(libro), libro.isbn)
+    
+    def recorrer_desde(self, clave, isbn=None, estricto=False):
+        """
+        Recorre en orden los nodos a partir de una cota inferior.
+        
+        Localiza la cota en O(log N) y luego avanza en orden con una pila,
+        de modo que quien consume el generador puede detenerse en cualquier momento.
+        
+        Args:
+            clave: Clave mínima a partir de la cual recorrer
+            isbn (str, optional): Desempate por ISBN dentro de la misma clave
+            estricto (bool): Si es True se omite el nodo igual a (clave, isbn)
+            
+        Yields:
+            NodoAVL: Nodos con (clave, isbn) mayor o igual (o mayor) que la cota
+        """
+        pila = []
+        nodo = self.raiz
+        while nodo:
+            # ¿El nodo está dentro del rango pedido? Entonces se apila y se sigue a la izquierda
+            if nodo.clave > clave or (nodo.clave == clave and (
+                    isbn is None or nodo.isbn > isbn or
+                    (not estricto and nodo.isbn == isbn))):
+                pila.append(nodo)
+                nodo = nodo.izquierda
+            else:
+                nodo = nodo.derecha
+        
+        while pila:
+            nodo = pila.pop()
+            yield nodo
+            # El sucesor en orden es el mínimo del subárbol derecho
+            siguiente = nodo.derecha
+            while siguiente:
+                pila.append(siguiente)
+                siguiente = siguiente.izquierda
     
-    def buscar_prefijo(self, prefijo):
-        # Búsqueda de todos los libros que empiecen con un prefijo
+    def buscar_prefijo(self, prefijo, limite=None, desplazamiento=0, cursor=None):
+        """
+        Búsqueda de los libros cuya clave empieza con un prefijo, en orden y paginada.
+        
+        Ubica el inicio del rango del prefijo en O(log N) y recorre en orden
+        solo hasta completar la página, sin construir la lista completa.
+        
+        Args:
+            prefijo (str): Prefijo a buscar
+            limite (int, optional): Máximo de libros a retornar (None = todos)
+            desplazamiento (int): Cantidad de coincidencias a saltar
+            cursor (tuple, optional): Valor de cursor_de() del último libro ya mostrado;
+                                      la búsqueda continúa justo después de él
+            
+        Returns:
+            list: ISBN de los libros que coinciden, ordenados por (clave, ISBN)
+        """
+        prefijo = prefijo.lower()
+        if cursor is not None and tuple(cursor) >= (prefijo, ''):
+            recorrido = self.recorrer_desde(cursor[0], cursor[1], estricto=True)
+        else:
+            recorrido = self.recorrer_desde(prefijo)
+        
         resultados = []  # Lista para almacenar resultados
-        self._buscar_prefijo(self.raiz, prefijo.lower(), resultados)  # Búsqueda recursiva
+        if limite is not None and limite <= 0:
+            return resultados
+        for nodo in recorrido:
+            if not nodo.clave.startswith(prefijo):
+                break  # Se salió del rango del prefijo: no puede haber más coincidencias
+            if desplazamiento > 0:
+                desplazamiento -= 1
+                continue
+            resultados.append(nodo.isbn)
+            if limite is not None and len(resultados) >= limite:
+                break  # Página completa
         return resultados
+
+class IndiceAños:
+    """
+    Índice ordenado por año de publicación con un grupo de libros por año.
+    Los años distintos se mantienen en una lista ordenada (búsqueda binaria) y
+    cada año guarda los ISBN de sus libros ordenados: dentro de un mismo año el
+    orden no depende de cuándo se agregó o modificó cada libro.
+    """
     
-    def _buscar_prefijo(self, nodo, prefijo, resultados):
-        # Búsqueda recursiva por prefijo
-        if not nodo:
-            return  # Nodo vacío, termina recursión
-        
-        if nodo.clave.startswith(prefijo):
-            # Si la clave empieza con el prefijo, agrega a resultados
-            resultados.append(nodo.libro)
-        
-        # Decide en qué subárboles continuar la búsqueda
-        if prefijo <= nodo.clave:
-            # Si el prefijo es menor o igual, busca en izquierdo
-            self._buscar_prefijo(nodo.izquierda, prefijo, resultados)
-        
-        if prefijo >= nodo.clave[:len(prefijo)]:
-            # Si el prefijo es mayor o igual al inicio de la clave, busca en derecho
-            self._buscar_prefijo(nodo.derecha, prefijo, resultados)
-
-class NodoSegmento:
-    # Nodo para árbol de segmentos (para reportes estadísticos)
-    def __init__(self, inicio, fin):
-        self.inicio = inicio          # Inicio del rango (año)
-        self.fin = fin                # Fin del rango (año)
-        self.total_libros = 0         # Total de libros en este rango
-        self.total_prestamos = 0      # Total de préstamos en este rango
-        self.izquierda = None         # Hijo izquierdo (subrango menor)
-        self.derecha = None           # Hijo derecho (subrango mayor)
-
-class ArbolSegmentosReportes:
-    # Árbol de segmentos para consultas eficientes de rango
-    def __init__(self, años):
-        self.años = años              # Lista de años a cubrir
-        self.raiz = self._construir_arbol(0, len(años)-1)  # Construye el árbol
-    
-    def _construir_arbol(self, inicio, fin):
-        # Construye recursivamente el árbol de segmentos
-        if inicio > fin:
-            return None  # Caso base: rango inválido
+    def __init__(self):
+        self._años = []      # Años distintos, ordenados de menor a mayor
+        self._grupos = {}    # año -> lista ordenada de ISBN
+    
+    def __len__(self):
+        return sum(len(grupo) for grupo in self._grupos.values())
+    
+    def construir(self, libros):
+        # Arma el índice en bloque: agrupa por año y ordena cada grupo una sola vez
+        grupos = {}
+        for libro in libros:
+            grupo = grupos.get(libro.año_publicacion)
+            if grupo is None:
+                grupo = grupos[libro.año_publicacion] = []
+            grupo.append(libro.isbn)
+        for grupo in grupos.values():
+            grupo.sort()
+        self._grupos = grupos
+        self._años = sorted(grupos)
+    
+    def agregar(self, libro):
+        # Agrega un libro al grupo de su año (crea el año si no existía)
+        año = libro.año_publicacion
+        grupo = self._grupos.get(año)
+        if grupo is None:
+            grupo = self._grupos[año] = []
+            insort(self._años, año)  # Solo cuando aparece un año nuevo
+        insort(grupo, libro.isbn)
+    
+    def eliminar(self, isbn, año):
+        # Quita un libro del grupo de su año (y el año si quedó vacío)
+        grupo = self._grupos.get(año)
+        i = bisect_left(grupo, isbn) if grupo is not None else 0
+        if grupo is None or i == len(grupo) or grupo[i] != isbn:
+            return False
+        del grupo[i]
+        if not grupo:
+            del self._grupos[año]
+            del self._años[bisect_left(self._años, año)]
+        return True
+    
+    def iterar_rango(self, año_inicio, año_fin):
+        """
+        Recorre en orden de año los libros publicados entre dos años (inclusive).
+        Ubica el rango con búsqueda binaria: O(log N + k).
         
-        # Crea un nodo que representa el rango [años[inicio], años[fin]]
-        nodo = NodoSegmento(self.años[inicio], self.años[fin])
+        Yields:
+            str: ISBN de los libros del rango, año por año
+        """
+        for _, grupo in self.grupos_rango(año_inicio, año_fin):
+            yield from grupo
+    
+    def grupos_rango(self, año_inicio, año_fin):
+        # Pares (año, grupo de ISBN de ese año) de los años del rango, en orden
+        desde = bisect_left(self._años, año_inicio)
+        hasta = bisect_right(self._años, año_fin)
+        return [(año, self._grupos[año]) for año in self._años[desde:hasta]]
+    
+    def grupo_desde(self, año_inicio, año_fin):
+        """
+        Copia los ISBN del primer año con libros entre dos años (inclusive).
+        Permite recorrer un rango año por año sin retener el índice mientras se usa.
         
-        if inicio == fin:
-            return nodo  # Caso base: nodo hoja (rango de un solo año)
+        Returns:
+            tuple: (año, lista de ISBN de ese año), o (None, []) si no hay libros en el rango
+        """
+        i = bisect_left(self._años, año_inicio)
+        if i == len(self._años) or self._años[i] > año_fin:
+            return None, []
+        año = self._años[i]
+        return año, list(self._grupos[año])
+    
+    def primeros(self, cantidad, descendente=False, filtro=None):
+        """
+        Los primeros libros en orden de año (los más antiguos, o los más recientes si
+        descendente=True). Recorre el índice ya ordenado y se detiene al completar la
+        cantidad: O(k) sin filtro, en lugar de ordenar todo el catálogo.
         
-        # Divide el rango en dos mitades
-        medio = (inicio + fin) // 2
-        # Construye subárbol izquierdo y derecho recursivamente
-        nodo.izquierda = self._construir_arbol(inicio, medio)
-        nodo.derecha = self._construir_arbol(medio + 1, fin)
+        Args:
+            cantidad (int): Número máximo de libros a retornar
+            descendente (bool): Si se empieza por los años más recientes
+            filtro (callable, optional): Función que recibe un ISBN y retorna si califica
+            
+        Returns:
+            list: Hasta `cantidad` ISBN; dentro de un mismo año, en orden de ISBN
+        """
+        años = reversed(self._años) if descendente else self._años
+        isbns = (isbn for año in años for isbn in self._grupos[año])
+        if filtro is not None:
+            isbns = filter(filtro, isbns)
+        return list(islice(isbns, max(cantidad, 0)))
+
+
+# ================= ÍNDICE DE TEXTO COMPLETO =================
+
+_PATRON_PALABRA = re.compile(r"\w+")  # Secuencias de letras/dígitos (una palabra)
+
+def normalizar_texto(texto):
+    # Pasa a minúsculas y quita acentos/diacríticos ("Pérez" -> "perez")
+    if texto.isascii():
+        return texto.lower()  # Sin acentos que quitar
+    descompuesto = unicodedata.normalize('NFKD', texto.casefold())
+    return ''.join(caracter for caracter in descompuesto if not unicodedata.combining(caracter))
+
+def tokenizar(texto):
+    # Divide un texto normalizado en palabras
+    return _PATRON_PALABRA.findall(normalizar_texto(texto))
+
+
+class IndiceInvertido:
+    """
+    Índice invertido palabra -> libros sobre título, autor y género.
+    Permite buscar palabras en cualquier posición del texto (no solo prefijos).
+    """
+    
+    def __init__(self, campos=('titulo', 'autor', 'genero')):
+        self.campos = campos        # Atributos del libro que se indexan
+        self._postings = {}         # palabra -> {isbn: ocurrencias}
+        self._documentos = {}       # isbn -> (título, {palabra: ocurrencias})
+    
+    def __len__(self):
+        return len(self._documentos)
+    
+    def _contar_palabras(self, libro):
+        # Cuenta las ocurrencias de cada palabra en los campos indexados
+        conteo = {}
+        for campo in self.campos:
+            for palabra in tokenizar(getattr(libro, campo)):
+                conteo[palabra] = conteo.get(palabra, 0) + 1
+        return conteo
+    
+    def agregar(self, libro):
+        # Indexa las palabras de un libro
+        conteo = self._contar_palabras(libro)
+        self._documentos[libro.isbn] = (libro.titulo, conteo)  # El título desempata la relevancia
+        for palabra, ocurrencias in conteo.items():
+            self._postings.setdefault(palabra, {})[libro.isbn] = ocurrencias
+    
+    def eliminar(self, isbn):
+        # Quita un libro del índice usando las palabras con las que fue indexado
+        documento = self._documentos.pop(isbn, None)
+        if documento is None:
+            return False
+        for palabra in documento[1]:
+            lista = self._postings[palabra]
+            del lista[isbn]
+            if not lista:
+                del self._postings[palabra]  # No quedan libros con esa palabra
+        return True
+    
+    def actualizar(self, libro, isbn_anterior=None):
+        # Reindexa un libro cuyo texto (o ISBN) cambió
+        self.eliminar(isbn_anterior if isbn_anterior is not None else libro.isbn)
+        self.agregar(libro)
+    
+    def buscar(self, consulta, limite=None):
+        """
+        Busca libros que contengan las palabras de la consulta.
         
-        return nodo  # Retorna el nodo construido
+        Primero intersecta las listas de todas las palabras (empezando por la más corta).
+        Si ningún libro las contiene todas, retorna los que contienen alguna.
+        Los resultados se ordenan por cantidad de palabras coincidentes y ocurrencias.
+        
+        Args:
+            consulta (str): Palabras a buscar (sin distinguir mayúsculas ni acentos)
+            limite (int, optional): Máximo de libros a retornar
+            
+        Returns:
+            list: ISBN de los libros, ordenados por relevancia
+        """
+        palabras = list(dict.fromkeys(tokenizar(consulta)))  # Sin repetidas, en orden
+        listas = [self._postings[palabra] for palabra in palabras if palabra in self._postings]
+        if not listas:
+            return []
+        
+        candidatos = None
+        if len(listas) == len(palabras):
+            # Intersección de las listas, de la más corta a la más larga
+            listas_ordenadas = sorted(listas, key=len)
+            candidatos = set(listas_ordenadas[0])
+            for lista in listas_ordenadas[1:]:
+                candidatos.intersection_update(lista)
+                if not candidatos:
+                    break
+        if not candidatos:
+            # Ningún libro tiene todas las palabras: se aceptan coincidencias parciales
+            candidatos = set().union(*listas)
+        
+        def puntaje(isbn):
+            coincidencias = 0
+            ocurrencias = 0
+            for lista in listas:
+                cantidad = lista.get(isbn)
+                if cantidad:
+                    coincidencias += 1
+                    ocurrencias += cantidad
+            return (-coincidencias, -ocurrencias, self._documentos[isbn][0].lower(), isbn)
+        
+        if limite is None:
+            ordenados = sorted(candidatos, key=puntaje)
+        else:
+            # Solo los mejores `limite`: O(N log k) en lugar de ordenar todos los candidatos
+            ordenados = heapq.nsmallest(max(limite, 0), candidatos, key=puntaje)
+        return ordenados
+
+
+class IndiceTrigramas:
+    """
+    Índice de trigramas (subcadenas de 3 caracteres) sobre un campo de texto.
+    Permite buscar subcadenas sin recorrer todos los registros: se intersectan
+    las listas de los trigramas de la consulta y solo se verifican los candidatos.
+    """
     
-    def actualizar_estadisticas(self, año, libros=0, prestamos=0):
-        # Actualiza las estadísticas para un año específico
-        self._actualizar(self.raiz, año, libros, prestamos)
+    def __init__(self, campo='nombre', atributo_clave='id_usuario'):
+        self.campo = campo                    # Atributo de texto indexado
+        self.atributo_clave = atributo_clave  # Atributo que identifica al registro
+        self._postings = {}                   # trigrama -> {clave: registro}
+        self._textos = {}                     # clave -> (registro, texto normalizado)
     
-    def _actualizar(self, nodo, año, libros, prestamos):
-        # Actualiza recursivamente las estadísticas
-        if not nodo or año < nodo.inicio or año > nodo.fin:
-            return  # Año fuera del rango del nodo
+    def __len__(self):
+        return len(self._textos)
+    
+    @staticmethod
+    def _trigramas(texto):
+        # Conjunto de trigramas distintos de un texto
+        return {texto[i:i + 3] for i in range(len(texto) - 2)}
+    
+    def agregar(self, registro):
+        # Indexa el texto normalizado (sin acentos, en minúsculas) del registro
+        clave = getattr(registro, self.atributo_clave)
+        texto = normalizar_texto(getattr(registro, self.campo))
+        self._textos[clave] = (registro, texto)
+        for trigrama in self._trigramas(texto):
+            self._postings.setdefault(trigrama, {})[clave] = registro
+    
+    def eliminar(self, clave):
+        # Quita un registro del índice usando el texto con el que fue indexado
+        entrada = self._textos.pop(clave, None)
+        if entrada is None:
+            return False
+        for trigrama in self._trigramas(entrada[1]):
+            lista = self._postings[trigrama]
+            del lista[clave]
+            if not lista:
+                del self._postings[trigrama]
+        return True
+    
+    def actualizar(self, registro, clave_anterior=None):
+        # Reindexa un registro cuyo texto (o clave) cambió
+        if clave_anterior is None:
+            clave_anterior = getattr(registro, self.atributo_clave)
+        self.eliminar(clave_anterior)
+        self.agregar(registro)
+    
+    def buscar(self, subcadena):
+        """
+        Busca los registros cuyo texto contiene la subcadena (sin distinguir
+        mayúsculas ni acentos).
+        
+        Args:
+            subcadena (str): Texto a buscar
+            
+        Returns:
+            list: Registros que contienen la subcadena
+        """
+        consulta = normalizar_texto(subcadena)
+        if len(consulta) < 3:
+            # Consultas muy cortas no tienen trigramas: se revisan los textos ya normalizados
+            return [registro for registro, texto in self._textos.values() if consulta in texto]
+        
+        listas = []
+        for trigrama in self._trigramas(consulta):
+            lista = self._postings.get(trigrama)
+            if lista is None:
+                return []  # Algún trigrama no aparece en ningún texto
+            listas.append(lista)
+        
+        # Se recorre la lista más corta y se descartan candidatos con las demás
+        listas.sort(key=len)
+        textos = self._textos
+        return [registro for clave, registro in listas[0].items()
+                if all(clave in lista for lista in listas[1:]) and consulta in textos[clave][1]]
+
+
+class ArbolFenwickReportes:
+    """
+    Árbol de Fenwick (árbol binario indexado) con estadísticas de libros y
+    préstamos por año. Crece automáticamente para cubrir cualquier año.
+    Actualizaciones y consultas de rango en O(log n) sin crear nodos ni diccionarios.
+    """
+    
+    def __init__(self, año_minimo=None, año_maximo=None):
+        self.base = None           # Año que corresponde a la posición 1 del árbol
+        self.capacidad = 0         # Cantidad de años cubiertos: [base, base + capacidad - 1]
+        self._libros = [0]         # Sumas parciales de libros (posición 0 sin uso)
+        self._prestamos = [0]      # Sumas parciales de préstamos (posición 0 sin uso)
+        self._año_libros = []      # Total de libros de cada año (para reconstruir al crecer)
+        self._año_prestamos = []   # Total de préstamos de cada año
+        if año_minimo is not None:
+            self._cubrir(año_minimo)
+            self._cubrir(año_maximo if año_maximo is not None else año_minimo)
+    
+    def _cubrir(self, año):
+        # Asegura que el año esté dentro del rango cubierto, ampliándolo si es necesario
+        if self.base is not None and self.base <= año < self.base + self.capacidad:
+            return
         
-        # Actualiza los contadores del nodo
-        nodo.total_libros += libros
-        nodo.total_prestamos += prestamos
+        if self.base is None:
+            nueva_base, nueva_capacidad = año - 64, 128
+        else:
+            # Duplica la capacidad (o más si hace falta) hacia el lado donde está el año
+            nueva_capacidad = self.capacidad * 2
+            if año < self.base:
+                nueva_capacidad = max(nueva_capacidad, self.base + self.capacidad - año + self.capacidad)
+                nueva_base = self.base + self.capacidad - nueva_capacidad
+            else:
+                nueva_capacidad = max(nueva_capacidad, año - self.base + 1 + self.capacidad)
+                nueva_base = self.base
+        
+        # Reubica los totales por año en el nuevo rango
+        desplazamiento = (self.base - nueva_base) if self.base is not None else 0
+        año_libros = [0] * nueva_capacidad
+        año_prestamos = [0] * nueva_capacidad
+        año_libros[desplazamiento:desplazamiento + self.capacidad] = self._año_libros
+        año_prestamos[desplazamiento:desplazamiento + self.capacidad] = self._año_prestamos
         
-        # Propaga la actualización a los hijos
-        if nodo.izquierda:
-            self._actualizar(nodo.izquierda, año, libros, prestamos)
-        if nodo.derecha:
-            self._actualizar(nodo.derecha, año, libros, prestamos)
+        self.base, self.capacidad = nueva_base, nueva_capacidad
+        self._año_libros, self._año_prestamos = año_libros, año_prestamos
+        self._libros = self._construir_fenwick(año_libros)
+        self._prestamos = self._construir_fenwick(año_prestamos)
     
-    def consultar_rango(self, inicio, fin):
-        # Consulta pública para un rango de años
-        return self._consultar_rango(self.raiz, inicio, fin)
+    @staticmethod
+    def _construir_fenwick(valores):
+        # Construye el árbol de Fenwick a partir de los valores por año en O(n)
+        arbol = [0] + valores
+        n = len(valores)
+        for i in range(1, n + 1):
+            padre = i + (i & -i)
+            if padre <= n:
+                arbol[padre] += arbol[i]
+        return arbol
     
-    def _consultar_rango(self, nodo, inicio, fin):
-        # Consulta recursiva de estadísticas por rango
-        if not nodo or inicio > nodo.fin or fin < nodo.inicio:
-            # Rango no se superpone con el nodo
+    def actualizar_estadisticas(self, año, libros=0, prestamos=0):
+        # Suma libros/préstamos al año indicado en O(log n)
+        self._cubrir(año)
+        posicion = año - self.base
+        self._año_libros[posicion] += libros
+        self._año_prestamos[posicion] += prestamos
+        
+        i = posicion + 1
+        n = self.capacidad
+        arbol_libros, arbol_prestamos = self._libros, self._prestamos
+        while i <= n:
+            arbol_libros[i] += libros
+            arbol_prestamos[i] += prestamos
+            i += i & -i  # Siguiente nodo que cubre esta posición
+    
+    def _prefijo(self, i):
+        # Suma de las posiciones 1..i de ambos árboles
+        total_libros = 0
+        total_prestamos = 0
+        arbol_libros, arbol_prestamos = self._libros, self._prestamos
+        while i > 0:
+            total_libros += arbol_libros[i]
+            total_prestamos += arbol_prestamos[i]
+            i &= i - 1  # Quita el bit menos significativo
+        return total_libros, total_prestamos
+    
+    def consultar_rango(self, inicio, fin):
+        # Consulta las estadísticas acumuladas entre dos años (inclusive) en O(log n)
+        if self.base is None:
             return {'total_libros': 0, 'total_prestamos': 0}
         
-        if inicio <= nodo.inicio and fin >= nodo.fin:
-            # El rango del nodo está completamente contenido en la consulta
-            return {'total_libros': nodo.total_libros, 
-                    'total_prestamos': nodo.total_prestamos}
+        # Los años fuera del rango cubierto no tienen datos: se recorta la consulta
+        desde = max(inicio, self.base) - self.base
+        hasta = min(fin, self.base + self.capacidad - 1) - self.base
+        if desde > hasta:
+            return {'total_libros': 0, 'total_prestamos': 0}
         
-        # Consulta recursiva en ambos hijos
-        izquierda = self._consultar_rango(nodo.izquierda, inicio, fin)
-        derecha = self._consultar_rango(nodo.derecha, inicio, fin)
+        libros_hasta, prestamos_hasta = self._prefijo(hasta + 1)
+        libros_antes, prestamos_antes = self._prefijo(desde)
+        return {'total_libros': libros_hasta - libros_antes,
+                'total_prestamos': prestamos_hasta - prestamos_antes}
+
+
+# ================= COLA DE VENCIMIENTOS =================
+
+class ColaVencimientos:
+    """
+    Registros ordenados por su día de vencimiento (préstamos activos por fecha límite).
+    Igual que IndiceAños: los días distintos se mantienen en una lista ordenada
+    (búsqueda binaria) y cada día agrupa sus registros en orden de inserción.
+    Un día que queda sin registros conserva su grupo vacío y se retira de forma
+    perezosa, en la siguiente consulta que pase por él.
+    """
+    
+    def __init__(self, atributo_vencimiento='dia_limite', atributo_clave='id_prestamo'):
+        self.atributo_vencimiento = atributo_vencimiento
+        self.atributo_clave = atributo_clave
+        self._dias = []      # Días de vencimiento distintos, de menor a mayor
+        self._grupos = {}    # día -> {clave: registro}
+        self._dia_de = {}    # clave -> día de vencimiento
+    
+    def __len__(self):
+        return len(self._dia_de)
+    
+    def construir(self, registros):
+        # Agrupa todos los registros por día y ordena los días una sola vez
+        self._grupos = {}
+        self._dia_de = {}
+        for registro in registros:
+            dia = getattr(registro, self.atributo_vencimiento)
+            clave = getattr(registro, self.atributo_clave)
+            self._grupos.setdefault(dia, {})[clave] = registro
+            self._dia_de[clave] = dia
+        self._dias = sorted(self._grupos)
+    
+    def agregar(self, registro):
+        # Agrega un registro al grupo de su día: O(1), o O(log D) si el día es nuevo
+        dia = getattr(registro, self.atributo_vencimiento)
+        clave = getattr(registro, self.atributo_clave)
+        if clave in self._dia_de:
+            self.eliminar(clave)
+        grupo = self._grupos.get(dia)
+        if grupo is None:
+            grupo = self._grupos[dia] = {}
+            insort(self._dias, dia)  # Solo cuando aparece un día nuevo
+        grupo[clave] = registro
+        self._dia_de[clave] = dia
+    
+    def eliminar(self, clave):
+        # Quita un registro en O(1); si su día queda vacío se retira en la próxima consulta
+        dia = self._dia_de.pop(clave, None)
+        if dia is None:
+            return False
+        del self._grupos[dia][clave]
+        return True
+    
+    def _registros_entre(self, dia_minimo, dia_maximo):
+        # Registros con vencimiento en [dia_minimo, dia_maximo], en orden de vencimiento.
+        # Ubica el rango con búsqueda binaria y limpia los días sin registros que recorra
+        dias = self._dias
+        desde = 0 if dia_minimo is None else bisect_left(dias, dia_minimo)
+        hasta = bisect_right(dias, dia_maximo)
+        resultado = []
+        vacios = []
+        for dia in dias[desde:hasta]:
+            grupo = self._grupos[dia]
+            if grupo:
+                resultado.extend(grupo.values())
+            else:
+                vacios.append(dia)
+        if vacios:
+            for dia in vacios:
+                del self._grupos[dia]
+            dias[desde:hasta] = [dia for dia in dias[desde:hasta] if dia in self._grupos]
+        return resultado
+    
+    def vencidos(self, dia):
+        """
+        Registros cuyo vencimiento es anterior al día indicado, en orden de vencimiento.
+        Cuesta O(log D + k): solo recorre los días que califican.
+        
+        Args:
+            dia (int): Día de referencia (número de día)
+            
+        Returns:
+            list: Registros vencidos a esa fecha
+        """
+        return self._registros_entre(None, dia - 1)
+    
+    def por_vencer(self, dia_inicio, dia_fin):
+        """
+        Registros que vencen entre dos días (inclusive), en orden de vencimiento.
         
-        # Combina resultados de ambos hijos
-        return {
-            'total_libros': izquierda['total_libros'] + derecha['total_libros'],
-            'total_prestamos': izquierda['total_prestamos'] + derecha['total_prestamos']
-        }
+        Args:
+            dia_inicio (int): Primer día del rango
+            dia_fin (int): Último día del rango
+            
+        Returns:
+            list: Registros que vencen en el rango
+        """
+        return self._registros_entre(dia_inicio, dia_fin)
 
 
 # ================= BLOQUE DE PRUEBAS =================
@@ -0,0 +1,596 @@
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from itertools import compress
+
+from estructuras import AlmacenRegistros
+from libro import Libro
+from persistencia import sin_recolector
+from prestamo import Prestamo
+from usuario import Usuario
+
+# Formato de instantánea binaria (little-endian):
+#   encabezado | libros | usuarios | préstamos | índice de cadenas | datos de cadenas
+# Los registros tienen tamaño fijo y guardan los textos como números de cadena;
+# cada texto distinto se guarda una sola vez en la tabla de cadenas, separados por
+# un byte nulo y con un índice de desplazamientos
+# (cadena i = datos[desplazamiento[i]:desplazamiento[i + 1] - 1]).
+# Así cualquier registro se decodifica directamente desde el archivo mapeado en memoria,
+# y una carga completa puede decodificar toda la tabla de una sola vez.
+MAGICO = b'BIBLIO\x00\x01'
+_ENCABEZADO = struct.Struct('<8s4Qqq5Q')
+_LIBRO = struct.Struct('<IIIIiB3x')        # isbn, título, autor, género, año, disponible
+_USUARIO = struct.Struct('<III')           # id, nombre, contacto
+_PRESTAMO = struct.Struct('<IIIiiB3x')     # id, isbn, usuario, día préstamo, día devolución (0 = no), activo
+_TANDA = 4096                              # Registros por escritura
+
+
+def es_archivo_binario(ruta):
+    # Indica si el archivo es una instantánea binaria (por su número mágico)
+    with open(ruta, 'rb') as f:
+        return f.read(len(MAGICO)) == MAGICO
+
+
+def escribir_instantanea_binaria(archivo, libros, usuarios, prestamos, contador_prestamos, secuencia_diario=0):
+    """
+    Escribe una instantánea binaria registro por registro (sin armar el archivo en memoria).
+
+    Args:
+        archivo (file): Archivo abierto en modo binario (con posibilidad de seek)
+        libros, usuarios, prestamos (iterable): Registros a guardar
+        contador_prestamos (int): Contador de IDs de préstamos
+        secuencia_diario (int): Última operación del diario incluida en la instantánea
+    """
+    codigos = {}      # texto -> número de cadena
+
+    def codigo(texto):
+        numero = codigos.get(texto)
+        if numero is None:
+            numero = codigos[texto] = len(codigos)
+        return numero
+
+    def escribir_seccion(registros, empaquetar):
+        # Escribe los registros en tandas; retorna cuántos se escribieron
+        cantidad = 0
+        tanda = []
+        for registro in registros:
+            tanda.append(empaquetar(registro))
+            if len(tanda) == _TANDA:
+                archivo.write(b''.join(tanda))
+                cantidad += len(tanda)
+                tanda = []
+        archivo.write(b''.join(tanda))
+        return cantidad + len(tanda)
+
+    inicio = archivo.tell()
+    archivo.write(bytes(_ENCABEZADO.size))  # Se completa al final
+
+    pos_libros = archivo.tell()
+    n_libros = escribir_seccion(libros, lambda l: _LIBRO.pack(
+        codigo(l.isbn), codigo(l.titulo), codigo(l.autor), codigo(l.genero),
+        l.año_publicacion, 1 if l.disponible else 0))
+    pos_usuarios = archivo.tell()
+    n_usuarios = escribir_seccion(usuarios, lambda u: _USUARIO.pack(
+        codigo(u.id_usuario), codigo(u.nombre), codigo(u.contacto)))
+    pos_prestamos = archivo.tell()
+    n_prestamos = escribir_seccion(prestamos, lambda p: _PRESTAMO.pack(
+        codigo(p.id_prestamo), codigo(p.isbn_libro), codigo(p.id_usuario),
+        p.dia_prestamo, p.dia_devolucion or 0, 1 if p.activo else 0))
+
+    # Tabla de cadenas: índice de desplazamientos y luego los textos en UTF-8
+    textos = [texto.encode('utf-8') + b'\x00' for texto in codigos]
+    desplazamientos = [0]
+    for texto in textos:
+        desplazamientos.append(desplazamientos[-1] + len(texto))
+    pos_indice = archivo.tell()
+    archivo.write(struct.pack(f'<{len(desplazamientos)}Q', *desplazamientos))
+    pos_cadenas = archivo.tell()
+    archivo.write(b''.join(textos))
+    fin = archivo.tell()
+
+    archivo.seek(inicio)
+    archivo.write(_ENCABEZADO.pack(MAGICO, len(textos), n_libros, n_usuarios, n_prestamos,
+                                   contador_prestamos, secuencia_diario,
+                                   pos_libros - inicio, pos_usuarios - inicio, pos_prestamos - inicio,
+                                   pos_indice - inicio, pos_cadenas - inicio))
+    archivo.seek(fin)
+
+
+# Archivo de índices (junto al archivo de datos): el orden de los libros en cada árbol
+#   encabezado (mágico, huella del archivo de datos, cantidad de libros, cantidad de índices)
+#   y por índice: largo del nombre, nombre en UTF-8 y las posiciones de los libros (uint32)
+MAGICO_INDICES = b'BIBIDX\x00\x01'
+_ENCABEZADO_INDICES = struct.Struct('<8s16sQQ')
+_NOMBRE_INDICE = struct.Struct('<H')
+
+
+def escribir_ordenes_indices(archivo, huella, cantidad_libros, ordenes):
+    """
+    Escribe el orden de los libros de cada índice.
+    
+    Args:
+        archivo (file): Archivo abierto en modo binario
+        huella (bytes): Huella del archivo de datos al que corresponden los órdenes
+        cantidad_libros (int): Cantidad de libros del archivo de datos
+        ordenes (dict): Nombre del índice -> posiciones de los libros en su orden
+    """
+    archivo.write(_ENCABEZADO_INDICES.pack(MAGICO_INDICES, huella, cantidad_libros, len(ordenes)))
+    for nombre, orden in ordenes.items():
+        nombre = nombre.encode('utf-8')
+        archivo.write(_NOMBRE_INDICE.pack(len(nombre)) + nombre)
+        archivo.write(array('I', orden).tobytes())
+
+
+def leer_ordenes_indices(ruta, huella):
+    """
+    Lee los órdenes guardados por escribir_ordenes_indices si corresponden al archivo
+    de datos con esa huella.
+    
+    Args:
+        ruta (str): Ruta del archivo de índices
+        huella (bytes): Huella del archivo de datos cargado
+        
+    Returns:
+        dict: Nombre del índice -> array de posiciones (None si el archivo no existe,
+              no es válido o corresponde a otros datos)
+    """
+    try:
+        with open(ruta, 'rb') as f:
+            encabezado = f.read(_ENCABEZADO_INDICES.size)
+            if len(encabezado) != _ENCABEZADO_INDICES.size:
+                return None
+            magico, huella_guardada, cantidad_libros, cantidad_indices = _ENCABEZADO_INDICES.unpack(encabezado)
+            if magico != MAGICO_INDICES or huella_guardada != huella:
+                return None
+            ordenes = {}
+            for _ in range(cantidad_indices):
+                largo, = _NOMBRE_INDICE.unpack(f.read(_NOMBRE_INDICE.size))
+                nombre = f.read(largo).decode('utf-8')
+                orden = array('I')
+                orden.fromfile(f, cantidad_libros)
+                ordenes[nombre] = orden
+            return ordenes
+    except (OSError, EOFError, struct.error, UnicodeDecodeError):
+        return None
+
+
+class InstantaneaBinaria:
+    """
+    Lectura perezosa de una instantánea binaria mapeada en memoria (mmap).
+    Abrir el archivo solo lee el encabezado; cada registro se decodifica cuando
+    se pide, y cada texto se decodifica una sola vez y se comparte.
+    """
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self._archivo = open(ruta, 'rb')
+        try:
+            self._mapa = mmap.mmap(self._archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._archivo.close()
+            raise ValueError("Instantánea binaria vacía")
+        (magico, n_cadenas, self.cantidad_libros, self.cantidad_usuarios, self.cantidad_prestamos,
+         self.contador_prestamos, self.secuencia_diario, self._pos_libros, self._pos_usuarios,
+         self._pos_prestamos, pos_indice, self._pos_cadenas) = _ENCABEZADO.unpack_from(self._mapa, 0)
+        if magico != MAGICO:
+            self.cerrar()
+            raise ValueError("El archivo no es una instantánea binaria")
+        # Los registros se leen recién cuando se piden: se verifica ahora que todo entre en el archivo
+        secciones = ((self._pos_libros, self.cantidad_libros * _LIBRO.size),
+                     (self._pos_usuarios, self.cantidad_usuarios * _USUARIO.size),
+                     (self._pos_prestamos, self.cantidad_prestamos * _PRESTAMO.size),
+                     (pos_indice, 8 * (n_cadenas + 1)))
+        if any(inicio + largo > len(self._mapa) for inicio, largo in secciones):
+            self.cerrar()
+            raise ValueError("Instantánea binaria incompleta o dañada")
+        self._vista = memoryview(self._mapa)
+        self._desplazamientos = self._vista[pos_indice:pos_indice + 8 * (n_cadenas + 1)].cast('Q')
+        if self._pos_cadenas + self._desplazamientos[n_cadenas] > len(self._mapa):
+            self.cerrar()
+            raise ValueError("Instantánea binaria incompleta o dañada")
+        self._cadenas = [None] * n_cadenas
+        self._completa = False      # Si ya se decodificó toda la tabla de cadenas
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+    def cerrar(self):
+        # Libera el mapeo en memoria y cierra el archivo
+        if getattr(self, '_vista', None) is not None:
+            self._desplazamientos.release()
+            self._vista.release()
+            self._vista = None
+        self._mapa.close()
+        self._archivo.close()
+
+    def cadena(self, numero):
+        # Texto de la tabla de cadenas (decodificado la primera vez que se pide)
+        texto = self._cadenas[numero]
+        if texto is None:
+            inicio = self._pos_cadenas + self._desplazamientos[numero]
+            fin = self._pos_cadenas + self._desplazamientos[numero + 1] - 1
+            texto = self._cadenas[numero] = str(self._mapa[inicio:fin], 'utf-8')
+        return texto
+
+    def _todas_las_cadenas(self):
+        # Decodifica la tabla completa de una vez (para recorridos completos)
+        if not self._completa:
+            n_cadenas = len(self._cadenas)
+            fin = self._pos_cadenas + self._desplazamientos[n_cadenas]
+            cadenas = str(self._mapa[self._pos_cadenas:fin], 'utf-8').split('\x00')[:-1]
+            if len(cadenas) != n_cadenas:
+                # Algún texto contiene un byte nulo: decodificar uno por uno
+                cadenas = [self.cadena(numero) for numero in range(n_cadenas)]
+            self._cadenas = cadenas
+            self._completa = True
+        return self._cadenas
+
+    def _cadenas_de(self, codigos):
+        # Textos de muchos números de cadena: si son una parte chica de la tabla se
+        # decodifican uno por uno; si no, conviene decodificar la tabla completa
+        if self._completa or len(codigos) * 8 > len(self._cadenas):
+            return list(map(self._todas_las_cadenas().__getitem__, codigos))
+        return list(map(self.cadena, codigos))
+
+    def _columna(self, formato, posicion, cantidad, campo):
+        # Un campo de 4 bytes de todos los registros de una sección, sin decodificarlos
+        palabras = self._vista[posicion:posicion + cantidad * formato.size].cast('I')
+        columna = array('I', palabras[campo::formato.size // 4])
+        palabras.release()
+        if sys.byteorder == 'big':
+            columna.byteswap()
+        return columna
+
+    def claves(self, seccion):
+        """
+        Claves de todos los registros de una sección ('libros', 'usuarios' o 'prestamos'),
+        en orden: ISBN, ID de usuario o ID de préstamo. Solo lee la columna de la clave.
+
+        Returns:
+            list: Textos de las claves
+        """
+        formato, posicion, cantidad = self._seccion(seccion)
+        return self._cadenas_de(self._columna(formato, posicion, cantidad, 0))
+
+    def prestamos_activos(self):
+        # Posiciones de los préstamos activos (solo lee la columna del estado)
+        activos = self._columna(_PRESTAMO, self._pos_prestamos, self.cantidad_prestamos, 5)
+        return list(compress(range(self.cantidad_prestamos), activos))
+
+    def _seccion(self, seccion):
+        # (formato, posición, cantidad) de los registros de una sección
+        if seccion == 'libros':
+            return _LIBRO, self._pos_libros, self.cantidad_libros
+        if seccion == 'usuarios':
+            return _USUARIO, self._pos_usuarios, self.cantidad_usuarios
+        if seccion == 'prestamos':
+            return _PRESTAMO, self._pos_prestamos, self.cantidad_prestamos
+        raise ValueError(f"Sección desconocida: {seccion}")
+
+    # ----- Acceso a un registro -----
+
+    def libro(self, i):
+        return self._crear_libro(_LIBRO.unpack_from(self._mapa, self._pos_libros + i * _LIBRO.size))
+
+    def usuario(self, i):
+        return self._crear_usuario(_USUARIO.unpack_from(self._mapa, self._pos_usuarios + i * _USUARIO.size))
+
+    def prestamo(self, i):
+        return self._crear_prestamo(_PRESTAMO.unpack_from(self._mapa, self._pos_prestamos + i * _PRESTAMO.size))
+
+    # ----- Recorridos completos -----
+
+    def _registros(self, formato, posicion, cantidad):
+        return formato.iter_unpack(self._vista[posicion:posicion + cantidad * formato.size])
+
+    def iterar_libros(self):
+        cadenas = self._todas_las_cadenas()
+        for isbn, titulo, autor, genero, año, disponible in self._registros(
+                _LIBRO, self._pos_libros, self.cantidad_libros):
+            libro = Libro(cadenas[isbn], cadenas[titulo], cadenas[autor], año, cadenas[genero])
+            libro.disponible = disponible == 1
+            yield libro
+
+    def iterar_usuarios(self):
+        cadenas = self._todas_las_cadenas()
+        for id_usuario, nombre, contacto in self._registros(_USUARIO, self._pos_usuarios, self.cantidad_usuarios):
+            yield Usuario(cadenas[id_usuario], cadenas[nombre], cadenas[contacto])
+
+    def iterar_prestamos(self):
+        cadenas = self._todas_las_cadenas()
+        crear = Prestamo.desde_dias
+        for id_prestamo, isbn, usuario, dia_prestamo, dia_devolucion, activo in self._registros(
+                _PRESTAMO, self._pos_prestamos, self.cantidad_prestamos):
+            yield crear(cadenas[id_prestamo], cadenas[isbn], cadenas[usuario],
+                        dia_prestamo, dia_devolucion or None, activo == 1)
+
+    # ----- Decodificación -----
+
+    def _crear_libro(self, campos):
+        isbn, titulo, autor, genero, año, disponible = campos
+        cadena = self.cadena
+        libro = Libro(cadena(isbn), cadena(titulo), cadena(autor), año, cadena(genero))
+        libro.disponible = bool(disponible)
+        return libro
+
+    def _crear_usuario(self, campos):
+        cadena = self.cadena
+        return Usuario(cadena(campos[0]), cadena(campos[1]), cadena(campos[2]))
+
+    def _crear_prestamo(self, campos):
+        id_prestamo, isbn, usuario, dia_prestamo, dia_devolucion, activo = campos
+        cadena = self.cadena
+        return Prestamo.desde_dias(cadena(id_prestamo), cadena(isbn), cadena(usuario),
+                                   dia_prestamo, dia_devolucion or None, bool(activo))
+
+
+# Métodos de InstantaneaBinaria que arman un registro y que recorren una sección completa
+_METODOS_SECCION = {'libros': ('libro', 'iterar_libros'), 'usuarios': ('usuario', 'iterar_usuarios'),
+                    'prestamos': ('prestamo', 'iterar_prestamos')}
+_BORRADO = object()  # Posición de un registro de la instantánea que se eliminó o cambió de clave
+
+
+class _RegistrosInstantanea:
+    """
+    Registros de una sección de una instantánea abierta, decodificados la primera vez
+    que se piden y guardados desde entonces (cada posición da siempre el mismo objeto).
+    Varias consultas pueden decodificar a la vez (con el cerrojo de lectura del
+    sistema): un cerrojo propio evita que un registro se arme dos veces.
+    """
+
+    def __init__(self, instantanea, seccion):
+        self._instantanea = instantanea
+        self._seccion = seccion
+        self._objetos = [None] * instantanea._seccion(seccion)[2]
+        self._completo = False       # Si ya se decodificaron todos los registros
+        self._cerrojo = threading.Lock()
+
+    def _objeto(self, posicion):
+        objeto = self._objetos[posicion]
+        if objeto is None:
+            with self._cerrojo:
+                objeto = self._objetos[posicion]
+                if objeto is None:
+                    crear = getattr(self._instantanea, _METODOS_SECCION[self._seccion][0])
+                    objeto = self._objetos[posicion] = crear(posicion)
+        return objeto
+
+    def _decodificar_todo(self):
+        # Arma de una vez los registros que falten (recorridos completos)
+        if self._completo:
+            return
+        with self._cerrojo:
+            if self._completo:
+                return
+            objetos = self._objetos
+            with sin_recolector():
+                recorrer = getattr(self._instantanea, _METODOS_SECCION[self._seccion][1])
+                for posicion, registro in enumerate(recorrer()):
+                    if objetos[posicion] is None:
+                        objetos[posicion] = registro
+            self._completo = True
+
+    def usa_archivo(self, ruta):
+        # Si los registros todavía se leen del archivo `ruta`
+        instantanea = self._instantanea
+        return instantanea is not None and os.path.abspath(instantanea.ruta) == os.path.abspath(ruta)
+
+    def soltar(self):
+        """
+        Decodifica los registros que falten y deja de usar la instantánea; cuando
+        ninguna sección la usa, el archivo se desmapea y se cierra (en Windows no se
+        puede reemplazar un archivo mapeado en memoria).
+        """
+        self._decodificar_todo()
+        with self._cerrojo:
+            self._instantanea = None
+
+
+class AlmacenInstantanea(_RegistrosInstantanea):
+    """
+    Almacén de libros o usuarios respaldado por una instantánea binaria abierta, con
+    la misma interfaz que AlmacenRegistros. Abrirlo no decodifica nada: el índice
+    clave -> posición se arma al primer acceso por clave leyendo solo la columna de
+    claves, y cada registro al pedirlo. Los registros agregados después de cargar (y
+    los que cambian de clave) van a un AlmacenRegistros aparte, al final del orden
+    de iteración, como en AlmacenRegistros.
+    """
+
+    def __init__(self, instantanea, seccion, atributo_clave):
+        super().__init__(instantanea, seccion)
+        self.atributo_clave = atributo_clave
+        self._borrados = 0
+        self._posiciones = None      # Clave -> posición en la instantánea (al primer acceso por clave)
+        self._nuevos = AlmacenRegistros(atributo_clave)
+
+    def _indice(self):
+        posiciones = self._posiciones
+        if posiciones is None:
+            with self._cerrojo:
+                if self._posiciones is None:
+                    if self._completo:
+                        # Ya está todo decodificado (y nada se eliminó: eso arma el índice)
+                        claves = [self.obtener_clave(objeto) for objeto in self._objetos]
+                    else:
+                        claves = self._instantanea.claves(self._seccion)
+                    self._posiciones = dict(zip(claves, range(len(claves))))
+                posiciones = self._posiciones
+        return posiciones
+
+    def _quitar_posicion(self, clave):
+        # Marca como eliminado el registro de la instantánea con esa clave, si lo hay
+        posicion = self._indice().pop(clave, None)
+        if posicion is None:
+            return False
+        self._objetos[posicion] = _BORRADO
+        self._borrados += 1
+        return True
+
+    @property
+    def tamanio(self):
+        return len(self)
+
+    def __len__(self):
+        return len(self._objetos) - self._borrados + len(self._nuevos)
+
+    def __iter__(self):
+        self._decodificar_todo()
+        for objeto in self._objetos:
+            if objeto is not _BORRADO:
+                yield objeto
+        yield from self._nuevos
+
+    def __contains__(self, clave):
+        return clave in self._indice() or clave in self._nuevos
+
+    def esta_vacia(self):
+        return not len(self)
+
+    def obtener_clave(self, dato):
+        return getattr(dato, self.atributo_clave)
+
+    def agregar(self, dato):
+        if self.obtener_clave(dato) in self._indice():
+            return False  # Ya existe un registro con esa clave
+        return self._nuevos.agregar(dato)
+
+    def eliminar(self, clave):
+        return self._quitar_posicion(clave) or self._nuevos.eliminar(clave)
+
+    def buscar(self, clave):
+        posicion = self._indice().get(clave)
+        if posicion is None:
+            return self._nuevos.buscar(clave)
+        return self._objeto(posicion)
+
+    def listar(self):
+        return list(self)
+
+    def actualizar(self, clave, nuevos_datos):
+        elemento = self.buscar(clave)
+        if elemento is None:
+            return False
+        nueva_clave = nuevos_datos.get(self.atributo_clave, clave)
+        if nueva_clave != clave and nueva_clave in self:
+            return False  # La clave nueva ya es de otro registro
+        for campo, valor in nuevos_datos.items():
+            if hasattr(elemento, campo):
+                setattr(elemento, campo, valor)
+        if self.obtener_clave(elemento) != clave:
+            self.reubicar(clave, elemento)
+        return True
+
+    def reubicar(self, clave_anterior, dato):
+        # Como en AlmacenRegistros, el registro pasa al final del orden de iteración
+        # y una clave nueva que ya es de otro registro se rechaza
+        ocupante = self.buscar(self.obtener_clave(dato))
+        if ocupante is not None and ocupante is not dato:
+            return False
+        posicion = self._indice().get(clave_anterior)
+        if posicion is not None and self._objetos[posicion] is dato:
+            self._quitar_posicion(clave_anterior)
+        return self._nuevos.reubicar(clave_anterior, dato)
+
+    def vaciar(self):
+        with self._cerrojo:
+            self._objetos = []
+            self._borrados = 0
+            self._posiciones = {}
+            self._completo = True
+            self._instantanea = None
+        self._nuevos.vaciar()
+
+    def copia_vacia(self):
+        return AlmacenRegistros(self.atributo_clave)
+
+    def __str__(self):
+        elementos = [str(dato) for dato in self]
+        return " -> ".join(elementos) if elementos else "Almacén vacío"
+
+
+class HistorialInstantanea(_RegistrosInstantanea):
+    """
+    Historial de préstamos respaldado por una instantánea binaria abierta. Se usa como
+    la lista de préstamos del sistema (len, índice, recorrido y append), pero cada
+    préstamo se decodifica la primera vez que se pide. Los préstamos registrados
+    después de cargar se agregan al final.
+    """
+
+    def __init__(self, instantanea):
+        super().__init__(instantanea, 'prestamos')
+        self._nuevos = []
+
+    def __len__(self):
+        return len(self._objetos) + len(self._nuevos)
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self[i] for i in range(*indice.indices(len(self)))]
+        if indice < 0:
+            indice += len(self)
+        if indice < 0:
+            raise IndexError("Índice fuera del historial")
+        if indice < len(self._objetos):
+            return self._objeto(indice)
+        return self._nuevos[indice - len(self._objetos)]
+
+    def __iter__(self):
+        self._decodificar_todo()
+        yield from self._objetos
+        yield from self._nuevos
+
+    def append(self, prestamo):
+        self._nuevos.append(prestamo)
+
+    def ids(self):
+        # ID de cada préstamo, en orden (sin decodificar los préstamos de la instantánea)
+        with self._cerrojo:
+            if self._instantanea is None:
+                ids = [prestamo.id_prestamo for prestamo in self._objetos]
+            else:
+                ids = self._instantanea.claves('prestamos')
+        ids.extend(prestamo.id_prestamo for prestamo in self._nuevos)
+        return ids
+
+    def activos(self):
+        # Préstamos activos, en orden: solo se decodifican los que estaban activos al guardar
+        with self._cerrojo:
+            if self._instantanea is None:
+                posiciones = range(len(self._objetos))
+            else:
+                posiciones = self._instantanea.prestamos_activos()
+        activos = [prestamo for prestamo in map(self._objeto, posiciones) if prestamo.activo]
+        activos.extend(prestamo for prestamo in self._nuevos if prestamo.activo)
+        return activos
+
+
+# Bloque de prueba para verificar la instantánea binaria
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    print("=== Prueba de la instantánea binaria ===")
+    libros = [Libro("978-0142437230", "1984", "George Orwell", 1949, "Ciencia Ficción"),
+              Libro("978-0451526342", "Animal Farm", "George Orwell", 1945, "Sátira")]
+    usuarios = [Usuario("U001", "Ana Pérez", "ana@email.com")]
+    prestamo = Prestamo("P001", "978-0142437230", "U001", "2023-10-15")
+    prestamo.registrar_devolucion("2023-11-05")
+
+    ruta = os.path.join(tempfile.mkdtemp(), "biblioteca.bin")
+    with open(ruta, 'wb') as f:
+        escribir_instantanea_binaria(f, libros, usuarios, [prestamo], contador_prestamos=2)
+    print(f"Tamaño del archivo: {os.path.getsize(ruta)} bytes, binario: {es_archivo_binario(ruta)}")
+
+    with InstantaneaBinaria(ruta) as instantanea:
+        print(f"Libro 1: {instantanea.libro(1)}")
+        print(f"Usuarios: {[str(u) for u in instantanea.iterar_usuarios()]}")
+        print(f"Préstamos: {[str(p) for p in instantanea.iterar_prestamos()]}")
+        print(f"Contador de préstamos: {instantanea.contador_prestamos}")
+
+    print("=== Prueba completada ===")
@@ -3,14 +3,23 @@ from tkinter import ttk, messagebox, simpledialog
 from tkinter import font as tkfont
 import sys
 import os
+import threading
 from datetime import datetime
 
 # Importar el sistema de biblioteca desde main.py
 from main import obtener_sistema
+from cliente import ClienteBiblioteca
+
+# Cantidad máxima de libros que se muestran por búsqueda (el resto se pide por páginas)
+LIMITE_RESULTADOS = 200
+# Archivo de datos y segundos entre autoguardados (solo se escribe si hubo cambios)
+ARCHIVO_DATOS = 'biblioteca_data.json'
+INTERVALO_AUTOGUARDADO = 30
 
 class BibliotecaApp:
-    def __init__(self, root):
-        # Inicializar la aplicación principal
+    def __init__(self, root, sistema=None):
+        # Inicializar la aplicación principal (sistema: por ejemplo, un ClienteBiblioteca
+        # conectado al servidor; por defecto, un sistema propio en este proceso)
         self.root = root
         # Configurar título de la ventana
         self.root.title("Sistema de Gestión de Biblioteca - Con Árboles AVL")
@@ -20,7 +29,22 @@ class BibliotecaApp:
         self.root.configure(bg='#f5f5f5')
         
         # Inicializar el sistema de biblioteca importado desde main.py
-        self.sistema = obtener_sistema()
+        self.sistema_propio = sistema is None
+        self.sistema = sistema if sistema is not None else obtener_sistema()
+        # Un sistema propio parte del archivo de datos, si existe. Solo se guarda en ese
+        # archivo (autoguardado y al cerrar) si se cargó o si todavía no existe: nunca se
+        # reemplaza un archivo con los datos de ejemplo
+        self.guardando_archivo = False
+        mensaje_carga = None
+        if self.sistema_propio:
+            if os.path.exists(ARCHIVO_DATOS):
+                exito, mensaje_carga = self.sistema.cargar_datos(ARCHIVO_DATOS)
+                if exito:
+                    mensaje_carga = None
+                    self.iniciar_guardado_archivo()
+            else:
+                self.iniciar_guardado_archivo()
+        self.root.protocol("WM_DELETE_WINDOW", self.cerrar)
         
         # Configurar fuentes para la interfaz
         self.title_font = tkfont.Font(family="Helvetica", size=18, weight="bold")
@@ -45,6 +69,11 @@ class BibliotecaApp:
         
         # Actualizar estadísticas iniciales al cargar la aplicación
         self.actualizar_estadisticas()
+        # Con la ventana ya visible, construir el resto de los índices en segundo plano
+        self.root.after_idle(lambda: self.sistema.precalentar_indices(en_segundo_plano=True))
+        if mensaje_carga is not None:
+            self.root.after_idle(lambda: messagebox.showerror(
+                "Error", f"{mensaje_carga}\nNo se guardará en {ARCHIVO_DATOS} hasta cargarlo con éxito."))
     
     def crear_pestana_inicio(self):
         """Crea la pestaña de inicio con estadísticas y acciones rápidas"""
@@ -143,8 +172,8 @@ class BibliotecaApp:
         self.prefijo_entry = tk.Entry(prefijo_frame, width=20)
         self.prefijo_entry.grid(row=0, column=1, padx=5, pady=5)
         
-        # Combobox para seleccionar tipo de búsqueda (Título o Autor)
-        self.prefijo_tipo = ttk.Combobox(prefijo_frame, values=["Título", "Autor"], width=10)
+        # Combobox para seleccionar tipo de búsqueda (Título, Autor o palabras en cualquier posición)
+        self.prefijo_tipo = ttk.Combobox(prefijo_frame, values=["Título", "Autor", "Texto"], width=10)
         self.prefijo_tipo.set("Título")
         self.prefijo_tipo.grid(row=0, column=2, padx=5, pady=5)
         
@@ -152,6 +181,15 @@ class BibliotecaApp:
         tk.Button(prefijo_frame, text="Buscar por Prefijo", command=self.buscar_por_prefijo,
                  bg='#3498db', fg='white').grid(row=0, column=3, padx=10, pady=5)
         
+        # Botón para traer la siguiente página de resultados de la búsqueda por prefijo
+        self.mas_resultados_btn = tk.Button(prefijo_frame, text="Más resultados", state='disabled',
+                                            command=lambda: self.buscar_por_prefijo(continuar=True),
+                                            bg='#3498db', fg='white')
+        self.mas_resultados_btn.grid(row=0, column=4, padx=10, pady=5)
+        # Estado de la paginación: (prefijo, índice) de la búsqueda en curso y cursor de la última página
+        self.busqueda_prefijo = None
+        self.cursor_prefijo = None
+        
         # Frame para mostrar resultados de búsqueda
         resultados_frame = tk.Frame(self.busquedas_frame)
         resultados_frame.pack(fill='both', expand=True, padx=20, pady=10)
@@ -184,36 +222,64 @@ class BibliotecaApp:
             libros = self.sistema.buscar_libros_por_rango_años(año_inicio, año_fin)
             # Mostrar resultados en el Treeview
             self.mostrar_resultados_busqueda(libros)
+            # Los resultados ya no corresponden a una búsqueda por prefijo paginada
+            self.busqueda_prefijo = None
+            self.mas_resultados_btn.config(state='disabled')
             
         except ValueError:
             # Mostrar error si los años no son válidos
             messagebox.showerror("Error", "Por favor ingrese años válidos")
     
-    def buscar_por_prefijo(self):
-        """Busca libros por prefijo en título o autor"""
-        # Obtener prefijo y tipo de búsqueda
-        prefijo = self.prefijo_entry.get().strip()
-        tipo = self.prefijo_tipo.get().lower()
-        
-        # Validar que se haya ingresado un prefijo
-        if not prefijo:
-            messagebox.showwarning("Advertencia", "Por favor ingrese un prefijo para buscar")
-            return
-        
-        # Ejecutar búsqueda según el tipo seleccionado
-        if tipo == "título":
-            libros = self.sistema.buscar_libros_por_titulo(prefijo)
+    def buscar_por_prefijo(self, continuar=False):
+        """Busca libros por prefijo en título o autor, de a una página por vez"""
+        if continuar and self.busqueda_prefijo:
+            # Continuar la búsqueda anterior desde el cursor de la última página
+            prefijo, indice = self.busqueda_prefijo
+        else:
+            # Obtener prefijo y tipo de búsqueda
+            prefijo = self.prefijo_entry.get().strip()
+            tipo = self.prefijo_tipo.get().lower()
+            
+            # Validar que se haya ingresado un prefijo
+            if not prefijo:
+                messagebox.showwarning("Advertencia", "Por favor ingrese un prefijo para buscar")
+                return
+            if tipo == "texto":
+                # Búsqueda de palabras con el índice invertido (ordenada por relevancia)
+                libros = self.sistema.buscar_libros_por_texto(prefijo, limite=LIMITE_RESULTADOS)
+                self.mostrar_resultados_busqueda(libros)
+                self.busqueda_prefijo = None
+                self.mas_resultados_btn.config(state='disabled')
+                return
+            indice = 'titulo' if tipo == "título" else 'autor'
+            self.busqueda_prefijo = (prefijo, indice)
+            self.cursor_prefijo = None
+        
+        # Ejecutar búsqueda según el tipo seleccionado (solo una página)
+        if indice == 'titulo':
+            libros = self.sistema.buscar_libros_por_titulo(prefijo, limite=LIMITE_RESULTADOS,
+                                                           cursor=self.cursor_prefijo)
         else:
-            libros = self.sistema.buscar_libros_por_autor(prefijo)
+            libros = self.sistema.buscar_libros_por_autor(prefijo, limite=LIMITE_RESULTADOS,
+                                                          cursor=self.cursor_prefijo)
         
-        # Mostrar resultados
-        self.mostrar_resultados_busqueda(libros)
+        # Mostrar resultados (agregándolos a los anteriores si se pidió más)
+        self.mostrar_resultados_busqueda(libros, limpiar=not continuar)
+        
+        # Habilitar "Más resultados" solo si la página vino completa
+        if len(libros) == LIMITE_RESULTADOS:
+            self.cursor_prefijo = self.sistema.cursor_libro(libros[-1], indice)
+            self.mas_resultados_btn.config(state='normal')
+        else:
+            self.cursor_prefijo = None
+            self.mas_resultados_btn.config(state='disabled')
     
-    def mostrar_resultados_busqueda(self, libros):
+    def mostrar_resultados_busqueda(self, libros, limpiar=True):
         """Muestra los resultados de búsqueda en el Treeview"""
         # Limpiar resultados anteriores
-        for item in self.resultados_tree.get_children():
-            self.resultados_tree.delete(item)
+        if limpiar:
+            for item in self.resultados_tree.get_children():
+                self.resultados_tree.delete(item)
         
         # Insertar nuevos resultados
         for libro in libros:
@@ -246,17 +312,48 @@ class BibliotecaApp:
         self.stats_text.set(stats_text)
     
     def guardar_datos(self):
-        """Guarda los datos del sistema en archivos"""
-        exito, mensaje = self.sistema.guardar_datos()
-        if exito:
-            messagebox.showinfo("Éxito", mensaje)
-        else:
-            messagebox.showerror("Error", mensaje)
+        """Guarda los datos del sistema en un hilo aparte y avisa al terminar"""
+        resultado = []
+        hilo = threading.Thread(target=lambda: resultado.append(
+            self.sistema.guardar_cambios(ARCHIVO_DATOS, forzar=True)), daemon=True)
+        hilo.start()
+        
+        def esperar():
+            # Consultar cada 100 ms desde el hilo de la interfaz hasta que termine el guardado
+            if hilo.is_alive():
+                self.root.after(100, esperar)
+                return
+            exito, mensaje = resultado[0]
+            if exito:
+                # El archivo ya tiene los datos de este sistema: desde ahora se puede autoguardar
+                if self.sistema_propio:
+                    self.iniciar_guardado_archivo()
+                messagebox.showinfo("Éxito", mensaje)
+            else:
+                messagebox.showerror("Error", mensaje)
+        esperar()
+    
+    def iniciar_guardado_archivo(self):
+        """Guarda los cambios periódicamente en ARCHIVO_DATOS, en un hilo aparte (no congela la interfaz)"""
+        if not self.guardando_archivo:
+            self.sistema.iniciar_autoguardado(ARCHIVO_DATOS, INTERVALO_AUTOGUARDADO)
+            self.guardando_archivo = True
+    
+    def cerrar(self):
+        """Detiene el autoguardado, guarda los cambios pendientes y cierra la ventana"""
+        if self.guardando_archivo:
+            self.sistema.detener_autoguardado()
+            exito, mensaje = self.sistema.guardar_cambios(ARCHIVO_DATOS)
+            if not exito:
+                messagebox.showerror("Error", mensaje)
+        self.root.destroy()
     
     def cargar_datos(self):
         """Carga los datos del sistema desde archivos"""
-        exito, mensaje = self.sistema.cargar_datos()
+        exito, mensaje = self.sistema.cargar_datos(ARCHIVO_DATOS)
         if exito:
+            if self.sistema_propio:
+                self.iniciar_guardado_archivo()
             messagebox.showinfo("Éxito", mensaje)
             # Actualizar todas las listas y estadísticas
             self.actualizar_lista_libros()
@@ -365,7 +462,7 @@ class BibliotecaApp:
                     libro.genero, estado
                 ))
         elif tipo == "Título":
-            libros = self.sistema.buscar_libros_por_titulo(criterio)
+            libros = self.sistema.buscar_libros_por_titulo(criterio, limite=LIMITE_RESULTADOS)
             for libro in libros:
                 estado = "Disponible" if libro.disponible else "Prestado"
                 self.libros_tree.insert('', 'end', values=(
@@ -373,7 +470,7 @@ class BibliotecaApp:
                     libro.genero, estado
                 ))
         elif tipo == "Autor":
-            libros = self.sistema.buscar_libros_por_autor(criterio)
+            libros = self.sistema.buscar_libros_por_autor(criterio, limite=LIMITE_RESULTADOS)
             for libro in libros:
                 estado = "Disponible" if libro.disponible else "Prestado"
                 self.libros_tree.insert('', 'end', values=(
@@ -1256,12 +1353,22 @@ class BibliotecaApp:
         """Cambia a la pestaña de búsquedas avanzadas"""
         self.notebook.select(self.busquedas_frame)
 
+def _conectar_servidor(argumentos):
+    # Cliente del servidor si se indicó --servidor HOST:PUERTO o --socket RUTA; None si no
+    for opcion, valor in zip(argumentos, argumentos[1:]):
+        if opcion == '--servidor':
+            host, _, puerto = valor.rpartition(':')
+            return ClienteBiblioteca(host or '127.0.0.1', int(puerto))
+        if opcion == '--socket':
+            return ClienteBiblioteca(ruta_socket=valor)
+    return None
+
 def main():
     """Función principal que inicia la aplicación"""
     # Crear ventana principal
     root = tk.Tk()
-    # Crear instancia de la aplicación
-    app = BibliotecaApp(root)
+    # Crear instancia de la aplicación (con --servidor o --socket, contra el servidor compartido)
+    app = BibliotecaApp(root, _conectar_servidor(sys.argv[1:]))
     
     # Centrar la ventana en la pantalla
     root.update_idletasks()
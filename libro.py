@@ -3,6 +3,9 @@ class Libro:
     Clase que representa un libro en el sistema de gestión de biblioteca.
     """
     
+    # Atributos fijos: sin __dict__ por instancia para reducir memoria en catálogos grandes
+    __slots__ = ('isbn', 'titulo', 'autor', 'año_publicacion', 'genero', 'disponible')
+    
     def __init__(self, isbn, titulo, autor, año_publicacion, genero):
         """
         Constructor de la clase Libro.
@@ -1,62 +1,360 @@
 # Importación de módulos necesarios para el sistema
-from estructuras import ListaEnlazada, ArbolAVLLibros, ArbolSegmentosReportes
+from estructuras import (AlmacenRegistros, ArbolAVLLibros, ArbolFenwickReportes, ColaVencimientos,
+                         IndiceAños, IndiceInvertido, IndiceTrigramas)
+from almacen_columnar import AlmacenColumnarLibros
 from libro import Libro
 from usuario import Usuario
-from prestamo import Prestamo
+from prestamo import Prestamo, calcular_retrasos, fecha_a_dia
+from persistencia import escribir_atomico, escribir_json_streaming, huella_archivo, leer_json_streaming, sin_recolector
+from diario import SINCRONIZAR_SIEMPRE, DiarioOperaciones, leer_diario
+from formato_binario import (AlmacenInstantanea, HistorialInstantanea, InstantaneaBinaria, es_archivo_binario,
+                             escribir_instantanea_binaria, escribir_ordenes_indices, leer_ordenes_indices)
+from sistema_sqlite import SistemaBibliotecaSQLite
+from concurrencia import CerrojoLecturaEscritura
+from catalogo_particionado import CatalogoParticionado
+import functools
+import glob
 import os
 import sys
-import json
+import threading
 import time
+from datetime import date, datetime
+
+
+# Métodos de SistemaBiblioteca que se registran en el diario (y se pueden reaplicar)
+_OPERACIONES_DIARIO = set()
+
+
+def _operacion_escritura(metodo):
+    """
+    Decorador de los métodos que modifican el sistema. La operación se ejecuta con
+    el cerrojo de datos tomado para escritura: es atómica frente a cualquier otro
+    hilo (verificar y modificar, como en un préstamo, no se puede intercalar).
+    Si tuvo éxito marca los datos como modificados y, si hay un diario abierto, la
+    registra en el diario antes de retornar (una operación confirmada al llamador
+    ya está en el diario).
+    """
+    _OPERACIONES_DIARIO.add(metodo.__name__)
+    
+    @functools.wraps(metodo)
+    def envoltura(self, *args, **kwargs):
+        with self._cerrojo_datos.escritura():
+            resultado = metodo(self, *args, **kwargs)
+            if resultado[0]:
+                self.version_datos += 1
+                if self.diario is not None:
+                    self.diario.registrar(metodo.__name__, args, kwargs)
+                    if self.diario.operaciones >= self.umbral_compactacion:
+                        self.compactar_diario()
+        return resultado
+    return envoltura
+
+
+def _operacion_lectura(metodo):
+    """
+    Decorador de las consultas del sistema: se ejecutan con el cerrojo de datos
+    tomado para lectura. Varias consultas pueden correr a la vez; ninguna ve una
+    operación de escritura a medio hacer.
+    """
+    @functools.wraps(metodo)
+    def envoltura(self, *args, **kwargs):
+        with self._cerrojo_datos.lectura():
+            return metodo(self, *args, **kwargs)
+    return envoltura
+
+
+class _IndicePerezoso:
+    """
+    Índice de búsqueda de SistemaBiblioteca que se construye la primera vez que se usa.
+    Es un descriptor sin __set__: al construirse, el índice queda en el __dict__ de la
+    instancia con el mismo nombre y los accesos siguientes ya no pasan por aquí.
+    Mientras no se construye, las operaciones no lo mantienen (se armará con los datos
+    del momento en que se use).
+    """
+    
+    def __init__(self, construir):
+        self.construir = construir  # Función que recibe el sistema y retorna el índice armado
+    
+    def __set_name__(self, clase, nombre):
+        self.nombre = nombre
+    
+    def __get__(self, sistema, clase=None):
+        if sistema is None:
+            return self
+        # Con el cerrojo de datos tomado para lectura nadie modifica los datos mientras se
+        # recorren; el de índices hace que, si otro hilo ya lo está construyendo, se espere
+        # a ese en lugar de construirlo dos veces
+        with sistema._cerrojo_datos.lectura(), sistema._cerrojo_indices:
+            indice = sistema.__dict__.get(self.nombre)
+            if indice is None:
+                # Los índices no forman ciclos: el recolector solo recorrería los nodos nuevos
+                with sin_recolector():
+                    indice = sistema.__dict__[self.nombre] = self.construir(sistema)
+        return indice
+
+
+def _construir_arbol(tipo_clave):
+    # Constructor de un árbol AVL de libros armado en bloque (orden + construcción balanceada en O(N)).
+    # Si el archivo cargado traía el orden guardado del árbol, se usa ese y no se ordena
+    nombre = 'arbol_libros_' + tipo_clave
+    def construir(sistema):
+        arbol = ArbolAVLLibros(tipo_clave)
+        libros = sistema.libros.listar()
+        orden = sistema._orden_guardado(nombre)
+        if orden is not None and len(orden) == len(libros):
+            arbol.construir_con_orden(libros, orden)
+        else:
+            arbol.construir(libros)
+        return arbol
+    return construir
+
+
+def _construir_indice_años(sistema):
+    indice = IndiceAños()
+    indice.construir(sistema.libros)
+    return indice
+
+
+def _construir_indice_texto(sistema):
+    indice = IndiceInvertido()
+    for libro in sistema.libros:
+        indice.agregar(libro)
+    return indice
+
+
+def _construir_arbol_reportes(sistema):
+    # Estadísticas desde cero: libros por año de publicación y préstamos por año del préstamo
+    arbol = ArbolFenwickReportes()
+    for libro in sistema.libros:
+        arbol.actualizar_estadisticas(libro.año_publicacion, libros=1, prestamos=0)
+    for prestamo in sistema.prestamos:
+        arbol.actualizar_estadisticas(int(prestamo.fecha_prestamo[:4]), libros=0, prestamos=1)
+    return arbol
+
+
+def _construir_indice_nombres(sistema):
+    indice = IndiceTrigramas('nombre', 'id_usuario')
+    for usuario in sistema.usuarios:
+        indice.agregar(usuario)
+    return indice
+
+
+def _construir_prestamos_por_id(sistema):
+    # ID -> posición en el historial (los préstamos nunca se quitan del historial).
+    # Con una instantánea abierta solo se lee la columna de IDs, sin decodificar préstamos
+    prestamos = sistema.prestamos
+    if isinstance(prestamos, HistorialInstantanea):
+        ids = prestamos.ids()
+    else:
+        ids = [prestamo.id_prestamo for prestamo in prestamos]
+    return dict(zip(ids, range(len(ids))))
+
+
+def _construir_prestamos_activos(sistema):
+    # Con una instantánea abierta solo se decodifican los préstamos activos
+    prestamos = sistema.prestamos
+    if isinstance(prestamos, HistorialInstantanea):
+        activos = prestamos.activos()
+    else:
+        activos = [prestamo for prestamo in prestamos if prestamo.activo]
+    return {prestamo.id_prestamo: prestamo for prestamo in activos}
+
+
+def _agrupar_prestamos_activos(atributo):
+    # Constructor de un índice de préstamos activos agrupados por usuario o por libro
+    def construir(sistema):
+        grupos = {}
+        for id_prestamo, prestamo in sistema.prestamos_activos.items():
+            grupos.setdefault(getattr(prestamo, atributo), {})[id_prestamo] = prestamo
+        return grupos
+    return construir
+
+
+def _construir_cola_vencimientos(sistema):
+    # La cola se arma de una sola vez con los préstamos activos
+    cola = ColaVencimientos()
+    cola.construir(sistema.prestamos_activos.values())
+    return cola
+
 
 # Definición de la clase principal del sistema de biblioteca
 class SistemaBiblioteca:
-    def __init__(self):
+    # ÍNDICES DE BÚSQUEDA (se construyen al primer uso; ver precalentar_indices)
+    # Árboles AVL indexados por ISBN, título y autor (búsquedas por prefijo ordenadas)
+    arbol_libros_isbn = _IndicePerezoso(_construir_arbol('isbn'))
+    arbol_libros_titulo = _IndicePerezoso(_construir_arbol('titulo'))
+    arbol_libros_autor = _IndicePerezoso(_construir_arbol('autor'))
+    # Índice ordenado por año de publicación para búsquedas por rango de años
+    indice_años = _IndicePerezoso(_construir_indice_años)
+    # Índice invertido de palabras para búsqueda de texto completo (título, autor, género)
+    indice_texto = _IndicePerezoso(_construir_indice_texto)
+    # Árbol de Fenwick para reportes estadísticos por años (cubre cualquier año)
+    arbol_reportes = _IndicePerezoso(_construir_arbol_reportes)
+    # Índice de trigramas sobre el nombre para búsquedas parciales de usuarios
+    indice_nombres = _IndicePerezoso(_construir_indice_nombres)
+    # Índices de préstamos: por ID y préstamos activos (global, por usuario y por libro)
+    prestamos_por_id = _IndicePerezoso(_construir_prestamos_por_id)
+    prestamos_activos = _IndicePerezoso(_construir_prestamos_activos)
+    prestamos_activos_por_usuario = _IndicePerezoso(_agrupar_prestamos_activos('id_usuario'))
+    prestamos_activos_por_libro = _IndicePerezoso(_agrupar_prestamos_activos('isbn_libro'))
+    # Préstamos activos agrupados y ordenados por fecha límite (reportes de vencimientos)
+    cola_vencimientos = _IndicePerezoso(_construir_cola_vencimientos)
+    
+    INDICES_PEREZOSOS = ('arbol_libros_isbn', 'arbol_libros_titulo', 'arbol_libros_autor', 'indice_años',
+                         'indice_texto', 'arbol_reportes', 'indice_nombres', 'prestamos_por_id',
+                         'prestamos_activos', 'prestamos_activos_por_usuario', 'prestamos_activos_por_libro',
+                         'cola_vencimientos')
+    # Índices cuyo orden se guarda junto al archivo de datos (ver guardar_datos)
+    INDICES_GUARDADOS = ('arbol_libros_isbn', 'arbol_libros_titulo', 'arbol_libros_autor')
+    
+    def __init__(self, almacen_libros=None):
         """
         Inicializa el sistema de biblioteca con todas las estructuras de datos necesarias.
-        """
-        # Lista enlazada para almacenar todos los libros
-        self.libros = ListaEnlazada()
-        # Lista enlazada para almacenar todos los usuarios
-        self.usuarios = ListaEnlazada()
-        # Lista simple para almacenar todos los préstamos
+        
+        Args:
+            almacen_libros: Almacén principal de libros a usar (por defecto AlmacenRegistros;
+                para catálogos muy grandes, AlmacenColumnarLibros)
+        """
+        # Almacén principal de libros indexado por ISBN (búsqueda y eliminación O(1))
+        self.libros = almacen_libros if almacen_libros is not None else AlmacenRegistros('isbn')
+        # Almacén principal de usuarios indexado por ID (búsqueda y eliminación O(1))
+        self.usuarios = AlmacenRegistros('id_usuario')
+        # Lista simple para almacenar todos los préstamos (historial completo; tras cargar
+        # una instantánea binaria, un HistorialInstantanea que se decodifica a demanda)
         self.prestamos = []
         # Contador para generar IDs únicos de préstamos
         self.contador_prestamos = 1
         
-        # NUEVOS ÁRBOLES PARA OPTIMIZACIÓN
-        # Árbol AVL indexado por ISBN para búsquedas rápidas
-        self.arbol_libros_isbn = ArbolAVLLibros('isbn')
-        # Árbol AVL indexado por título para búsquedas por título
-        self.arbol_libros_titulo = ArbolAVLLibros('titulo')
-        # Árbol AVL indexado por autor para búsquedas por autor
-        self.arbol_libros_autor = ArbolAVLLibros('autor')
-        # Árbol de segmentos para reportes estadísticos por años
-        self.arbol_reportes = ArbolSegmentosReportes(list(range(1900, 2024)))
+        # Diario de operaciones (desactivado hasta llamar a abrir_diario)
+        self.diario = None
+        self.archivo_instantanea = None
+        self.umbral_compactacion = 10000
+        self.secuencia_cargada = 0       # Secuencia del diario incluida en el último archivo cargado
+        self._compactacion = None        # Hilo de la compactación en curso
+        
+        # Control de cambios y autoguardado: cada operación que modifica datos incrementa
+        # version_datos; guardar solo escribe si cambió desde el último guardado
+        # Cerrojo de datos: las consultas lo toman para lectura (varias a la vez) y las
+        # operaciones que modifican datos, para escritura (de a una y sin consultas en curso)
+        self._cerrojo_datos = CerrojoLecturaEscritura()
+        self._cerrojo_indices = threading.RLock()  # Construcción de índices perezosos
+        self._cerrojo_guardado = threading.Lock()  # Un guardado a la vez (archivo y su .indices)
+        self.version_datos = 0
+        self.version_guardada = 0
+        self._autoguardado = None        # Hilo de autoguardado
+        self._detener_autoguardado = threading.Event()
+        self.resultado_autoguardado = None  # (éxito, mensaje) del último autoguardado
+        self._precalentamiento = None    # Hilo que construye los índices por adelantado
+        # Órdenes de los árboles leídos junto al último archivo cargado: (version_datos, órdenes)
+        self._ordenes_guardados = None
+        # Índices de libros repartidos en procesos (desactivado hasta llamar a particionar_catalogo)
+        self.catalogo_particionado = None
         
         # Agregar datos de ejemplo al sistema
         self.agregar_datos_ejemplo()
-        # Construir índices de búsqueda con los datos existentes
+        # Preparar los índices (se construyen al primer uso)
         self._construir_indices()
     
     def _construir_indices(self):
         """
-        Construye los índices de árboles con los datos existentes.
-        Recorre todos los libros y los inserta en los diferentes árboles de índice.
-        """
-        # Para cada libro en el sistema
-        for libro in self.libros.listar():
-            # Insertar en árbol indexado por ISBN
-            self.arbol_libros_isbn.insertar(libro)
-            # Insertar en árbol indexado por título
-            self.arbol_libros_titulo.insertar(libro)
-            # Insertar en árbol indexado por autor
-            self.arbol_libros_autor.insertar(libro)
-            # Actualizar estadísticas en el árbol de reportes
-            self.arbol_reportes.actualizar_estadisticas(
-                libro.año_publicacion, 
-                libros=1, 
-                prestamos=0
-            )
+        Prepara los índices para los datos actuales: descarta los índices ya
+        construidos, que se vuelven a armar en bloque al primer uso.
+        """
+        with self._cerrojo_datos.escritura():
+            for nombre in self.INDICES_PEREZOSOS:
+                self.__dict__.pop(nombre, None)
+            if self.catalogo_particionado is not None:
+                self.catalogo_particionado.cargar(self.libros)
+    
+    def _indice_construido(self, nombre):
+        # El índice si ya fue construido; None si todavía no se usó (no hay que mantenerlo)
+        return self.__dict__.get(nombre)
+    
+    def _orden_guardado(self, nombre):
+        # Orden guardado del árbol si sigue valiendo (los datos no cambiaron desde la carga)
+        if self._ordenes_guardados is None:
+            return None
+        version, ordenes = self._ordenes_guardados
+        return ordenes.get(nombre) if version == self.version_datos else None
+    
+    def precalentar_indices(self, nombres=None, en_segundo_plano=False):
+        """
+        Construye por adelantado los índices de búsqueda que todavía no se usaron,
+        para que la primera consulta no pague su construcción.
+        
+        Args:
+            nombres (iterable, optional): Índices a construir (por defecto, todos los de
+                INDICES_PEREZOSOS)
+            en_segundo_plano (bool): Si se construyen en otro hilo (las operaciones
+                esperan solo mientras se arma cada índice)
+            
+        Returns:
+            tuple: (éxito, mensaje) indicando si la operación fue exitosa
+        """
+        nombres = tuple(self.INDICES_PEREZOSOS if nombres is None else nombres)
+        desconocidos = [nombre for nombre in nombres if nombre not in self.INDICES_PEREZOSOS]
+        if desconocidos:
+            return False, f"Índice desconocido: {', '.join(desconocidos)}"
+        
+        def construir():
+            for nombre in nombres:
+                getattr(self, nombre)  # El descriptor lo construye si hace falta
+        
+        if en_segundo_plano:
+            self._precalentamiento = threading.Thread(target=construir, daemon=True)
+            self._precalentamiento.start()
+            return True, "Construcción de índices iniciada"
+        construir()
+        return True, "Índices construidos"
+    
+    def _indexar_prestamo(self, prestamo):
+        """
+        Agrega un préstamo recién registrado (el último del historial) a los índices
+        de préstamos ya construidos.
+        
+        Args:
+            prestamo (Prestamo): Préstamo a indexar
+        """
+        por_id = self._indice_construido('prestamos_por_id')
+        if por_id is not None:
+            por_id[prestamo.id_prestamo] = len(self.prestamos) - 1
+        if not prestamo.activo:
+            return
+        activos = self._indice_construido('prestamos_activos')
+        if activos is not None:
+            activos[prestamo.id_prestamo] = prestamo
+        for nombre, clave in (('prestamos_activos_por_usuario', prestamo.id_usuario),
+                              ('prestamos_activos_por_libro', prestamo.isbn_libro)):
+            indice = self._indice_construido(nombre)
+            if indice is not None:
+                indice.setdefault(clave, {})[prestamo.id_prestamo] = prestamo
+        cola = self._indice_construido('cola_vencimientos')
+        if cola is not None:
+            cola.agregar(prestamo)
+    
+    def _quitar_prestamo_activo(self, prestamo):
+        """
+        Quita un préstamo de los índices de préstamos activos ya construidos (al devolverse).
+        
+        Args:
+            prestamo (Prestamo): Préstamo que dejó de estar activo
+        """
+        activos = self._indice_construido('prestamos_activos')
+        if activos is not None:
+            activos.pop(prestamo.id_prestamo, None)
+        cola = self._indice_construido('cola_vencimientos')
+        if cola is not None:
+            cola.eliminar(prestamo.id_prestamo)
+        for nombre, clave in (('prestamos_activos_por_usuario', prestamo.id_usuario),
+                              ('prestamos_activos_por_libro', prestamo.isbn_libro)):
+            indice = self._indice_construido(nombre)
+            if indice is None:
+                continue
+            grupo = indice.get(clave)
+            if grupo is not None:
+                grupo.pop(prestamo.id_prestamo, None)
+                if not grupo:
+                    del indice[clave]  # No quedan préstamos activos para esa clave
     
     def agregar_datos_ejemplo(self):
         """
@@ -89,6 +387,7 @@ class SistemaBiblioteca:
     
     # ===== MÉTODOS PARA LIBROS CON ÁRBOLES =====
     
+    @_operacion_escritura
     def agregar_libro(self, isbn, titulo, autor, año_publicacion, genero):
         """
         Agrega un nuevo libro al sistema.
@@ -109,21 +408,23 @@ class SistemaBiblioteca:
         
         # Crear nuevo objeto Libro
         nuevo_libro = Libro(isbn, titulo, autor, año_publicacion, genero)
-        # Agregar a la lista principal de libros
+        error = self._cambiar_particion('agregar', nuevo_libro)
+        if error:
+            return False, error
+        # Agregar al almacén principal de libros
         self.libros.agregar(nuevo_libro)
+        # Indexar el libro tal como quedó en el almacén (en el almacén columnar es una vista)
+        nuevo_libro = self.libros.buscar(isbn)
         
-        # Actualizar árboles de índice
-        self.arbol_libros_isbn.insertar(nuevo_libro)
-        self.arbol_libros_titulo.insertar(nuevo_libro)
-        self.arbol_libros_autor.insertar(nuevo_libro)
-        # Actualizar estadísticas en árbol de reportes
-        self.arbol_reportes.actualizar_estadisticas(año_publicacion, libros=1, prestamos=0)
+        # Actualizar árboles de índice y estadísticas en árbol de reportes
+        self._indexar_libro(nuevo_libro)
         
         return True, "Libro agregado exitosamente"
     
+    @_operacion_lectura
     def buscar_libro_por_isbn(self, isbn):
         """
-        Busca un libro por su ISBN usando el árbol AVL optimizado.
+        Busca un libro por su ISBN usando el almacén principal indexado (O(1)).
         
         Args:
             isbn (str): ISBN a buscar
@@ -131,32 +432,83 @@ class SistemaBiblioteca:
         Returns:
             Libro: El libro encontrado o None si no existe
         """
-        return self.arbol_libros_isbn.buscar(isbn)
+        return self.libros.buscar(isbn)
     
-    def buscar_libros_por_titulo(self, titulo):
+    @_operacion_lectura
+    def buscar_libros_por_titulo(self, titulo, limite=None, desplazamiento=0, cursor=None):
         """
         Busca libros por título usando búsqueda por prefijo en árbol AVL.
         
         Args:
             titulo (str): Título o parte del título a buscar
+            limite (int, optional): Tamaño máximo de la página de resultados
+            desplazamiento (int): Cantidad de resultados a saltar
+            cursor (tuple, optional): Cursor del último libro de la página anterior
+                                      (ver cursor_libro)
             
         Returns:
-            list: Lista de libros que coinciden con el título
+            list: Lista de libros que coinciden con el título, en orden alfabético
         """
-        return self.arbol_libros_titulo.buscar_prefijo(titulo.lower())
+        if self.catalogo_particionado is not None:
+            return self._libros_de(self.catalogo_particionado.buscar_prefijo(
+                'titulo', titulo, limite, desplazamiento, cursor))
+        return self._libros_de(self.arbol_libros_titulo.buscar_prefijo(
+            titulo.lower(), limite, desplazamiento, cursor))
     
-    def buscar_libros_por_autor(self, autor):
+    @_operacion_lectura
+    def buscar_libros_por_autor(self, autor, limite=None, desplazamiento=0, cursor=None):
         """
         Busca libros por autor usando búsqueda por prefijo en árbol AVL.
         
         Args:
             autor (str): Autor o parte del nombre del autor a buscar
+            limite (int, optional): Tamaño máximo de la página de resultados
+            desplazamiento (int): Cantidad de resultados a saltar
+            cursor (tuple, optional): Cursor del último libro de la página anterior
+                                      (ver cursor_libro)
+            
+        Returns:
+            list: Lista de libros que coinciden con el autor, en orden alfabético
+        """
+        if self.catalogo_particionado is not None:
+            return self._libros_de(self.catalogo_particionado.buscar_prefijo(
+                'autor', autor, limite, desplazamiento, cursor))
+        return self._libros_de(self.arbol_libros_autor.buscar_prefijo(
+            autor.lower(), limite, desplazamiento, cursor))
+    
+    @_operacion_lectura
+    def buscar_libros_por_texto(self, consulta, limite=None):
+        """
+        Busca libros por palabras contenidas en el título, el autor o el género,
+        sin importar su posición, mayúsculas ni acentos (índice invertido).
+        
+        Args:
+            consulta (str): Una o más palabras a buscar
+            limite (int, optional): Máximo de libros a retornar
             
         Returns:
-            list: Lista de libros que coinciden con el autor
+            list: Lista de libros ordenados por relevancia
         """
-        return self.arbol_libros_autor.buscar_prefijo(autor.lower())
+        return self._libros_de(self.indice_texto.buscar(consulta, limite))
     
+    @_operacion_lectura
+    def cursor_libro(self, libro, indice='titulo'):
+        """
+        Obtiene el cursor de paginación de un libro para continuar una búsqueda.
+        
+        Args:
+            libro (Libro): Último libro de la página ya mostrada
+            indice (str): Índice de la búsqueda: 'titulo' o 'autor'
+            
+        Returns:
+            tuple: Cursor a pasar en el parámetro cursor de la siguiente búsqueda
+        """
+        if self.catalogo_particionado is not None:
+            return self.catalogo_particionado.cursor_de(libro, 'autor' if indice == 'autor' else 'titulo')
+        arbol = self.arbol_libros_autor if indice == 'autor' else self.arbol_libros_titulo
+        return arbol.cursor_de(libro)
+    
+    @_operacion_lectura
     def buscar_libros_por_rango_años(self, año_inicio, año_fin):
         """
         Busca libros publicados en un rango de años específico.
@@ -166,11 +518,42 @@ class SistemaBiblioteca:
             año_fin (int): Año final del rango
             
         Returns:
-            list: Lista de libros dentro del rango de años
+            list: Lista de libros dentro del rango de años, ordenados por año
+        """
+        if self.catalogo_particionado is not None:
+            return self._libros_de(self.catalogo_particionado.rango_años(año_inicio, año_fin))
+        if isinstance(self.libros, AlmacenColumnarLibros) and self._indice_construido('indice_años') is None:
+            # Sin el índice por año ya construido, el almacén columnar recorre solo su
+            # columna de años en lugar de construir el índice recorriendo cada libro
+            return self.libros.listar_por_rango_años(año_inicio, año_fin)
+        return self._libros_de(self.indice_años.iterar_rango(año_inicio, año_fin))
+    
+    def iterar_libros_por_rango_años(self, año_inicio, año_fin):
         """
-        return [libro for libro in self.libros.listar() 
-                if año_inicio <= libro.año_publicacion <= año_fin]
+        Recorre los libros de un rango de años en orden de año sin armar la lista completa.
+        
+        Args:
+            año_inicio (int): Año inicial del rango
+            año_fin (int): Año final del rango
+            
+        Returns:
+            generator: Libros del rango en orden de año (O(log N + k))
+        
+        Los libros de cada año se copian bajo el cerrojo de lectura y se entregan fuera
+        de él: el recorrido no bloquea a los escritores ni ve el índice a medio modificar,
+        y un libro agregado o quitado durante el recorrido puede aparecer o no.
+        """
+        año = año_inicio
+        while año <= año_fin:
+            with self._cerrojo_datos.lectura():
+                año, isbns = self.indice_años.grupo_desde(año, año_fin)
+                libros = self._libros_de(isbns)
+            if año is None:
+                return
+            yield from libros
+            año += 1
     
+    @_operacion_lectura
     def listar_libros(self):
         """
         Obtiene todos los libros del sistema.
@@ -180,6 +563,7 @@ class SistemaBiblioteca:
         """
         return self.libros.listar()
     
+    @_operacion_lectura
     def listar_libros_disponibles(self):
         """
         Obtiene todos los libros disponibles para préstamo.
@@ -187,8 +571,12 @@ class SistemaBiblioteca:
         Returns:
             list: Lista de libros disponibles
         """
-        return [libro for libro in self.libros.listar() if libro.disponible]
+        # El almacén columnar recorre directamente su arreglo de disponibilidad
+        if isinstance(self.libros, AlmacenColumnarLibros):
+            return self.libros.listar_disponibles()
+        return [libro for libro in self.libros if libro.disponible]
     
+    @_operacion_escritura
     def actualizar_libro(self, isbn, nuevos_datos):
         """
         Actualiza la información de un libro existente.
@@ -205,28 +593,136 @@ class SistemaBiblioteca:
         if not libro:
             return False, "Libro no encontrado"
         
+        # Un ISBN nuevo no puede ser el de otro libro (se verifica antes de modificar nada)
+        nuevo_isbn = nuevos_datos.get('isbn', isbn)
+        if nuevo_isbn != isbn and self.buscar_libro_por_isbn(nuevo_isbn):
+            return False, "Ya existe un libro con este ISBN"
+        
+        # Guardar las claves con las que el libro está indexado antes de modificarlo
+        claves_anteriores = [(arbol, arbol.obtener_clave(libro)) for arbol in self._arboles_libros()]
+        indice_texto = self._indice_construido('indice_texto')
+        indice_años = self._indice_construido('indice_años')
+        arbol_reportes = self._indice_construido('arbol_reportes')
+        año_anterior = libro.año_publicacion
+        
+        # Mover el libro en su partición (o a otra) si cambia algún campo que indexan;
+        # va primero para que un fallo de la partición no deje el cambio a medias
+        campos_particion = ('isbn', 'titulo', 'autor', 'año_publicacion')
+        if self.catalogo_particionado is not None and any(campo in nuevos_datos for campo in campos_particion):
+            datos = {campo: nuevos_datos.get(campo, getattr(libro, campo)) for campo in campos_particion}
+            error = self._cambiar_particion('actualizar', isbn, Libro(**datos, genero=libro.genero))
+            if error:
+                return False, error
+        
         # Actualizar cada campo especificado en nuevos_datos
         for campo, valor in nuevos_datos.items():
             if hasattr(libro, campo):
                 setattr(libro, campo, valor)
         
-        # Reconstruir índices (simplificado - en producción sería más eficiente)
-        self._reconstruir_indices()
+        # Si cambió el ISBN, reubicar el libro en el almacén principal
+        if libro.isbn != isbn:
+            self.libros.reubicar(isbn, libro)
+        
+        # Mover el libro solo en los índices cuya clave cambió (O(log N) cada uno);
+        # los nodos guardan el ISBN, así que un cambio de ISBN también lo mueve en todos
+        for arbol, clave_anterior in claves_anteriores:
+            if libro.isbn != isbn or arbol.obtener_clave(libro) != clave_anterior:
+                arbol.reindexar(clave_anterior, libro, isbn)
+        
+        # Reindexar las palabras si cambió algún campo de texto o el ISBN
+        if indice_texto is not None and (libro.isbn != isbn or
+                                         any(campo in nuevos_datos for campo in indice_texto.campos)):
+            indice_texto.actualizar(libro, isbn)
+        
+        # Mover el libro de grupo en el índice por año si cambió el año o el ISBN
+        if indice_años is not None and (libro.año_publicacion != año_anterior or libro.isbn != isbn):
+            indice_años.eliminar(isbn, año_anterior)
+            indice_años.agregar(libro)
+        
+        # Mover el libro de año en el árbol de reportes si cambió la publicación
+        if arbol_reportes is not None and libro.año_publicacion != año_anterior:
+            arbol_reportes.actualizar_estadisticas(año_anterior, libros=-1, prestamos=0)
+            arbol_reportes.actualizar_estadisticas(libro.año_publicacion, libros=1, prestamos=0)
         
         return True, "Libro actualizado exitosamente"
     
+    def _arboles_libros(self):
+        """
+        Retorna los árboles AVL que indexan libros y ya fueron construidos.
+        
+        Returns:
+            list: Árboles indexados por ISBN, título y autor (solo los construidos)
+        """
+        arboles = (self._indice_construido(nombre)
+                   for nombre in ('arbol_libros_isbn', 'arbol_libros_titulo', 'arbol_libros_autor'))
+        return [arbol for arbol in arboles if arbol is not None]
+    
+    def _indexar_libro(self, libro):
+        """
+        Agrega un libro a todos los índices de búsqueda y a las estadísticas.
+        
+        Args:
+            libro (Libro): Libro a indexar
+        """
+        for arbol in self._arboles_libros():
+            arbol.insertar(libro)
+        for nombre in ('indice_años', 'indice_texto'):
+            indice = self._indice_construido(nombre)
+            if indice is not None:
+                indice.agregar(libro)
+        arbol_reportes = self._indice_construido('arbol_reportes')
+        if arbol_reportes is not None:
+            arbol_reportes.actualizar_estadisticas(libro.año_publicacion, libros=1, prestamos=0)
+    
+    def _cambiar_particion(self, operacion, *args):
+        """
+        Aplica un cambio de libro en el catálogo particionado, si lo hay. Se llama antes
+        de modificar el almacén y los índices locales: si la partición falla, la
+        operación se rechaza sin haber cambiado nada.
+        
+        Returns:
+            str: Mensaje de error, o None si el cambio se aplicó (o no hay particiones)
+        """
+        if self.catalogo_particionado is None:
+            return None
+        try:
+            getattr(self.catalogo_particionado, operacion)(*args)
+        except Exception as e:
+            return f"Error en el catálogo particionado: {str(e)}"
+        return None
+    
+    def _libros_de(self, isbns):
+        # Libros del almacén principal para los ISBN que retornó un índice de libros
+        # (los índices locales y el catálogo particionado guardan solo ISBN)
+        buscar = self.libros.buscar
+        return [buscar(isbn) for isbn in isbns]
+    
+    def _desindexar_libro(self, libro):
+        """
+        Quita un libro de todos los índices de búsqueda y de las estadísticas.
+        
+        Args:
+            libro (Libro): Libro a quitar (con las claves con las que fue indexado)
+        """
+        for arbol in self._arboles_libros():
+            arbol.eliminar(arbol.obtener_clave(libro), libro)
+        if self._indice_construido('indice_años') is not None:
+            self.indice_años.eliminar(libro.isbn, libro.año_publicacion)
+        if self._indice_construido('indice_texto') is not None:
+            self.indice_texto.eliminar(libro.isbn)
+        if self._indice_construido('arbol_reportes') is not None:
+            self.arbol_reportes.actualizar_estadisticas(libro.año_publicacion, libros=-1, prestamos=0)
+    
     def _reconstruir_indices(self):
         """
-        Reconstruye todos los índices de árboles desde cero.
-        Esto se usa cuando se actualizan muchos libros o hay cambios estructurales.
+        Reconstruye todos los índices desde cero (los de búsqueda, en bloque al primer uso).
+        Las operaciones normales mantienen los índices de forma incremental;
+        esto queda como herramienta de recuperación y para cargas completas de datos.
         """
-        # Reinicializar todos los árboles
-        self.arbol_libros_isbn = ArbolAVLLibros('isbn')
-        self.arbol_libros_titulo = ArbolAVLLibros('titulo')
-        self.arbol_libros_autor = ArbolAVLLibros('autor')
         # Volver a construir los índices con los datos actuales
         self._construir_indices()
     
+    @_operacion_escritura
     def eliminar_libro(self, isbn):
         """
         Elimina un libro del sistema.
@@ -242,22 +738,23 @@ class SistemaBiblioteca:
         if prestamos_activos:
             return False, "No se puede eliminar el libro porque tiene préstamos activos"
         
-        # Obtener el libro para actualizar estadísticas
+        # Obtener el libro para quitarlo de los índices
         libro = self.buscar_libro_por_isbn(isbn)
-        if libro:
-            # Actualizar estadísticas restando un libro
-            self.arbol_reportes.actualizar_estadisticas(libro.año_publicacion, libros=-1, prestamos=0)
-        
-        # Eliminar el libro de la lista principal
-        if self.libros.eliminar(lambda libro: libro.isbn == isbn):
-            # Reconstruir índices después de la eliminación
-            self._reconstruir_indices()
-            return True, "Libro eliminado exitosamente"
-        else:
+        if not libro:
             return False, "Libro no encontrado"
+        
+        error = self._cambiar_particion('eliminar', isbn)
+        if error:
+            return False, error
+        
+        # Eliminar el libro del almacén principal y de los índices (O(log N))
+        self.libros.eliminar(isbn)
+        self._desindexar_libro(libro)
+        return True, "Libro eliminado exitosamente"
     
     # ===== MÉTODOS PARA USUARIOS =====
     
+    @_operacion_escritura
     def agregar_usuario(self, id_usuario, nombre, contacto):
         """
         Agrega un nuevo usuario al sistema.
@@ -276,10 +773,13 @@ class SistemaBiblioteca:
         
         # Crear nuevo objeto Usuario
         nuevo_usuario = Usuario(id_usuario, nombre, contacto)
-        # Agregar a la lista principal de usuarios
+        # Agregar al almacén principal de usuarios y al índice de nombres
         self.usuarios.agregar(nuevo_usuario)
+        if self._indice_construido('indice_nombres') is not None:
+            self.indice_nombres.agregar(nuevo_usuario)
         return True, "Usuario agregado exitosamente"
     
+    @_operacion_lectura
     def buscar_usuario_por_id(self, id_usuario):
         """
         Busca un usuario por su ID.
@@ -290,11 +790,13 @@ class SistemaBiblioteca:
         Returns:
             Usuario: El usuario encontrado o None si no existe
         """
-        return self.usuarios.buscar(lambda usuario: usuario.id_usuario == id_usuario)
+        return self.usuarios.buscar(id_usuario)
     
+    @_operacion_lectura
     def buscar_usuarios_por_nombre(self, nombre):
         """
-        Busca usuarios por nombre (búsqueda parcial).
+        Busca usuarios por nombre (búsqueda parcial, sin distinguir mayúsculas ni acentos)
+        usando el índice de trigramas.
         
         Args:
             nombre (str): Nombre o parte del nombre a buscar
@@ -302,8 +804,9 @@ class SistemaBiblioteca:
         Returns:
             list: Lista de usuarios que coinciden con el nombre
         """
-        return [usuario for usuario in self.usuarios.listar() if nombre.lower() in usuario.nombre.lower()]
+        return self.indice_nombres.buscar(nombre)
     
+    @_operacion_lectura
     def listar_usuarios(self):
         """
         Obtiene todos los usuarios del sistema.
@@ -313,6 +816,7 @@ class SistemaBiblioteca:
         """
         return self.usuarios.listar()
     
+    @_operacion_escritura
     def actualizar_usuario(self, id_usuario, nuevos_datos):
         """
         Actualiza la información de un usuario existente.
@@ -329,13 +833,28 @@ class SistemaBiblioteca:
         if not usuario:
             return False, "Usuario no encontrado"
         
+        # Un ID nuevo no puede ser el de otro usuario (se verifica antes de modificar nada)
+        nuevo_id = nuevos_datos.get('id_usuario', id_usuario)
+        if nuevo_id != id_usuario and self.buscar_usuario_por_id(nuevo_id):
+            return False, "Ya existe un usuario con este ID"
+        
         # Actualizar cada campo especificado en nuevos_datos
         for campo, valor in nuevos_datos.items():
             if hasattr(usuario, campo):
                 setattr(usuario, campo, valor)
         
+        # Si cambió el ID, reubicar el usuario en el almacén principal
+        if usuario.id_usuario != id_usuario:
+            self.usuarios.reubicar(id_usuario, usuario)
+        
+        # Reindexar el nombre si cambió el nombre o el ID
+        if self._indice_construido('indice_nombres') is not None and (
+                'nombre' in nuevos_datos or usuario.id_usuario != id_usuario):
+            self.indice_nombres.actualizar(usuario, id_usuario)
+        
         return True, "Usuario actualizado exitosamente"
     
+    @_operacion_escritura
     def eliminar_usuario(self, id_usuario):
         """
         Elimina un usuario del sistema.
@@ -351,14 +870,17 @@ class SistemaBiblioteca:
         if prestamos_activos:
             return False, "No se puede eliminar el usuario porque tiene préstamos activos"
         
-        # Eliminar el usuario de la lista principal
-        if self.usuarios.eliminar(lambda usuario: usuario.id_usuario == id_usuario):
+        # Eliminar el usuario del almacén principal y del índice de nombres
+        if self.usuarios.eliminar(id_usuario):
+            if self._indice_construido('indice_nombres') is not None:
+                self.indice_nombres.eliminar(id_usuario)
             return True, "Usuario eliminado exitosamente"
         else:
             return False, "Usuario no encontrado"
     
     # ===== MÉTODOS PARA PRÉSTAMOS =====
     
+    @_operacion_escritura
     def registrar_prestamo(self, isbn_libro, id_usuario, fecha_prestamo):
         """
         Registra un nuevo préstamo en el sistema.
@@ -385,24 +907,32 @@ class SistemaBiblioteca:
         if not usuario:
             return False, "Usuario no encontrado"
         
+        # Verificar el formato de la fecha
+        try:
+            año_prestamo = datetime.strptime(fecha_prestamo, "%Y-%m-%d").year
+        except ValueError:
+            return False, "Fecha inválida, use el formato YYYY-MM-DD"
+        
         # Generar ID único para el préstamo
         id_prestamo = f"P{self.contador_prestamos:03d}"
         self.contador_prestamos += 1
         
         # Crear nuevo objeto Préstamo
         nuevo_prestamo = Prestamo(id_prestamo, isbn_libro, id_usuario, fecha_prestamo)
-        # Agregar a la lista de préstamos
+        # Agregar a la lista de préstamos y a los índices de préstamos
         self.prestamos.append(nuevo_prestamo)
+        self._indexar_prestamo(nuevo_prestamo)
         
         # Marcar el libro como no disponible
         libro.disponible = False
         
-        # Actualizar estadísticas
-        año_actual = datetime.now().year
-        self.arbol_reportes.actualizar_estadisticas(año_actual, libros=0, prestamos=1)
+        # Actualizar estadísticas en el año del préstamo
+        if self._indice_construido('arbol_reportes') is not None:
+            self.arbol_reportes.actualizar_estadisticas(año_prestamo, libros=0, prestamos=1)
         
         return True, f"Préstamo registrado exitosamente. ID: {id_prestamo}"
     
+    @_operacion_escritura
     def registrar_devolucion(self, id_prestamo, fecha_devolucion):
         """
         Registra la devolución de un préstamo.
@@ -414,13 +944,17 @@ class SistemaBiblioteca:
         Returns:
             tuple: (éxito, mensaje) indicando si la operación fue exitosa
         """
-        # Buscar el préstamo activo por ID
-        prestamo = next((p for p in self.prestamos if p.id_prestamo == id_prestamo and p.activo), None)
+        # Buscar el préstamo activo por ID en el índice de préstamos activos (O(1))
+        prestamo = self.prestamos_activos.get(id_prestamo)
         if not prestamo:
             return False, "Préstamo no encontrado o ya devuelto"
         
-        # Registrar la devolución en el objeto Préstamo
-        prestamo.registrar_devolucion(fecha_devolucion)
+        # Registrar la devolución en el objeto Préstamo y quitarlo de los activos
+        try:
+            prestamo.registrar_devolucion(fecha_devolucion)
+        except ValueError:
+            return False, "Fecha inválida, use el formato YYYY-MM-DD"
+        self._quitar_prestamo_activo(prestamo)
         
         # Marcar el libro como disponible nuevamente
         libro = self.buscar_libro_por_isbn(prestamo.isbn_libro)
@@ -429,6 +963,55 @@ class SistemaBiblioteca:
         
         return True, "Devolución registrada exitosamente"
     
+    @_operacion_lectura
+    def obtener_prestamos_vencidos(self, fecha=None):
+        """
+        Obtiene los préstamos activos cuya fecha límite ya pasó, del más atrasado al más reciente.
+        
+        Args:
+            fecha (str, optional): Fecha de referencia YYYY-MM-DD (por defecto, hoy)
+            
+        Returns:
+            list: Préstamos activos vencidos a esa fecha
+        """
+        return self.cola_vencimientos.vencidos(self._dia_referencia(fecha))
+    
+    @_operacion_lectura
+    def obtener_prestamos_por_vencer(self, dias, fecha=None):
+        """
+        Obtiene los préstamos activos que vencen dentro de los próximos días.
+        
+        Args:
+            dias (int): Cantidad de días hacia adelante (0 = solo los que vencen ese día)
+            fecha (str, optional): Fecha de referencia YYYY-MM-DD (por defecto, hoy)
+            
+        Returns:
+            list: Préstamos activos que vencen en el rango, ordenados por fecha límite
+        """
+        dia = self._dia_referencia(fecha)
+        return self.cola_vencimientos.por_vencer(dia, dia + dias)
+    
+    def _dia_referencia(self, fecha):
+        # Número de día de una fecha YYYY-MM-DD (hoy si no se indica)
+        if fecha is None:
+            return date.today().toordinal()
+        return fecha_a_dia(fecha)
+    
+    @_operacion_lectura
+    def calcular_retrasos(self, fecha_referencia=None):
+        """
+        Calcula los días de retraso de todo el historial de préstamos en una sola pasada.
+        
+        Args:
+            fecha_referencia (str, optional): Fecha YYYY-MM-DD contra la que se miden los
+                préstamos activos (si es None, solo cuentan los préstamos devueltos)
+            
+        Returns:
+            dict: Retraso por préstamo ('retrasos', en el orden de self.prestamos) y totales
+        """
+        return calcular_retrasos(self.prestamos, fecha_referencia)
+    
+    @_operacion_lectura
     def obtener_prestamos_activos(self):
         """
         Obtiene todos los préstamos que están activos (no devueltos).
@@ -436,8 +1019,9 @@ class SistemaBiblioteca:
         Returns:
             list: Lista de préstamos activos
         """
-        return [p for p in self.prestamos if p.activo]
+        return list(self.prestamos_activos.values())
     
+    @_operacion_lectura
     def obtener_prestamos_activos_por_usuario(self, id_usuario):
         """
         Obtiene los préstamos activos de un usuario específico.
@@ -448,8 +1032,9 @@ class SistemaBiblioteca:
         Returns:
             list: Lista de préstamos activos del usuario
         """
-        return [p for p in self.prestamos if p.activo and p.id_usuario == id_usuario]
+        return list(self.prestamos_activos_por_usuario.get(id_usuario, {}).values())
     
+    @_operacion_lectura
     def obtener_prestamos_activos_por_libro(self, isbn_libro):
         """
         Obtiene los préstamos activos de un libro específico.
@@ -460,19 +1045,35 @@ class SistemaBiblioteca:
         Returns:
             list: Lista de préstamos activos del libro
         """
-        return [p for p in self.prestamos if p.activo and p.isbn_libro == isbn_libro]
+        return list(self.prestamos_activos_por_libro.get(isbn_libro, {}).values())
     
+    @_operacion_lectura
+    def buscar_prestamo_por_id(self, id_prestamo):
+        """
+        Busca un préstamo (activo o finalizado) por su ID.
+        
+        Args:
+            id_prestamo (str): ID del préstamo
+            
+        Returns:
+            Prestamo: El préstamo encontrado o None si no existe
+        """
+        posicion = self.prestamos_por_id.get(id_prestamo)
+        return self.prestamos[posicion] if posicion is not None else None
+    
+    @_operacion_lectura
     def listar_todos_los_prestamos(self):
         """
         Obtiene todos los préstamos del sistema (activos e inactivos).
         
         Returns:
-            list: Lista completa de préstamos
+            list: Copia de la lista completa de préstamos
         """
-        return self.prestamos
+        return list(self.prestamos)
     
     # ===== MÉTODOS DE REPORTES AVANZADOS =====
     
+    @_operacion_lectura
     def generar_estadisticas_por_año(self, año_inicio, año_fin):
         """
         Genera estadísticas de libros y préstamos para un rango de años.
@@ -496,10 +1097,7 @@ class SistemaBiblioteca:
         Returns:
             list: Lista de los libros más antiguos
         """
-        # Ordenar libros por año de publicación (ascendente)
-        libros_ordenados = sorted(self.libros.listar(), key=lambda x: x.año_publicacion)
-        # Retornar los primeros 'limite' libros
-        return libros_ordenados[:limite]
+        return self.obtener_libros_por_antiguedad(limite)
     
     def obtener_libros_mas_recientes(self, limite=5):
         """
@@ -511,42 +1109,158 @@ class SistemaBiblioteca:
         Returns:
             list: Lista de los libros más recientes
         """
-        # Ordenar libros por año de publicación (descendente)
-        libros_ordenados = sorted(self.libros.listar(), key=lambda x: x.año_publicacion, reverse=True)
-        # Retornar los primeros 'limite' libros
-        return libros_ordenados[:limite]
+        return self.obtener_libros_por_antiguedad(limite, mas_recientes=True)
+    
+    @_operacion_lectura
+    def obtener_libros_por_antiguedad(self, limite=5, mas_recientes=False, genero=None,
+                                      solo_disponibles=False):
+        """
+        Obtiene los libros más antiguos (o más recientes) que cumplen los filtros,
+        recorriendo el índice por año ya ordenado en lugar de ordenar todo el catálogo.
+        
+        Args:
+            limite (int): Número máximo de libros a retornar
+            mas_recientes (bool): Si se buscan los más recientes en lugar de los más antiguos
+            genero (str, optional): Solo libros de este género (sin distinguir mayúsculas)
+            solo_disponibles (bool): Solo libros disponibles para préstamo
+            
+        Returns:
+            list: Lista de libros ordenada por año de publicación
+        """
+        condiciones = []
+        if genero is not None:
+            genero = genero.lower()
+            condiciones.append(lambda libro: libro.genero.lower() == genero)
+        if solo_disponibles:
+            condiciones.append(lambda libro: libro.disponible)
+        buscar = self.libros.buscar
+        filtro = (lambda isbn: all(condicion(buscar(isbn)) for condicion in condiciones)) if condiciones else None
+        return self._libros_de(self.indice_años.primeros(limite, descendente=mas_recientes, filtro=filtro))
     
     # ===== PERSISTENCIA DE DATOS =====
     
-    def guardar_datos(self, archivo='biblioteca_data.json'):
+    def _secciones_datos(self, copiar=False):
+        """
+        Secciones del archivo de datos, en el orden en que se guardan.
+        
+        Args:
+            copiar (bool): Si los registros se convierten a diccionarios ahora mismo
+                (necesario para escribirlos desde otro hilo); si no, se generan
+                a medida que se escriben
+            
+        Returns:
+            list: Pares (nombre de sección, valor o registros)
+        """
+        secciones = [
+            ('libros', (libro.to_dict() for libro in self.libros)),
+            ('usuarios', (usuario.to_dict() for usuario in self.usuarios)),
+            ('prestamos', (prestamo.to_dict() for prestamo in self.prestamos)),
+            ('contador_prestamos', self.contador_prestamos)
+        ]
+        if copiar:
+            secciones = [(nombre, list(valor) if nombre != 'contador_prestamos' else valor)
+                         for nombre, valor in secciones]
+        # Operaciones del diario ya incluidas en estos datos (no se reaplican al recuperar)
+        if self.diario is not None:
+            secciones.append(('secuencia_diario', self.diario.secuencia))
+        return secciones
+    
+    def _secuencia_diario(self):
+        # Última operación registrada en el diario (0 si no hay diario)
+        return self.diario.secuencia if self.diario is not None else 0
+    
+    def guardar_datos(self, archivo='biblioteca_data.json', compacto=False, binario=None, indices=False):
         """
-        Guarda todos los datos del sistema en un archivo JSON.
+        Guarda todos los datos del sistema en un archivo JSON o en una instantánea binaria.
+        Los registros se escriben por flujo, uno por uno, sin armar antes
+        el documento completo en memoria, en un archivo temporal que reemplaza
+        al original solo cuando está completo y sincronizado con el disco.
+        Mientras se escribe, las consultas siguen y las modificaciones esperan.
+        
+        Con indices=True también se guarda, en archivo + '.indices', el orden de los
+        libros en los árboles de búsqueda ya construidos (ver _actualizar_ordenes_indices).
         
         Args:
             archivo (str): Ruta del archivo donde guardar los datos
+            compacto (bool): Si se guarda sin indentación (archivo más chico y rápido de escribir)
+            binario (bool, optional): Si se guarda en formato binario (por defecto, si la
+                ruta termina en '.bin')
+            indices (bool): Si se guarda también el orden de los árboles de búsqueda
             
         Returns:
             tuple: (éxito, mensaje) indicando si la operación fue exitosa
         """
-        # Preparar diccionario con todos los datos del sistema
-        datos = {
-            'libros': [libro.to_dict() for libro in self.libros.listar()],
-            'usuarios': [usuario.to_dict() for usuario in self.usuarios.listar()],
-            'prestamos': [prestamo.to_dict() for prestamo in self.prestamos],
-            'contador_prestamos': self.contador_prestamos
-        }
-        
+        if binario is None:
+            binario = archivo.endswith('.bin')
         try:
-            # Escribir datos en archivo JSON
-            with open(archivo, 'w', encoding='utf-8') as f:
-                json.dump(datos, f, indent=2, ensure_ascii=False)
+            # El cerrojo de guardado ordena los guardados entre sí: el archivo no cambia hasta
+            # calcular su huella, que se calcula sin el de datos (las modificaciones no la esperan)
+            with self._cerrojo_guardado:
+                with self._cerrojo_datos.lectura():
+                    self._liberar_instantanea(archivo)
+                    # Escritura atómica: una caída a mitad de la escritura deja el archivo anterior intacto
+                    if binario:
+                        escribir_atomico(archivo, lambda f: escribir_instantanea_binaria(
+                            f, self.libros, self.usuarios, self.prestamos, self.contador_prestamos,
+                            self._secuencia_diario()), binario=True)
+                    else:
+                        escribir_atomico(archivo, lambda f: escribir_json_streaming(f, self._secciones_datos(),
+                                                                                     compacto))
+                    self.version_guardada = self.version_datos
+                    cantidad = len(self.libros)
+                    ordenes = self._ordenes_indices() if indices else None
+                self._actualizar_ordenes_indices(archivo, cantidad, ordenes)
             return True, "Datos guardados exitosamente"
         except Exception as e:
             return False, f"Error al guardar datos: {str(e)}"
     
+    def _ordenes_indices(self):
+        """
+        Orden de los libros en cada árbol de INDICES_GUARDADOS, como posiciones en el
+        orden en que se guardan en el archivo. Solo se incluyen los árboles ya
+        construidos (un recorrido, sin ordenar) y los que no se usaron pero conservan
+        el orden leído al cargar (mismos datos, mismas posiciones). Se llama con el
+        cerrojo de datos tomado.
+        
+        Returns:
+            dict: Nombre del árbol -> lista de posiciones
+        """
+        posiciones = None
+        ordenes = {}
+        for nombre in self.INDICES_GUARDADOS:
+            arbol = self._indice_construido(nombre)
+            if arbol is not None:
+                if posiciones is None:
+                    posiciones = {libro.isbn: i for i, libro in enumerate(self.libros)}
+                ordenes[nombre] = arbol.orden_de(posiciones)
+            elif (orden := self._orden_guardado(nombre)) is not None:
+                ordenes[nombre] = orden
+        return ordenes
+    
+    @staticmethod
+    def _actualizar_ordenes_indices(archivo, cantidad, ordenes):
+        """
+        Escribe en archivo + '.indices' los órdenes dados junto con la huella del archivo
+        de datos recién guardado. Sin órdenes, borra el que hubiera: ya no corresponde al
+        archivo y al cargar solo costaría calcular una huella que no coincide.
+        """
+        ruta = archivo + '.indices'
+        if not ordenes:
+            if os.path.exists(ruta):
+                os.remove(ruta)
+            return
+        huella = huella_archivo(archivo)
+        escribir_atomico(ruta, lambda f: escribir_ordenes_indices(f, huella, cantidad, ordenes), binario=True)
+    
     def cargar_datos(self, archivo='biblioteca_data.json'):
         """
-        Carga todos los datos del sistema desde un archivo JSON.
+        Carga todos los datos del sistema desde un archivo JSON o una instantánea binaria
+        (se reconoce por su contenido). Del JSON, cada registro se agrega a su almacén a
+        medida que se lee; la instantánea binaria queda abierta y sus registros se
+        decodifican la primera vez que se usan (ver _abrir_binario). Los datos actuales
+        solo se reemplazan si la carga termina bien.
+        Si junto al archivo está el orden de los árboles guardado para estos mismos
+        datos (archivo + '.indices'), los árboles se arman con él sin ordenar.
         
         Args:
             archivo (str): Ruta del archivo desde donde cargar los datos
@@ -555,49 +1269,428 @@ class SistemaBiblioteca:
             tuple: (éxito, mensaje) indicando si la operación fue exitosa
         """
         try:
-            # Leer datos desde archivo JSON
-            with open(archivo, 'r', encoding='utf-8') as f:
-                datos = json.load(f)
-            
-            # Cargar libros
-            self.libros = ListaEnlazada()
-            for libro_data in datos['libros']:
-                libro = Libro.from_dict(libro_data)
-                self.libros.agregar(libro)
-            
-            # Cargar usuarios
-            self.usuarios = ListaEnlazada()
-            for usuario_data in datos['usuarios']:
-                usuario = Usuario.from_dict(usuario_data)
-                self.usuarios.agregar(usuario)
-            
-            # Cargar préstamos
-            self.prestamos = []
-            for prestamo_data in datos['prestamos']:
-                prestamo = Prestamo.from_dict(prestamo_data)
-                self.prestamos.append(prestamo)
-            
-            # Restaurar contador de préstamos
-            self.contador_prestamos = datos['contador_prestamos']
-            
-            # Reconstruir índices con los datos cargados
-            self._reconstruir_indices()
+            if es_archivo_binario(archivo):
+                libros, usuarios, prestamos, contador_prestamos, secuencia = self._abrir_binario(archivo)
+            else:
+                libros = self.libros.copia_vacia()
+                usuarios = self.usuarios.copia_vacia()
+                with sin_recolector():
+                    prestamos, contador_prestamos, secuencia = self._leer_json(archivo, libros, usuarios)
+            ordenes = None
+            if os.path.exists(archivo + '.indices'):
+                ordenes = leer_ordenes_indices(archivo + '.indices', huella_archivo(archivo))
+            
+            with self._cerrojo_datos.escritura():
+                # Reemplazar los datos del sistema por los cargados
+                self.libros = libros
+                self.usuarios = usuarios
+                self.prestamos = prestamos
+                self.contador_prestamos = contador_prestamos
+                self.secuencia_cargada = secuencia
+                self.version_datos += 1
+                self._ordenes_guardados = (self.version_datos, ordenes) if ordenes else None
+                
+                # Reconstruir índices con los datos cargados (los de búsqueda, al primer uso)
+                self._reconstruir_indices()
+                
+                # Con el diario abierto, los datos cargados pasan a ser la nueva instantánea
+                if self.diario is not None:
+                    self._compactar(en_segundo_plano=False, copiar_estado=True)
             
             return True, "Datos cargados exitosamente"
         except FileNotFoundError:
             return False, "Archivo de datos no encontrado"
         except Exception as e:
             return False, f"Error al cargar datos: {str(e)}"
+    
+    def _leer_json(self, archivo, libros, usuarios):
+        """
+        Lee un archivo JSON por flujo, agregando libros y usuarios a los almacenes dados.
+        
+        Returns:
+            tuple: (lista de préstamos, contador de préstamos, secuencia del diario)
+        """
+        prestamos = []
+        contador_prestamos = None
+        secuencia = 0
+        with open(archivo, 'r', encoding='utf-8') as f:
+            for seccion, valor in leer_json_streaming(f):
+                if seccion == 'libros':
+                    libros.agregar(Libro.from_dict(valor))
+                elif seccion == 'usuarios':
+                    usuarios.agregar(Usuario.from_dict(valor))
+                elif seccion == 'prestamos':
+                    prestamos.append(Prestamo.from_dict(valor))
+                elif seccion == 'contador_prestamos':
+                    contador_prestamos = valor
+                elif seccion == 'secuencia_diario':
+                    secuencia = valor
+        if contador_prestamos is None:
+            raise KeyError('contador_prestamos')
+        return prestamos, contador_prestamos, secuencia
+    
+    def _abrir_binario(self, archivo):
+        """
+        Abre una instantánea binaria mapeada en memoria sin decodificar sus registros:
+        libros, usuarios y préstamos se leen del archivo la primera vez que se usan
+        (ver AlmacenInstantanea e HistorialInstantanea). El almacén columnar guarda sus
+        propias columnas, así que con él los libros se copian todos al cargar.
+        
+        Returns:
+            tuple: (libros, usuarios, préstamos, contador de préstamos, secuencia del diario)
+        """
+        instantanea = InstantaneaBinaria(archivo)
+        libros = self.libros.copia_vacia()
+        if isinstance(libros, AlmacenRegistros):
+            libros = AlmacenInstantanea(instantanea, 'libros', libros.atributo_clave)
+        else:
+            with sin_recolector():
+                for libro in instantanea.iterar_libros():
+                    libros.agregar(libro)
+        usuarios = AlmacenInstantanea(instantanea, 'usuarios', self.usuarios.atributo_clave)
+        prestamos = HistorialInstantanea(instantanea)
+        return libros, usuarios, prestamos, instantanea.contador_prestamos, instantanea.secuencia_diario
+    
+    def _liberar_instantanea(self, archivo):
+        """
+        Termina de decodificar los registros que todavía se leen de la instantánea
+        binaria `archivo` y la deja de usar, antes de reemplazar ese archivo (en
+        Windows no se puede reemplazar un archivo mapeado en memoria). Guardar
+        recorre todos los registros de todos modos.
+        """
+        for registros in (self.libros, self.usuarios, self.prestamos):
+            if isinstance(registros, (AlmacenInstantanea, HistorialInstantanea)) and registros.usa_archivo(archivo):
+                registros.soltar()
+
+    # ===== DIARIO DE OPERACIONES =====
+    
+    def abrir_diario(self, archivo='biblioteca_data.json', sincronizar=SINCRONIZAR_SIEMPRE, intervalo=1.0,
+                     umbral_compactacion=10000):
+        """
+        Recupera el estado guardado (última instantánea + operaciones del diario) y
+        empieza a registrar en el diario cada operación que modifique el sistema.
+        
+        Args:
+            archivo (str): Archivo de la instantánea (binaria si termina en '.bin'); el diario
+                se guarda junto a él (archivo + '.diario')
+            sincronizar (str): Política de fsync del diario ('siempre', 'intervalo' o 'nunca')
+            intervalo (float): Segundos entre fsync con la política 'intervalo'
+            umbral_compactacion (int): Operaciones en el diario que disparan una compactación
+            
+        Returns:
+            tuple: (éxito, mensaje) indicando si la operación fue exitosa
+        """
+        if self.diario is not None:
+            return False, "El diario ya está abierto"
+        
+        # Cargar la última instantánea, si existe
+        self.secuencia_cargada = 0
+        if os.path.exists(archivo):
+            exito, mensaje = self.cargar_datos(archivo)
+            if not exito:
+                return False, mensaje
+        
+        # Reaplicar las operaciones posteriores a la instantánea: primero las de diarios
+        # rotados que no se llegaron a compactar, luego las del diario actual
+        ruta_diario = archivo + '.diario'
+        try:
+            secuencia, recuperadas = self._reaplicar_diarios(
+                self._diarios_rotados(ruta_diario) + [ruta_diario], self.secuencia_cargada)
+        except ValueError as e:
+            return False, str(e)
+        
+        self.archivo_instantanea = archivo
+        self.umbral_compactacion = umbral_compactacion
+        self.diario = DiarioOperaciones(ruta_diario, sincronizar, intervalo, secuencia)
+        
+        # Dejar una instantánea al día y el diario vacío; puede no haber una instantánea
+        # anterior, así que se escribe el estado en memoria (todavía no hay otros hilos)
+        self._compactar(en_segundo_plano=False, copiar_estado=True)
+        return True, f"Diario abierto ({recuperadas} operaciones recuperadas)"
+    
+    def _reaplicar_diarios(self, rutas, secuencia):
+        """
+        Reaplica, en orden, las operaciones de los diarios `rutas` posteriores a `secuencia`.
+        
+        Returns:
+            tuple: (secuencia de la última operación aplicada, operaciones reaplicadas)
+            
+        Raises:
+            ValueError: Si un diario tiene una operación que no se puede reaplicar
+        """
+        recuperadas = 0
+        for ruta in rutas:
+            for entrada in leer_diario(ruta):
+                if entrada['n'] <= secuencia:
+                    continue
+                if entrada['op'] not in _OPERACIONES_DIARIO:
+                    raise ValueError(f"Operación desconocida en el diario: {entrada['op']}")
+                getattr(self, entrada['op'])(*entrada['args'], **entrada.get('kwargs', {}))
+                secuencia = entrada['n']
+                recuperadas += 1
+        return secuencia, recuperadas
+    
+    def compactar_diario(self, en_segundo_plano=True):
+        """
+        Escribe una nueva instantánea y descarta las operaciones del diario que quedaron
+        incluidas en ella. Con el cerrojo de escritura tomado solo se rota el diario; la
+        nueva instantánea se arma en un hilo aparte reaplicando los diarios rotados sobre
+        la instantánea anterior (lo mismo que se haría al recuperarse de una caída), así
+        que las modificaciones no esperan a que se copie todo el estado.
+        
+        Args:
+            en_segundo_plano (bool): Si se escribe en otro hilo o se espera a que termine
+            
+        Returns:
+            tuple: (éxito, mensaje) indicando si la operación fue exitosa
+        """
+        return self._compactar(en_segundo_plano)
+    
+    def _compactar(self, en_segundo_plano, copiar_estado=False):
+        """
+        Rota el diario y escribe la instantánea que lo reemplaza (ver compactar_diario).
+        
+        Args:
+            en_segundo_plano (bool): Si se escribe en otro hilo o se espera a que termine
+            copiar_estado (bool): Si la instantánea se arma copiando el estado en memoria
+                con el cerrojo tomado en lugar de reaplicar los diarios rotados
+            
+        Returns:
+            tuple: (éxito, mensaje) indicando si la operación fue exitosa
+        """
+        if self.diario is None:
+            return False, "No hay un diario abierto"
+        if self._compactacion is not None and self._compactacion.is_alive():
+            if en_segundo_plano:
+                return False, "Ya hay una compactación en curso"
+            self._compactacion.join()
+        
+        # Rotar el diario en un punto fijo de la secuencia (y copiar el estado en ese punto)
+        archivo = self.archivo_instantanea
+        with self._cerrojo_datos.escritura():
+            ruta_diario = self.diario.ruta
+            secuencia = self.diario.secuencia
+            secciones = self._secciones_datos(copiar=True) if copiar_estado else None
+            self._liberar_instantanea(archivo)
+            if self.diario.operaciones:
+                self.diario.rotar(f"{ruta_diario}.{secuencia}")
+        
+        def escribir_instantanea():
+            # Los diarios rotados hasta `secuencia` ya no cambian: se leen sin el cerrojo
+            rotados = [ruta for ruta in self._diarios_rotados(ruta_diario)
+                       if int(ruta.rsplit('.', 1)[1]) <= secuencia]
+            if secciones is not None:
+                self._escribir_copia(archivo, secciones, compacto=True)
+            else:
+                self._escribir_copia(archivo, self._reconstruir_instantanea(archivo, rotados), compacto=True)
+            # La instantánea ya incluye todo hasta `secuencia`: borrar los diarios rotados
+            for ruta in rotados:
+                os.remove(ruta)
+        
+        if en_segundo_plano:
+            self._compactacion = threading.Thread(target=escribir_instantanea, daemon=True)
+            self._compactacion.start()
+            return True, "Compactación iniciada"
+        try:
+            escribir_instantanea()
+        except Exception as e:
+            return False, f"Error al compactar el diario: {str(e)}"
+        return True, "Diario compactado"
+    
+    @staticmethod
+    def _reconstruir_instantanea(archivo, rotados):
+        """
+        Carga la instantánea `archivo` en un sistema aparte y le reaplica los diarios
+        rotados. No toca las estructuras del sistema: puede ejecutarse en otro hilo.
+        
+        Returns:
+            list: Secciones para _escribir_copia, como las de _secciones_datos(copiar=True)
+        """
+        sistema = SistemaBiblioteca()
+        exito, mensaje = sistema.cargar_datos(archivo)
+        if not exito:
+            raise OSError(mensaje)
+        secuencia, _ = sistema._reaplicar_diarios(rotados, sistema.secuencia_cargada)
+        # Dejar de leer la instantánea que se va a reemplazar
+        sistema._liberar_instantanea(archivo)
+        return sistema._secciones_datos() + [('secuencia_diario', secuencia)]
+    
+    @staticmethod
+    def _escribir_copia(archivo, secciones, compacto):
+        """
+        Escribe de forma atómica una copia del estado tomada con _secciones_datos(copiar=True).
+        Puede ejecutarse en otro hilo: no toca las estructuras del sistema.
+        """
+        if archivo.endswith('.bin'):
+            # Los registros copiados se vuelven a armar como objetos en este hilo
+            datos = dict(secciones)
+            escribir_atomico(archivo, lambda f: escribir_instantanea_binaria(
+                f, map(Libro.from_dict, datos['libros']), map(Usuario.from_dict, datos['usuarios']),
+                map(Prestamo.from_dict, datos['prestamos']), datos['contador_prestamos'],
+                datos.get('secuencia_diario', 0)), binario=True)
+        else:
+            escribir_atomico(archivo, lambda f: escribir_json_streaming(f, secciones, compacto))
+    
+    def cerrar_diario(self):
+        """
+        Espera la compactación en curso y cierra el diario (deja de registrar operaciones).
+        """
+        if self.diario is None:
+            return
+        if self._compactacion is not None:
+            self._compactacion.join()
+            self._compactacion = None
+        self.diario.cerrar()
+        self.diario = None
+    
+    @staticmethod
+    def _diarios_rotados(ruta_diario):
+        # Diarios rotados pendientes de compactar (ruta_diario.<secuencia>), en orden
+        rutas = [ruta for ruta in glob.glob(glob.escape(ruta_diario) + '.*')
+                 if ruta.rsplit('.', 1)[1].isdigit()]
+        return sorted(rutas, key=lambda ruta: int(ruta.rsplit('.', 1)[1]))
+
+    # ===== CATÁLOGO PARTICIONADO =====
+    
+    def particionar_catalogo(self, particiones=None):
+        """
+        Reparte los índices de búsqueda de libros en particiones por hash del ISBN,
+        cada una en su propio proceso (ver CatalogoParticionado). Las búsquedas por
+        título, autor y rango de años se resuelven en todas las particiones en
+        paralelo; los libros, los préstamos y la búsqueda por ISBN siguen en este
+        proceso, que tiene los datos completos.
+        
+        Args:
+            particiones (int, optional): Cantidad de particiones (por defecto, una por núcleo)
+            
+        Returns:
+            tuple: (éxito, mensaje) indicando si la operación fue exitosa
+        """
+        with self._cerrojo_datos.escritura():
+            self.cerrar_particiones()
+            catalogo = CatalogoParticionado(particiones)
+            try:
+                catalogo.cargar(self.libros)
+            except Exception as e:
+                catalogo.cerrar()
+                return False, f"Error al particionar el catálogo: {str(e)}"
+            self.catalogo_particionado = catalogo
+        return True, f"Catálogo repartido en {catalogo.particiones} particiones"
+    
+    def cerrar_particiones(self):
+        """
+        Termina los procesos del catálogo particionado; las búsquedas vuelven a
+        los índices de este proceso.
+        """
+        with self._cerrojo_datos.escritura():
+            if self.catalogo_particionado is not None:
+                self.catalogo_particionado.cerrar()
+                self.catalogo_particionado = None
+    
+    # ===== AUTOGUARDADO =====
+    
+    def hay_cambios_sin_guardar(self):
+        """
+        Indica si hubo operaciones que modificaron datos desde el último guardado.
+        
+        Returns:
+            bool: True si los datos cambiaron desde el último guardado
+        """
+        return self.version_datos != self.version_guardada
+    
+    def guardar_cambios(self, archivo='biblioteca_data.json', compacto=False, forzar=False, indices=False):
+        """
+        Guarda los datos solo si cambiaron desde el último guardado. Se puede llamar
+        desde cualquier hilo: el estado se copia con el cerrojo de datos tomado para
+        lectura (las modificaciones esperan solo durante la copia, las consultas ni
+        eso) y la escritura atómica se hace después, sin bloquear al resto del sistema.
+        
+        Args:
+            archivo (str): Ruta del archivo (instantánea binaria si termina en '.bin')
+            compacto (bool): Si el JSON se guarda sin indentación
+            forzar (bool): Si se guarda aunque no haya cambios
+            indices (bool): Si se guarda también el orden de los árboles de búsqueda,
+                como en guardar_datos
+            
+        Returns:
+            tuple: (éxito, mensaje) indicando si la operación fue exitosa
+        """
+        with self._cerrojo_guardado:
+            with self._cerrojo_datos.lectura():
+                version = self.version_datos
+                if version == self.version_guardada and not forzar:
+                    return True, "No hay cambios que guardar"
+                secciones = self._secciones_datos(copiar=True)
+                self._liberar_instantanea(archivo)
+                cantidad = len(self.libros)
+                ordenes = self._ordenes_indices() if indices else None
+            try:
+                self._escribir_copia(archivo, secciones, compacto)
+                self._actualizar_ordenes_indices(archivo, cantidad, ordenes)
+            except Exception as e:
+                return False, f"Error al guardar datos: {str(e)}"
+        with self._cerrojo_datos.escritura():
+            # Otro guardado más reciente pudo haber terminado antes que este
+            self.version_guardada = max(self.version_guardada, version)
+        return True, "Datos guardados exitosamente"
+    
+    def iniciar_autoguardado(self, archivo='biblioteca_data.json', intervalo=30.0, compacto=True, indices=False):
+        """
+        Inicia un hilo que guarda los datos cada `intervalo` segundos si hubo cambios.
+        
+        Args:
+            archivo (str): Ruta del archivo donde guardar
+            intervalo (float): Segundos entre guardados
+            compacto (bool): Si el JSON se guarda sin indentación
+            indices (bool): Si se guarda también el orden de los árboles de búsqueda
+            
+        Returns:
+            tuple: (éxito, mensaje) indicando si la operación fue exitosa
+        """
+        if self._autoguardado is not None:
+            return False, "El autoguardado ya está activo"
+        self._detener_autoguardado.clear()
+        
+        def autoguardar():
+            while not self._detener_autoguardado.wait(intervalo):
+                self.resultado_autoguardado = self.guardar_cambios(archivo, compacto, indices=indices)
+        
+        self._autoguardado = threading.Thread(target=autoguardar, daemon=True)
+        self._autoguardado.start()
+        return True, "Autoguardado iniciado"
+    
+    def detener_autoguardado(self):
+        """
+        Detiene el hilo de autoguardado (espera a que termine el guardado en curso).
+        """
+        if self._autoguardado is None:
+            return
+        self._detener_autoguardado.set()
+        self._autoguardado.join()
+        self._autoguardado = None
 
 # Función para obtener la instancia del sistema
-def obtener_sistema():
+def obtener_sistema(archivo_diario=None, base_datos=None):
     """
     Función factory que retorna una instancia del sistema de biblioteca.
     
+    Args:
+        archivo_diario (str, optional): Si se indica, recupera el estado guardado en
+            ese archivo (instantánea + diario) y registra cada operación en el diario
+        base_datos (str, optional): Si se indica, usa el sistema guardado en esa base
+            de datos SQLite en lugar de mantener los datos en memoria
+    
     Returns:
-        SistemaBiblioteca: Instancia del sistema
+        SistemaBiblioteca: Instancia del sistema (SistemaBibliotecaSQLite con base_datos)
     """
-    return SistemaBiblioteca()
+    if base_datos is not None:
+        return SistemaBibliotecaSQLite(base_datos)
+    sistema = SistemaBiblioteca()
+    if archivo_diario is not None:
+        exito, mensaje = sistema.abrir_diario(archivo_diario)
+        if not exito:
+            raise RuntimeError(mensaje)
+    return sistema
 
 # Clase para pruebas del sistema avanzado
 class PruebasSistemaAvanzado:
@@ -0,0 +1,264 @@
+import gc
+import hashlib
+import json
+import os
+import re
+import tempfile
+from contextlib import contextmanager
+
+# Tamaño de los bloques leídos del archivo durante la carga por flujo
+TAMANIO_BLOQUE = 1 << 16
+
+_decodificador = json.JSONDecoder()
+_codificador_compacto = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+_codificador_legible = json.JSONEncoder(ensure_ascii=False, indent=2)
+_ESPACIOS = re.compile(r'[ \t\r\n]*')
+
+
+def _codificar_legible(valor, nivel=2):
+    # Codifica un valor indentado `nivel` niveles, como lo haría json.dump (2 en los
+    # registros de los arreglos, 1 en los valores directos del objeto principal).
+    # Los registros planos (sin listas ni objetos anidados) se arman con el
+    # codificador compacto, que es mucho más rápido que el de indentación
+    sangria = '\n' + '  ' * nivel
+    if isinstance(valor, dict) and valor and not any(isinstance(v, (dict, list, tuple)) for v in valor.values()):
+        codificar = _codificador_compacto.encode
+        campos = (',' + sangria + '  ').join(f'{codificar(clave)}: {codificar(v)}' for clave, v in valor.items())
+        return '{' + sangria + '  ' + campos + sangria + '}'
+    return _codificador_legible.encode(valor).replace('\n', sangria)
+
+
+def escribir_json_streaming(archivo, secciones, compacto=False):
+    """
+    Escribe un objeto JSON sección por sección, registro por registro, sin armar
+    antes el documento completo en memoria. Las listas pueden ser generadores.
+
+    El resultado es JSON estándar (json.load lo puede leer). En modo legible tiene
+    el mismo formato que json.dump(..., indent=2); en modo compacto no tiene
+    espacios y deja un registro por línea.
+
+    Args:
+        archivo (file): Archivo de texto abierto para escritura
+        secciones (list): Pares (clave, valor); si el valor es una lista o un
+            generador se escribe como arreglo JSON, elemento por elemento
+        compacto (bool): Si se omite la indentación
+    """
+    if compacto:
+        codificar = codificar_valor = _codificador_compacto.encode
+        apertura, separador, cierre = '{', ',\n', '}\n'
+        inicio_lista, separador_lista, fin_lista = '[\n', ',\n', '\n]'
+        clave_valor = '{}:'
+    else:
+        # Cada registro se indenta dos niveles, como lo haría json.dump
+        codificar = _codificar_legible
+        codificar_valor = lambda valor: _codificar_legible(valor, 1)
+        apertura, separador, cierre = '{\n  ', ',\n  ', '\n}'
+        inicio_lista, separador_lista, fin_lista = '[\n    ', ',\n    ', '\n  ]'
+        clave_valor = '{}: '
+
+    archivo.write(apertura)
+    for i, (clave, valor) in enumerate(secciones):
+        if i:
+            archivo.write(separador)
+        archivo.write(clave_valor.format(_codificador_compacto.encode(clave)))
+        if isinstance(valor, (list, tuple)) or hasattr(valor, '__next__'):
+            archivo.write(_escribir_arreglo(archivo, valor, codificar, inicio_lista, separador_lista, fin_lista))
+        else:
+            archivo.write(codificar_valor(valor))
+    archivo.write(cierre)
+
+
+def _escribir_arreglo(archivo, elementos, codificar, inicio, separador, fin):
+    # Escribe los elementos del arreglo en tandas; retorna el cierre del arreglo
+    tanda = []
+    vacio = True
+    for elemento in elementos:
+        tanda.append(codificar(elemento))
+        if len(tanda) >= 1024:
+            archivo.write((inicio if vacio else separador) + separador.join(tanda))
+            vacio = False
+            tanda = []
+    if tanda:
+        archivo.write((inicio if vacio else separador) + separador.join(tanda))
+        vacio = False
+    return '[]' if vacio else fin
+
+
+def escribir_atomico(ruta, escribir, binario=False):
+    """
+    Escribe un archivo completo o nada: el contenido va a un temporal en el mismo
+    directorio, se sincroniza con el disco y recién entonces reemplaza al original.
+
+    Args:
+        ruta (str): Ruta del archivo final
+        escribir (callable): Función que recibe el archivo abierto y escribe el contenido
+        binario (bool): Si el archivo se abre en modo binario en lugar de texto UTF-8
+    """
+    directorio = os.path.dirname(os.path.abspath(ruta))
+    descriptor, temporal = tempfile.mkstemp(prefix=os.path.basename(ruta) + '.', suffix='.tmp', dir=directorio)
+    try:
+        with (os.fdopen(descriptor, 'wb') if binario else os.fdopen(descriptor, 'w', encoding='utf-8')) as f:
+            escribir(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporal, ruta)
+    except BaseException:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
+
+
+def huella_archivo(ruta):
+    """
+    Huella del contenido de un archivo (BLAKE2b de 16 bytes), leída por bloques.
+    
+    Args:
+        ruta (str): Ruta del archivo
+        
+    Returns:
+        bytes: Huella de 16 bytes
+    """
+    huella = hashlib.blake2b(digest_size=16)
+    with open(ruta, 'rb') as f:
+        while bloque := f.read(1 << 20):
+            huella.update(bloque)
+    return huella.digest()
+
+
+@contextmanager
+def sin_recolector():
+    """
+    Pausa el recolector de ciclos mientras se crean muchos objetos de una vez
+    (carga de datos): los registros no forman ciclos y el recolector solo
+    recorrería una y otra vez los objetos recién creados.
+    """
+    activo = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if activo:
+            gc.enable()
+
+
+class _LectorBloques:
+    # Buffer de texto que se rellena por bloques a medida que el análisis avanza
+    def __init__(self, archivo):
+        self.archivo = archivo
+        self.texto = ''
+        self.posicion = 0
+        self.fin_archivo = False
+
+    def rellenar(self):
+        # Descarta lo ya consumido y agrega el siguiente bloque; False si no hay más
+        if self.fin_archivo:
+            return False
+        bloque = self.archivo.read(TAMANIO_BLOQUE)
+        self.texto = self.texto[self.posicion:] + bloque
+        self.posicion = 0
+        self.fin_archivo = not bloque
+        return bool(bloque)
+
+    def siguiente_caracter(self):
+        # Salta espacios y retorna el siguiente carácter significativo (sin consumirlo)
+        while True:
+            texto = self.texto
+            posicion = self.posicion = _ESPACIOS.match(texto, self.posicion).end()
+            if posicion < len(texto):
+                return texto[posicion]
+            if not self.rellenar():
+                raise ValueError("Fin inesperado del archivo JSON")
+
+    def consumir(self, esperado):
+        if self.siguiente_caracter() != esperado:
+            raise ValueError(f"JSON inválido: se esperaba {esperado!r} en la posición {self.posicion}")
+        self.posicion += 1
+
+    def verificar_fin(self):
+        # Después del objeto principal solo pueden quedar espacios (como exige json.load)
+        while True:
+            self.posicion = _ESPACIOS.match(self.texto, self.posicion).end()
+            if self.posicion < len(self.texto):
+                raise ValueError(f"JSON inválido: contenido extra después del objeto en la posición {self.posicion}")
+            if not self.rellenar():
+                return
+
+    def valor(self):
+        # Decodifica un valor JSON completo, pidiendo más texto si quedó cortado
+        self.siguiente_caracter()
+        while True:
+            try:
+                valor, fin = _decodificador.raw_decode(self.texto, self.posicion)
+            except json.JSONDecodeError:
+                if not self.rellenar():
+                    raise
+                continue
+            # Un número al final del buffer podría continuar en el próximo bloque
+            if fin == len(self.texto) and self.rellenar():
+                continue
+            self.posicion = fin
+            return valor
+
+
+def leer_json_streaming(archivo):
+    """
+    Lee un objeto JSON por flujo, sin cargar el documento completo en memoria.
+    Acepta cualquier formato de espacios (archivos guardados con json.dump o
+    con escribir_json_streaming).
+
+    Args:
+        archivo (file): Archivo de texto abierto para lectura
+
+    Yields:
+        tuple: (clave, valor) por cada valor simple del objeto principal, y
+               (clave, elemento) por cada elemento de sus arreglos, en orden
+
+    Raises:
+        ValueError: Si el contenido no es un objeto JSON válido (incluye texto
+            sobrante después del objeto, que json.load también rechaza)
+    """
+    lector = _LectorBloques(archivo)
+    lector.consumir('{')
+    vacio = lector.siguiente_caracter() == '}'
+    while not vacio:
+        clave = lector.valor()
+        lector.consumir(':')
+        if lector.siguiente_caracter() == '[':
+            lector.posicion += 1
+            if lector.siguiente_caracter() == ']':
+                lector.posicion += 1
+            else:
+                while True:
+                    yield clave, lector.valor()
+                    if lector.siguiente_caracter() == ']':
+                        lector.posicion += 1
+                        break
+                    lector.consumir(',')
+        else:
+            yield clave, lector.valor()
+        if lector.siguiente_caracter() == '}':
+            break
+        lector.consumir(',')
+    lector.posicion += 1
+    lector.verificar_fin()
+
+
+# Bloque de prueba para verificar la escritura y lectura por flujo
+if __name__ == "__main__":
+    import io
+
+    print("=== Prueba de persistencia por flujo ===")
+    datos = {'libros': [{'isbn': '1', 'titulo': 'Año'}, {'isbn': '2', 'titulo': 'B'}],
+             'usuarios': [], 'contador_prestamos': 3}
+
+    for compacto in (False, True):
+        salida = io.StringIO()
+        escribir_json_streaming(salida, [('libros', iter(datos['libros'])), ('usuarios', []),
+                                         ('contador_prestamos', 3)], compacto)
+        texto = salida.getvalue()
+        print(texto)
+        print(f"Compatible con json.load: {json.loads(texto) == datos}")
+        print(f"Igual a json.dump: {texto == json.dumps(datos, indent=2, ensure_ascii=False)}")
+        print(f"Lectura por flujo: {list(leer_json_streaming(io.StringIO(texto)))}")
+
+    print("=== Prueba completada ===")
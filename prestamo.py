@@ -1,4 +1,47 @@
-from datetime import datetime, timedelta  # CORREGIDO: agregado timedelta
+from datetime import date, datetime
+
+# NumPy es opcional: solo acelera el cálculo de retrasos en lote
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Período de préstamo estándar en días
+DIAS_PRESTAMO = 15
+
+
+def fecha_a_dia(fecha):
+    """
+    Convierte una fecha 'YYYY-MM-DD' en su número de día (ordinal gregoriano).
+    También acepta mes y día sin ceros a la izquierda ('2023-1-5'), como
+    strptime("%Y-%m-%d"), para que los archivos de datos existentes se sigan cargando.
+    
+    Args:
+        fecha (str): Fecha en formato YYYY-MM-DD, o None
+        
+    Returns:
+        int: Número de día (None si la fecha es None)
+        
+    Raises:
+        ValueError: Si la fecha no tiene el formato YYYY-MM-DD
+    """
+    if fecha is None:
+        return None
+    if len(fecha) == 10 and fecha[4] == '-' and fecha[7] == '-':
+        try:
+            return date.fromisoformat(fecha).toordinal()
+        except ValueError:
+            pass
+    try:
+        return datetime.strptime(fecha, "%Y-%m-%d").toordinal()
+    except ValueError:
+        raise ValueError(f"Fecha inválida: {fecha!r}, use el formato YYYY-MM-DD") from None
+
+
+def dia_a_fecha(dia):
+    # Convierte un número de día en la fecha 'YYYY-MM-DD' (None si el día es None)
+    return None if dia is None else date.fromordinal(dia).isoformat()
+
 
 class Prestamo:
     """
@@ -6,6 +49,10 @@ class Prestamo:
     Gestiona el ciclo de vida de un préstamo desde su creación hasta su devolución.
     """
     
+    # Atributos fijos: sin __dict__ por instancia (el historial de préstamos crece sin límite)
+    # Las fechas se guardan como números de día (se interpretan una sola vez al asignarlas)
+    __slots__ = ('id_prestamo', 'isbn_libro', 'id_usuario', 'dia_prestamo', 'dia_devolucion', 'activo')
+    
     def __init__(self, id_prestamo, isbn_libro, id_usuario, fecha_prestamo):
         """
         Inicializa un nuevo préstamo en el sistema.
@@ -29,6 +76,29 @@ class Prestamo:
         # Estado del préstamo (True = activo, False = finalizado)
         self.activo = True
     
+    @property
+    def fecha_prestamo(self):
+        # Fecha del préstamo en formato YYYY-MM-DD
+        return dia_a_fecha(self.dia_prestamo)
+    
+    @fecha_prestamo.setter
+    def fecha_prestamo(self, fecha):
+        self.dia_prestamo = fecha_a_dia(fecha)
+    
+    @property
+    def fecha_devolucion(self):
+        # Fecha de devolución en formato YYYY-MM-DD (None si no se ha devuelto)
+        return dia_a_fecha(self.dia_devolucion)
+    
+    @fecha_devolucion.setter
+    def fecha_devolucion(self, fecha):
+        self.dia_devolucion = fecha_a_dia(fecha)
+    
+    @property
+    def dia_limite(self):
+        # Número de día en que vence el préstamo
+        return self.dia_prestamo + DIAS_PRESTAMO
+    
     def __str__(self):
         """
         Representación en string del objeto Prestamo.
@@ -101,6 +171,24 @@ class Prestamo:
         # Retornar el préstamo creado
         return prestamo
     
+    @classmethod
+    def desde_dias(cls, id_prestamo, isbn_libro, id_usuario, dia_prestamo, dia_devolucion, activo):
+        """
+        Crea un préstamo a partir de fechas ya convertidas a números de día
+        (por ejemplo, al leer una instantánea binaria), sin interpretar texto.
+        
+        Returns:
+            Prestamo: Nueva instancia de Prestamo
+        """
+        prestamo = cls.__new__(cls)
+        prestamo.id_prestamo = id_prestamo
+        prestamo.isbn_libro = isbn_libro
+        prestamo.id_usuario = id_usuario
+        prestamo.dia_prestamo = dia_prestamo
+        prestamo.dia_devolucion = dia_devolucion
+        prestamo.activo = activo
+        return prestamo
+    
     def dias_retraso(self):
         """
         Calcula los días de retraso en la devolución del préstamo.
@@ -109,26 +197,60 @@ class Prestamo:
             int: Número de días de retraso (0 si no hay retraso o el préstamo está activo)
         """
         # Si el préstamo está activo o no tiene fecha de devolución, no hay retraso
-        if self.activo or not self.fecha_devolucion:
+        if self.activo or self.dia_devolucion is None:
             return 0
         
-        # Convertir fechas de string a objetos datetime para cálculos
-        fecha_prestamo = datetime.strptime(self.fecha_prestamo, "%Y-%m-%d")
-        fecha_devolucion = datetime.strptime(self.fecha_devolucion, "%Y-%m-%d")
-        
-        # Período de préstamo estándar: 15 días
-        dias_prestamo = 15
-        # Calcular fecha límite para la devolución
-        fecha_limite = fecha_prestamo + timedelta(days=dias_prestamo)
-        
-        # Verificar si hubo retraso
-        if fecha_devolucion > fecha_limite:
-            # Calcular días de retraso
-            retraso = (fecha_devolucion - fecha_limite).days
-            return retraso
-        
-        # No hubo retraso
-        return 0
+        # Días transcurridos después de la fecha límite (las fechas ya son números de día)
+        retraso = self.dia_devolucion - self.dia_limite
+        return retraso if retraso > 0 else 0
+
+
+def calcular_retrasos(prestamos, fecha_referencia=None):
+    """
+    Calcula los días de retraso de muchos préstamos en una sola pasada.
+    Usa NumPy si está instalado y un recorrido en Python puro si no.
+    
+    Args:
+        prestamos (list): Préstamos a evaluar
+        fecha_referencia (str, optional): Fecha YYYY-MM-DD contra la que se mide el
+            retraso de los préstamos activos. Si es None, los préstamos activos no
+            cuentan como retrasados (igual que Prestamo.dias_retraso)
+            
+    Returns:
+        dict: 'retrasos' (días de retraso de cada préstamo, en el mismo orden),
+              'total_dias', 'prestamos_con_retraso', 'maximo' y 'promedio'
+              (promedio de días entre los préstamos con retraso)
+    """
+    dia_referencia = fecha_a_dia(fecha_referencia)
+    # Un préstamo activo se cierra en la fecha de referencia; sin ella, el día -1
+    # garantiza que no tenga retraso
+    sin_cierre = -1 if dia_referencia is None else dia_referencia
+    
+    if np is not None:
+        cantidad = len(prestamos)
+        prestamo = np.fromiter((p.dia_prestamo for p in prestamos), dtype=np.int64, count=cantidad)
+        cierre = np.fromiter((sin_cierre if p.activo or p.dia_devolucion is None else p.dia_devolucion
+                              for p in prestamos), dtype=np.int64, count=cantidad)
+        vector = np.maximum(cierre - prestamo - DIAS_PRESTAMO, 0)
+        retrasos = vector.tolist()
+        total = int(vector.sum())
+        con_retraso = int(np.count_nonzero(vector))
+        maximo = int(vector.max()) if cantidad else 0
+    else:
+        retrasos = [max((sin_cierre if p.activo or p.dia_devolucion is None else p.dia_devolucion)
+                        - p.dia_prestamo - DIAS_PRESTAMO, 0)
+                    for p in prestamos]
+        total = sum(retrasos)
+        con_retraso = len(retrasos) - retrasos.count(0)
+        maximo = max(retrasos, default=0)
+    
+    return {
+        'retrasos': retrasos,
+        'total_dias': total,
+        'prestamos_con_retraso': con_retraso,
+        'maximo': maximo,
+        'promedio': total / con_retraso if con_retraso else 0
+    }
 
 
 # Bloque de prueba para verificar el funcionamiento de la clase Prestamo
@@ -156,4 +278,9 @@ if __name__ == "__main__":
     prestamo_retraso.registrar_devolucion("2023-10-20")  # 4 días de retraso (15 días de préstamo)
     print(f"Días de retraso: {prestamo_retraso.dias_retraso()}")
     
+    # Probar cálculo de retrasos en lote (el préstamo activo se mide contra la fecha de referencia)
+    prestamo_activo = Prestamo("P003", "978-0451526342", "U003", "2023-10-10")
+    resumen = calcular_retrasos([prestamo_prueba, prestamo_retraso, prestamo_activo], "2023-11-01")
+    print(f"Retrasos en lote: {resumen}")
+    
     print("=== Prueba completada ===")
\ No newline at end of file
@@ -0,0 +1,62 @@
+# Protocolo entre servidor.py y cliente.py: un mensaje JSON compacto por línea (UTF-8).
+#   Solicitud: {"id": n, "op": método, "args": [...], "kwargs": {...}}
+#   Respuesta: {"id": n, "ok": true, "resultado": ...} o {"id": n, "ok": false, "error": "..."}
+# Los libros, usuarios y préstamos viajan como su to_dict() más "__tipo__" y del
+# otro lado se vuelven a armar como objetos.
+import json
+
+from libro import Libro
+from prestamo import Prestamo
+from usuario import Usuario
+
+# Puerto TCP predeterminado del servidor (solo escucha en localhost)
+PUERTO = 8765
+# Largo máximo de una línea (una respuesta con el catálogo completo puede ser grande)
+LIMITE_LINEA = 1 << 30
+
+_TIPOS = {'Libro': Libro, 'Usuario': Usuario, 'Prestamo': Prestamo}
+
+
+def _a_json(objeto):
+    # Libros, usuarios y préstamos (incluidas las vistas del almacén columnar)
+    for nombre, clase in _TIPOS.items():
+        if isinstance(objeto, clase):
+            datos = objeto.to_dict()
+            datos['__tipo__'] = nombre
+            return datos
+    raise TypeError(f"No se puede enviar un objeto {type(objeto).__name__}")
+
+
+def _desde_json(datos):
+    tipo = datos.pop('__tipo__', None)
+    return _TIPOS[tipo].from_dict(datos) if tipo is not None else datos
+
+
+_codificador = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), default=_a_json)
+_decodificador = json.JSONDecoder(object_hook=_desde_json)
+
+
+def codificar(mensaje):
+    """
+    Codifica un mensaje como una línea lista para enviar.
+
+    Args:
+        mensaje (dict): Solicitud o respuesta
+
+    Returns:
+        bytes: JSON compacto en UTF-8 terminado en salto de línea
+    """
+    return (_codificador.encode(mensaje) + '\n').encode('utf-8')
+
+
+def decodificar(linea):
+    """
+    Decodifica una línea recibida.
+
+    Args:
+        linea (bytes): Línea con un mensaje JSON
+
+    Returns:
+        dict: Solicitud o respuesta, con los libros, usuarios y préstamos como objetos
+    """
+    return _decodificador.decode(linea.decode('utf-8'))
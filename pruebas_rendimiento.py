@@ -0,0 +1,929 @@
+# Pruebas de rendimiento de las estructuras de datos del sistema de biblioteca.
+# Cada función imprime sus mediciones; se pueden ejecutar todas con:
+#     python pruebas_rendimiento.py
+import asyncio
+import gc
+import json
+import os
+import tempfile
+import random
+import subprocess
+import sys
+import time
+import threading
+import tracemalloc
+
+from almacen_columnar import AlmacenColumnarLibros
+from formato_binario import InstantaneaBinaria, escribir_instantanea_binaria
+from estructuras import AlmacenRegistros, ArbolAVLLibros, ColaVencimientos, IndiceAños, NodoAVL
+from libro import Libro
+from usuario import Usuario
+from main import SistemaBiblioteca
+from sistema_sqlite import SistemaBibliotecaSQLite
+from protocolo import codificar, decodificar
+from persistencia import escribir_json_streaming, leer_json_streaming, sin_recolector
+from datetime import datetime, timedelta
+from prestamo import Prestamo, calcular_retrasos
+
+
+def generar_libros(cantidad, semilla=42):
+    """
+    Genera libros sintéticos para las pruebas de rendimiento.
+
+    Args:
+        cantidad (int): Número de libros a generar
+        semilla (int): Semilla del generador aleatorio (resultados reproducibles)
+
+    Returns:
+        list: Lista de objetos Libro con títulos y autores repetidos
+    """
+    aleatorio = random.Random(semilla)
+    palabras = ["amor", "guerra", "noche", "mar", "ciudad", "sombra", "tiempo", "fuego",
+                "silencio", "camino", "jardín", "memoria", "viento", "río", "luz", "historia"]
+    autores = [f"Autor {i}" for i in range(max(1, cantidad // 20))]
+    generos = ["Ficción", "Fantasía", "Romance", "Ciencia Ficción", "Historia", "Poesía"]
+    libros = []
+    for i in range(cantidad):
+        titulo = " ".join(aleatorio.choice(palabras) for _ in range(3))
+        libros.append(Libro(f"978-{i:010d}", titulo.capitalize(), aleatorio.choice(autores),
+                            aleatorio.randint(1800, 2030), aleatorio.choice(generos)))
+    aleatorio.shuffle(libros)
+    return libros
+
+
+def _cronometrar(funcion, *args):
+    # Ejecuta la función y retorna (resultado, segundos transcurridos)
+    inicio = time.perf_counter()
+    resultado = funcion(*args)
+    return resultado, time.perf_counter() - inicio
+
+
+def prueba_construccion_masiva(tamanios=(10**5, 10**6)):
+    """
+    Compara la construcción de los índices AVL insertando libro por libro
+    contra la construcción en bloque (ordenar una vez + árbol balanceado en O(N)).
+    """
+    print("=== Construcción de índices AVL: insertar vs construir ===")
+    for cantidad in tamanios:
+        libros = generar_libros(cantidad)
+        for tipo_clave in ('isbn', 'titulo', 'autor'):
+            def insertar_todos():
+                arbol = ArbolAVLLibros(tipo_clave)
+                for libro in libros:
+                    arbol.insertar(libro)
+                return arbol
+
+            def construir_todos():
+                arbol = ArbolAVLLibros(tipo_clave)
+                arbol.construir(libros)
+                return arbol
+
+            arbol_insertado, t_insertar = _cronometrar(insertar_todos)
+            arbol_construido, t_construir = _cronometrar(construir_todos)
+            print(f"N={cantidad:>9} clave={tipo_clave:<6} insertar: {t_insertar:8.3f} s "
+                  f"(altura {arbol_insertado.raiz.altura})  construir: {t_construir:8.3f} s "
+                  f"(altura {arbol_construido.raiz.altura})  x{t_insertar / t_construir:.1f}")
+
+
+class _ArbolAVLRecursivo(ArbolAVLLibros):
+    # Búsquedas recursivas originales de ArbolAVLLibros (referencia para comparar)
+    def buscar(self, clave):
+        return self._buscar(self.raiz, clave.lower() if isinstance(clave, str) else clave)
+
+    def _buscar(self, nodo, clave):
+        if not nodo:
+            return None
+        if clave == nodo.clave:
+            return nodo.isbn
+        elif clave < nodo.clave:
+            return self._buscar(nodo.izquierda, clave)
+        return self._buscar(nodo.derecha, clave)
+
+    def buscar_prefijo(self, prefijo):
+        resultados = []
+        self._buscar_prefijo(self.raiz, prefijo.lower(), resultados)
+        return resultados
+
+    def _buscar_prefijo(self, nodo, prefijo, resultados):
+        if not nodo:
+            return
+        if nodo.clave.startswith(prefijo):
+            resultados.append(nodo.isbn)
+        if prefijo <= nodo.clave:
+            self._buscar_prefijo(nodo.izquierda, prefijo, resultados)
+        if prefijo >= nodo.clave[:len(prefijo)]:
+            self._buscar_prefijo(nodo.derecha, prefijo, resultados)
+
+
+def prueba_busquedas_iterativas(cantidad=10**5, consultas=10**5):
+    """
+    Mide la latencia por búsqueda de las versiones iterativas de ArbolAVLLibros
+    frente a las recursivas originales sobre el mismo árbol.
+    """
+    print("=== Búsquedas AVL: recursivas vs iterativas ===")
+    libros = generar_libros(cantidad)
+    arboles = {}
+    for tipo_clave in ('isbn', 'titulo'):
+        iterativo = ArbolAVLLibros(tipo_clave)
+        iterativo.construir(libros)
+        recursivo = _ArbolAVLRecursivo(tipo_clave)
+        recursivo.raiz = iterativo.raiz  # Ambos recorren exactamente el mismo árbol
+        arboles[tipo_clave] = (recursivo, iterativo)
+
+    aleatorio = random.Random(7)
+    claves = [aleatorio.choice(libros).isbn for _ in range(consultas)]
+    prefijos = [aleatorio.choice(libros).titulo.lower()[:12] for _ in range(consultas // 10)]
+
+    def consultar(arbol, metodo, valores):
+        funcion = getattr(arbol, metodo)
+        for valor in valores:
+            funcion(valor)
+
+    for nombre, tipo_clave, valores in (("buscar", 'isbn', claves),
+                                        ("buscar_prefijo", 'titulo', prefijos)):
+        recursivo, iterativo = arboles[tipo_clave]
+        _, t_recursiva = _cronometrar(consultar, recursivo, nombre, valores)
+        _, t_iterativa = _cronometrar(consultar, iterativo, nombre, valores)
+        total = len(valores)
+        print(f"{nombre:<15} recursiva: {t_recursiva / total * 1e6:7.2f} µs/consulta  "
+              f"iterativa: {t_iterativa / total * 1e6:7.2f} µs/consulta  "
+              f"x{t_recursiva / t_iterativa:.2f}")
+
+
+def _sin_slots(clase):
+    # Copia de la clase con el mismo constructor pero con __dict__ por instancia
+    # (la disposición de memoria que tenían los modelos antes de usar __slots__)
+    return type(clase.__name__ + "ConDict", (), {'__init__': clase.__init__})
+
+
+def _bytes_por_registro(cantidad, crear):
+    # Memoria asignada por tracemalloc al crear `cantidad` registros, dividida por registro
+    gc.collect()
+    tracemalloc.start()
+    registros = crear(cantidad)
+    usados, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del registros
+    gc.collect()
+    return usados / cantidad
+
+
+def prueba_memoria_modelos(cantidad=10**6):
+    """
+    Compara los bytes por libro (objeto Libro + sus 3 nodos AVL) y por préstamo
+    con __slots__ frente a la disposición anterior con __dict__ por instancia.
+    """
+    print("=== Memoria por registro: __dict__ vs __slots__ ===")
+    modelos = {
+        "con __dict__": (_sin_slots(Libro), _sin_slots(NodoAVL), _sin_slots(Prestamo)),
+        "con __slots__": (Libro, NodoAVL, Prestamo),
+    }
+    for nombre, (clase_libro, clase_nodo, clase_prestamo) in modelos.items():
+        def crear_libros(n):
+            registros = []
+            for i in range(n):
+                libro = clase_libro(f"978-{i:010d}", f"Título {i}", f"Autor {i % 5000}", 1900 + i % 120, "Ficción")
+                # Cada libro tiene un nodo (con su ISBN) en cada uno de los 3 índices AVL
+                registros.append((libro, clase_nodo(libro.isbn, libro.isbn), clase_nodo(libro.titulo, libro.isbn),
+                                  clase_nodo(libro.autor, libro.isbn)))
+            return registros
+
+        def crear_prestamos(n):
+            return [clase_prestamo(f"P{i:07d}", f"978-{i % 50000:010d}", f"U{i % 20000:05d}", "2024-01-15")
+                    for i in range(n)]
+
+        por_libro = _bytes_por_registro(cantidad, crear_libros)
+        por_prestamo = _bytes_por_registro(cantidad, crear_prestamos)
+        print(f"{nombre:<14} N={cantidad}: {por_libro:7.1f} bytes/libro  {por_prestamo:7.1f} bytes/préstamo")
+
+
+def prueba_almacen_columnar(cantidad=10**6):
+    """
+    Compara la memoria por libro y los recorridos por disponibilidad entre
+    AlmacenRegistros (un objeto Libro por registro) y AlmacenColumnarLibros,
+    primero los almacenes solos y luego dentro de SistemaBiblioteca, antes y
+    después de construir los índices de libros.
+    """
+    print("=== Almacén de libros: registros vs columnar ===")
+    generos = ["Ficción", "Fantasía", "Romance", "Ciencia Ficción", "Historia", "Poesía"]
+
+    def llenar(almacen):
+        # Cada libro recibe sus propias cadenas, como al cargarlos desde JSON
+        def crear(n):
+            for i in range(n):
+                almacen.agregar(Libro(f"978-{i:010d}", f"Título {i}", f"Autor {i % 5000}",
+                                      1800 + i % 230, "".join(generos[i % len(generos)])))
+            return almacen
+        return crear
+
+    for nombre, almacen in (("registros", AlmacenRegistros('isbn')), ("columnar", AlmacenColumnarLibros())):
+        por_libro = _bytes_por_registro(cantidad, llenar(almacen))
+        for i in range(0, cantidad, 3):
+            almacen.buscar(f"978-{i:010d}").disponible = False
+        if isinstance(almacen, AlmacenColumnarLibros):
+            contar, listar = almacen.contar_disponibles, almacen.listar_disponibles
+        else:
+            contar = lambda: sum(1 for libro in almacen if libro.disponible)
+            listar = lambda: [libro for libro in almacen if libro.disponible]
+        total, t_contar = _cronometrar(contar)
+        _, t_listar = _cronometrar(listar)
+        _, t_relistar = _cronometrar(listar)  # Segunda vez
+        print(f"{nombre:<10} N={cantidad}: {por_libro:7.1f} bytes/libro  contar disponibles ({total}): "
+              f"{t_contar:6.3f} s  listar disponibles: {t_listar:6.3f} s / {t_relistar:6.3f} s")
+
+    # Dentro del sistema: los índices guardan ISBN, así que construirlos cuesta lo mismo con
+    # los dos almacenes (el columnar no retiene una vista por libro)
+    indices = ('arbol_libros_isbn', 'arbol_libros_titulo', 'arbol_libros_autor', 'indice_años', 'indice_texto')
+    for nombre, almacen in (("registros", None), ("columnar", AlmacenColumnarLibros())):
+        gc.collect()
+        tracemalloc.start()
+        sistema = SistemaBiblioteca(almacen)
+        llenar(sistema.libros)(cantidad)
+        sin_indices = tracemalloc.get_traced_memory()[0] / cantidad
+        sistema.precalentar_indices(indices[:-1])
+        con_arboles = tracemalloc.get_traced_memory()[0] / cantidad
+        sistema.precalentar_indices(indices[-1:])
+        con_indices = tracemalloc.get_traced_memory()[0] / cantidad
+        tracemalloc.stop()
+
+        # Primer rango de años sin índices: el almacén columnar recorre su columna de años,
+        # el de registros construye el índice por año
+        sistema._reconstruir_indices()
+        rango, t_rango = _cronometrar(sistema.buscar_libros_por_rango_años, 1900, 1909)
+        construido = sistema._indice_construido('indice_años') is not None
+        sistema.precalentar_indices(('indice_años',))
+        t_rango_indice = min(_cronometrar(sistema.buscar_libros_por_rango_años, 1900, 1909)[1] for _ in range(5))
+        print(f"{nombre:<10} en el sistema: {sin_indices:7.1f} bytes/libro sin índices, {con_arboles:7.1f} con "
+              f"árboles e índice por año, {con_indices:7.1f} con todos  primer rango ({len(rango)}): "
+              f"{t_rango:6.3f} s ({'construye el índice' if construido else 'recorre la columna'})  "
+              f"con índice: {t_rango_indice * 1e3:6.2f} ms")
+        del sistema, rango
+
+
+def _dias_retraso_texto(prestamo):
+    # Cálculo original de Prestamo.dias_retraso: interpreta ambas fechas en cada llamada
+    if prestamo.activo or not prestamo.fecha_devolucion:
+        return 0
+    fecha_limite = datetime.strptime(prestamo.fecha_prestamo, "%Y-%m-%d") + timedelta(days=15)
+    fecha_devolucion = datetime.strptime(prestamo.fecha_devolucion, "%Y-%m-%d")
+    return (fecha_devolucion - fecha_limite).days if fecha_devolucion > fecha_limite else 0
+
+
+def prueba_retrasos(cantidad=365000):
+    """
+    Compara el cálculo de retrasos de un año de préstamos: fechas en texto
+    interpretadas en cada llamada, días precalculados y cálculo en lote.
+    """
+    print("=== Cálculo de retrasos: texto vs días vs lote ===")
+    aleatorio = random.Random(3)
+    inicio = datetime(2023, 1, 1)
+    prestamos = []
+    for i in range(cantidad):
+        fecha = inicio + timedelta(days=i * 365 // cantidad)
+        prestamo = Prestamo(f"P{i:07d}", f"978-{i % 50000:010d}", f"U{i % 20000:05d}",
+                            fecha.strftime("%Y-%m-%d"))
+        if aleatorio.random() < 0.9:
+            devolucion = fecha + timedelta(days=aleatorio.randint(1, 30))
+            prestamo.registrar_devolucion(devolucion.strftime("%Y-%m-%d"))
+        prestamos.append(prestamo)
+
+    texto, t_texto = _cronometrar(lambda: [_dias_retraso_texto(p) for p in prestamos])
+    dias, t_dias = _cronometrar(lambda: [p.dias_retraso() for p in prestamos])
+    lote, t_lote = _cronometrar(calcular_retrasos, prestamos)
+    assert texto == dias == lote['retrasos']
+    print(f"N={cantidad}: texto {t_texto:6.3f} s  días {t_dias:6.3f} s  lote {t_lote:6.3f} s  "
+          f"({lote['prestamos_con_retraso']} con retraso, total {lote['total_dias']} días)")
+
+
+def prueba_cola_vencimientos(cantidad=80000, consultas=100):
+    """
+    Compara el reporte diario de préstamos vencidos y por vencer recorriendo todos
+    los préstamos activos frente a la cola de vencimientos.
+    """
+    print("=== Reporte de vencimientos: recorrido completo vs cola de vencimientos ===")
+    aleatorio = random.Random(5)
+    hoy = datetime(2024, 6, 1)
+    prestamos = [Prestamo(f"P{i:07d}", f"978-{i:010d}", f"U{i % 20000:05d}",
+                          (hoy - timedelta(days=aleatorio.randint(0, 17))).strftime("%Y-%m-%d"))
+                 for i in range(cantidad)]
+    cola = ColaVencimientos()
+    cola.construir(prestamos)
+    dia = hoy.toordinal()
+
+    def recorrido():
+        for _ in range(consultas):
+            vencidos = sorted((p for p in prestamos if p.dia_limite < dia), key=lambda p: p.dia_limite)
+            por_vencer = sorted((p for p in prestamos if dia <= p.dia_limite <= dia + 2),
+                                key=lambda p: p.dia_limite)
+        return len(vencidos), len(por_vencer)
+
+    def cola_vencimientos():
+        for _ in range(consultas):
+            vencidos = cola.vencidos(dia)
+            por_vencer = cola.por_vencer(dia, dia + 2)
+        return len(vencidos), len(por_vencer)
+
+    (vencidos, por_vencer), t_recorrido = _cronometrar(recorrido)
+    _, t_cola = _cronometrar(cola_vencimientos)
+    print(f"N={cantidad} ({vencidos} vencidos, {por_vencer} por vencer en 2 días): "
+          f"recorrido {t_recorrido / consultas * 1e3:7.2f} ms/reporte  "
+          f"cola {t_cola / consultas * 1e3:7.2f} ms/reporte")
+
+
+def prueba_top_k_por_año(cantidad=10**6, k=10):
+    """
+    Compara obtener los k libros más antiguos/recientes ordenando todo el catálogo
+    frente a recorrer el índice por año ya ordenado.
+    """
+    print("=== Top-k por año: ordenar catálogo vs índice por año ===")
+    libros = generar_libros(cantidad)
+    indice = IndiceAños()
+    indice.construir(libros)
+    for descendente in (False, True):
+        # Dentro de un mismo año, por ISBN (como el índice)
+        signo = -1 if descendente else 1
+        ordenados, t_ordenar = _cronometrar(
+            lambda: sorted(libros, key=lambda x: (signo * x.año_publicacion, x.isbn))[:k])
+        desde_indice, t_indice = _cronometrar(indice.primeros, k, descendente)
+        assert [libro.isbn for libro in ordenados] == desde_indice
+        print(f"N={cantidad} {'recientes' if descendente else 'antiguos ':<9}: ordenar {t_ordenar * 1e3:8.2f} ms  "
+              f"índice {t_indice * 1e3:6.3f} ms")
+
+
+def _pico_memoria(funcion, *args):
+    # Memoria máxima (bytes) asignada mientras se ejecuta la función
+    gc.collect()
+    tracemalloc.start()
+    funcion(*args)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return pico
+
+
+def prueba_persistencia(cantidad=10**5):
+    """
+    Compara guardar/cargar con json.dump/json.load del documento completo frente
+    a la escritura y lectura por flujo (legible y compacta): tiempo y pico de memoria.
+    Ambas cargas arman los objetos Libro y Prestamo; la diferencia de memoria es
+    el documento intermedio de json.load.
+    """
+    print("=== Persistencia JSON: documento completo vs por flujo ===")
+    sistema = SistemaBiblioteca()
+    for libro in generar_libros(cantidad):
+        sistema.libros.agregar(libro)
+    for i in range(cantidad):
+        sistema.prestamos.append(Prestamo(f"P{i:07d}", f"978-{i:010d}", "U001", "2024-01-15"))
+    sistema._construir_indices()
+    archivo = os.path.join(tempfile.mkdtemp(), "biblioteca.json")
+
+    def guardar_completo():
+        datos = {'libros': [libro.to_dict() for libro in sistema.libros.listar()],
+                 'usuarios': [usuario.to_dict() for usuario in sistema.usuarios.listar()],
+                 'prestamos': [prestamo.to_dict() for prestamo in sistema.prestamos],
+                 'contador_prestamos': sistema.contador_prestamos}
+        with open(archivo, 'w', encoding='utf-8') as f:
+            json.dump(datos, f, indent=2, ensure_ascii=False)
+
+    def cargar_completo():
+        with open(archivo, 'r', encoding='utf-8') as f:
+            datos = json.load(f)
+        libros = [Libro.from_dict(d) for d in datos['libros']]
+        prestamos = [Prestamo.from_dict(d) for d in datos['prestamos']]
+        return libros, prestamos
+
+    def cargar_por_flujo():
+        libros, prestamos = [], []
+        with open(archivo, 'r', encoding='utf-8') as f:
+            for seccion, valor in leer_json_streaming(f):
+                if seccion == 'libros':
+                    libros.append(Libro.from_dict(valor))
+                elif seccion == 'prestamos':
+                    prestamos.append(Prestamo.from_dict(valor))
+        return libros, prestamos
+
+    for nombre, guardar, cargar in (
+            ("json.dump/load", guardar_completo, cargar_completo),
+            ("flujo legible", lambda: sistema.guardar_datos(archivo), cargar_por_flujo),
+            ("flujo compacto", lambda: sistema.guardar_datos(archivo, compacto=True), cargar_por_flujo)):
+        _, t_guardar = _cronometrar(guardar)
+        _, t_cargar = _cronometrar(cargar)
+        pico_guardar = _pico_memoria(guardar)
+        pico_cargar = _pico_memoria(cargar)
+        print(f"{nombre:<15} N={cantidad}: guardar {t_guardar:6.2f} s ({pico_guardar / 2**20:7.1f} MiB pico)  "
+              f"cargar {t_cargar:6.2f} s ({pico_cargar / 2**20:7.1f} MiB pico)  "
+              f"archivo {os.path.getsize(archivo) / 2**20:6.1f} MiB")
+    _, t_cargar_datos = _cronometrar(sistema.cargar_datos, archivo)
+    print(f"cargar_datos (flujo compacto, incluye índices): {t_cargar_datos:6.2f} s")
+    os.remove(archivo)
+
+
+def prueba_diario(operaciones=2000):
+    """
+    Mide el costo por operación de registrar cada modificación en el diario
+    con las distintas políticas de sincronización (fsync).
+    """
+    print("=== Diario de operaciones: costo por operación ===")
+    for politica in (None, 'nunca', 'intervalo', 'siempre'):
+        directorio = tempfile.mkdtemp()
+        sistema = SistemaBiblioteca()
+        if politica is not None:
+            sistema.abrir_diario(os.path.join(directorio, "biblioteca.json"), sincronizar=politica)
+
+        def agregar():
+            for i in range(operaciones):
+                sistema.agregar_libro(f"978-{i:010d}", f"Título {i}", "Autor", 2000, "Ficción")
+
+        _, t_agregar = _cronometrar(agregar)
+        sistema.cerrar_diario()
+        print(f"{politica or 'sin diario':<10}: {t_agregar / operaciones * 1e6:8.1f} µs/operación")
+
+
+def prueba_compactacion(cantidad=10**5, operaciones=1000):
+    """
+    Mide cuánto esperan las modificaciones mientras se compacta el diario: la
+    llamada a compactar_diario (lo que se hace con el cerrojo de escritura
+    tomado) y la operación más lenta mientras la instantánea se escribe.
+    """
+    print("=== Compactación del diario: espera de las modificaciones ===")
+    directorio = tempfile.mkdtemp()
+    sistema = SistemaBiblioteca()
+    for libro in generar_libros(cantidad):
+        sistema.libros.agregar(libro)
+    sistema.abrir_diario(os.path.join(directorio, "biblioteca.json"), sincronizar='nunca',
+                         umbral_compactacion=10**9)
+    for i in range(operaciones):
+        sistema.agregar_libro(f"999-{i:010d}", f"Título {i}", "Autor", 2000, "Ficción")
+
+    _, t_llamada = _cronometrar(sistema.compactar_diario)
+    inicio = time.perf_counter()
+    peor = hechas = 0
+    while sistema._compactacion.is_alive():
+        _, t_operacion = _cronometrar(sistema.agregar_libro, f"998-{hechas:010d}", "Título", "Autor", 2000, "Ficción")
+        peor = max(peor, t_operacion)
+        hechas += 1
+    t_fondo = time.perf_counter() - inicio
+    sistema.cerrar_diario()
+    print(f"N={cantidad}: compactar_diario retiene el cerrojo {t_llamada * 1e3:7.1f} ms; la instantánea tarda "
+          f"{t_fondo:6.2f} s y la operación más lenta espera {peor * 1e3:7.1f} ms ({hechas} operaciones hechas)")
+
+
+def _generar_datos(cantidad_libros, cantidad_prestamos, cantidad_usuarios=20000):
+    # Libros, usuarios y un historial de préstamos sintéticos (uno de cada diez activo)
+    libros = generar_libros(cantidad_libros)
+    usuarios = [Usuario(f"U{i:05d}", f"Usuario {i}", f"u{i}@email.com") for i in range(cantidad_usuarios)]
+    dia = datetime(2020, 1, 1).toordinal()
+    prestamos = []
+    for i in range(cantidad_prestamos):
+        prestamo = Prestamo.desde_dias(f"P{i:07d}", libros[i % cantidad_libros].isbn,
+                                       usuarios[i % cantidad_usuarios].id_usuario, dia + i % 1500, None, True)
+        if i % 10:
+            prestamo.activo = False
+            prestamo.dia_devolucion = prestamo.dia_prestamo + i % 30
+        prestamos.append(prestamo)
+    return libros, usuarios, prestamos
+
+
+def prueba_instantanea_binaria(cantidad_libros=10**6, cantidad_prestamos=5 * 10**6, accesos=1000):
+    """
+    Compara el arranque en frío leyendo el JSON compacto frente a la instantánea
+    binaria: decodificación completa y apertura perezosa (mmap) con accesos al azar.
+    También mide SistemaBiblioteca.cargar_datos sobre la instantánea, que la deja
+    abierta, y las primeras operaciones, que arman lo que necesitan.
+    """
+    print("=== Arranque en frío: JSON vs instantánea binaria ===")
+    libros, usuarios, prestamos = _generar_datos(cantidad_libros, cantidad_prestamos)
+    isbn_buscado = libros[len(libros) // 2].isbn
+    id_usuario = usuarios[0].id_usuario
+
+    directorio = tempfile.mkdtemp()
+    ruta_json = os.path.join(directorio, "biblioteca.json")
+    ruta_binaria = os.path.join(directorio, "biblioteca.bin")
+    secciones = [('libros', (l.to_dict() for l in libros)), ('usuarios', (u.to_dict() for u in usuarios)),
+                 ('prestamos', (p.to_dict() for p in prestamos)), ('contador_prestamos', cantidad_prestamos + 1)]
+    with open(ruta_json, 'w', encoding='utf-8') as f:
+        _, t_json_guardar = _cronometrar(escribir_json_streaming, f, secciones, True)
+    with open(ruta_binaria, 'wb') as f:
+        _, t_bin_guardar = _cronometrar(escribir_instantanea_binaria, f, libros, usuarios, prestamos,
+                                        cantidad_prestamos + 1)
+    del libros, usuarios, prestamos
+    gc.collect()
+
+    def cargar_json():
+        registros = {'libros': [], 'usuarios': [], 'prestamos': []}
+        clases = {'libros': Libro, 'usuarios': Usuario, 'prestamos': Prestamo}
+        with open(ruta_json, 'r', encoding='utf-8') as f:
+            for seccion, valor in leer_json_streaming(f):
+                if seccion in registros:
+                    registros[seccion].append(clases[seccion].from_dict(valor))
+        return registros
+
+    def cargar_binario():
+        with InstantaneaBinaria(ruta_binaria) as instantanea:
+            return (list(instantanea.iterar_libros()), list(instantanea.iterar_usuarios()),
+                    list(instantanea.iterar_prestamos()))
+
+    def abrir_binario():
+        aleatorio = random.Random(1)
+        with InstantaneaBinaria(ruta_binaria) as instantanea:
+            for _ in range(accesos):
+                instantanea.libro(aleatorio.randrange(instantanea.cantidad_libros))
+                instantanea.prestamo(aleatorio.randrange(instantanea.cantidad_prestamos))
+
+    with sin_recolector():  # Igual que en SistemaBiblioteca.cargar_datos
+        _, t_json = _cronometrar(cargar_json)
+    gc.collect()
+    with sin_recolector():
+        _, t_binario = _cronometrar(cargar_binario)
+    gc.collect()
+    _, t_perezoso = _cronometrar(abrir_binario)
+
+    sistema = SistemaBiblioteca()
+    _, t_sistema = _cronometrar(sistema.cargar_datos, ruta_binaria)
+    _, t_isbn = _cronometrar(sistema.buscar_libro_por_isbn, isbn_buscado)
+    _, t_usuario = _cronometrar(sistema.obtener_prestamos_activos_por_usuario, id_usuario)
+    _, t_id = _cronometrar(sistema.buscar_prestamo_por_id, "P0000001")
+    del sistema
+    gc.collect()
+    print(f"{cantidad_libros} libros, {cantidad_prestamos} préstamos: "
+          f"JSON {os.path.getsize(ruta_json) / 2**20:.0f} MiB, binario {os.path.getsize(ruta_binaria) / 2**20:.0f} MiB")
+    print(f"guardar: JSON {t_json_guardar:6.2f} s  binario {t_bin_guardar:6.2f} s")
+    print(f"cargar todo: JSON {t_json:6.2f} s  binario {t_binario:6.2f} s  x{t_json / t_binario:.1f}")
+    print(f"binario perezoso (abrir + {accesos} libros y préstamos al azar): {t_perezoso * 1e3:7.2f} ms")
+    print(f"sistema: cargar_datos {t_sistema * 1e3:7.2f} ms, primera búsqueda por ISBN {t_isbn:5.2f} s, "
+          f"primeros activos de un usuario {t_usuario:5.2f} s, primer préstamo por ID {t_id:5.2f} s")
+    os.remove(ruta_json)
+    os.remove(ruta_binaria)
+
+
+def prueba_sqlite(cantidad=10**5, consultas=1000, operaciones=500):
+    """
+    Compara el sistema en memoria con el sistema sobre SQLite: arranque (carga
+    completa vs abrir la base), consultas por índice y costo de cada operación
+    de escritura confirmada en disco.
+    """
+    print("=== Sistema en memoria vs SQLite ===")
+    directorio = tempfile.mkdtemp()
+    ruta_json = os.path.join(directorio, "biblioteca.json")
+    ruta_base = os.path.join(directorio, "biblioteca.db")
+    libros = generar_libros(cantidad)
+    with open(ruta_json, 'w', encoding='utf-8') as f:
+        escribir_json_streaming(f, [('libros', (l.to_dict() for l in libros)), ('usuarios', []),
+                                    ('prestamos', []), ('contador_prestamos', 1)], compacto=True)
+    with SistemaBibliotecaSQLite(ruta_base) as base:
+        _, t_importar = _cronometrar(base.cargar_datos, ruta_json)
+        base.agregar_usuario("U001", "Juan Pérez", "juan@email.com")
+
+    memoria = SistemaBiblioteca()
+    _, t_memoria = _cronometrar(memoria.cargar_datos, ruta_json)
+    base, t_base = _cronometrar(SistemaBibliotecaSQLite, ruta_base)
+    print(f"N={cantidad}: arranque memoria {t_memoria:6.2f} s  SQLite {t_base * 1e3:7.2f} ms "
+          f"(importación única {t_importar:.2f} s)")
+
+    aleatorio = random.Random(7)
+    isbns = [aleatorio.choice(libros).isbn for _ in range(consultas)]
+    prefijos = [aleatorio.choice(libros).titulo[:4] for _ in range(consultas)]
+    for nombre, sistema in (("memoria", memoria), ("SQLite", base)):
+        _, t_isbn = _cronometrar(lambda: [sistema.buscar_libro_por_isbn(isbn) for isbn in isbns])
+        _, t_titulo = _cronometrar(lambda: [sistema.buscar_libros_por_titulo(p, limite=20) for p in prefijos])
+        _, t_años = _cronometrar(lambda: [sistema.generar_estadisticas_por_año(1900, 1950) for _ in range(consultas)])
+        print(f"{nombre:<8}: ISBN {t_isbn / consultas * 1e6:7.1f} µs  título (20) {t_titulo / consultas * 1e6:7.1f} µs  "
+              f"estadísticas {t_años / consultas * 1e6:7.1f} µs")
+
+    for sincronizacion in ('NORMAL', 'FULL'):
+        with SistemaBibliotecaSQLite(ruta_base, sincronizacion) as sistema:
+            def prestar_y_devolver():
+                for isbn in isbns[:operaciones]:
+                    _, mensaje = sistema.registrar_prestamo(isbn, "U001", "2024-01-10")
+                    if mensaje.startswith("Préstamo"):
+                        sistema.registrar_devolucion(mensaje.rsplit(' ', 1)[1], "2024-01-20")
+            _, t_escritura = _cronometrar(prestar_y_devolver)
+        print(f"SQLite synchronous={sincronizacion:<6}: {t_escritura / (2 * operaciones) * 1e6:8.1f} µs/operación")
+    base.cerrar()
+    os.remove(ruta_json)
+
+
+def prueba_autoguardado(cantidad=10**5):
+    """
+    Mide cuánto queda bloqueado el hilo que opera (el de la interfaz) al guardar:
+    guardar_datos escribe todo en ese hilo; guardar_cambios solo copia el estado
+    con el cerrojo tomado y escribe en otro hilo.
+    """
+    print("=== Guardado: en el hilo de la interfaz vs autoguardado en segundo plano ===")
+    ruta = os.path.join(tempfile.mkdtemp(), "biblioteca.json")
+    sistema = SistemaBiblioteca()
+    for libro in generar_libros(cantidad):
+        sistema.libros.agregar(libro)
+    sistema._construir_indices()
+
+    _, t_bloqueante = _cronometrar(sistema.guardar_datos, ruta, True)
+
+    hilo = threading.Thread(target=sistema.guardar_cambios, args=(ruta, True, True))
+    inicio = time.perf_counter()
+    hilo.start()
+    peor = operaciones = 0
+    while hilo.is_alive():
+        _, t_operacion = _cronometrar(sistema.agregar_libro, f"999-{operaciones:010d}", "Título", "Autor", 2000, "Ficción")
+        peor = max(peor, t_operacion)
+        operaciones += 1
+    t_fondo = time.perf_counter() - inicio
+    print(f"N={cantidad}: guardar_datos bloquea {t_bloqueante:6.2f} s; en segundo plano el guardado tarda "
+          f"{t_fondo:6.2f} s y la operación más lenta espera {peor * 1e3:7.1f} ms ({operaciones} operaciones hechas)")
+
+
+def prueba_indices_perezosos(cantidad_libros=10**6, cantidad_prestamos=2 * 10**6):
+    """
+    Tiempo hasta la primera interacción (cargar el archivo de datos y hacer un
+    préstamo por ISBN) construyendo todos los índices al cargar frente a
+    construirlos al primer uso.
+    """
+    print("=== Arranque: índices construidos al cargar vs al primer uso ===")
+    libros, usuarios, prestamos = _generar_datos(cantidad_libros, cantidad_prestamos)
+    isbn = next(libro.isbn for libro in libros if libro.disponible)
+    ruta = os.path.join(tempfile.mkdtemp(), "biblioteca.bin")
+    with open(ruta, 'wb') as f:
+        escribir_instantanea_binaria(f, libros, usuarios, prestamos, cantidad_prestamos + 1)
+    del libros, usuarios, prestamos
+    gc.collect()
+
+    for perezoso in (False, True):
+        sistema = SistemaBiblioteca()
+
+        def primera_interaccion():
+            sistema.cargar_datos(ruta)
+            if not perezoso:
+                sistema.precalentar_indices()  # Lo que hacía cargar_datos antes
+            return sistema.registrar_prestamo(isbn, "U00001", "2024-01-10")
+
+        (exito, _), t_inicio = _cronometrar(primera_interaccion)
+        _, t_titulo = _cronometrar(sistema.buscar_libros_por_titulo, "amor", 20)
+        _, t_resto = _cronometrar(sistema.precalentar_indices)
+        print(f"{'al primer uso' if perezoso else 'al cargar':<14}: primera interacción {t_inicio:6.2f} s "
+              f"({'ok' if exito else 'error'})  primera búsqueda por título {t_titulo:6.2f} s  "
+              f"resto de los índices {t_resto:6.2f} s")
+        del sistema
+        gc.collect()
+    os.remove(ruta)
+
+
+def prueba_ordenes_guardados(cantidad=10**6):
+    """
+    Construcción de los árboles de libros tras cargar el archivo de datos: ordenando
+    desde cero frente a usar el orden guardado en archivo + '.indices'.
+    """
+    print("=== Árboles de libros: ordenar al cargar vs orden guardado ===")
+    sistema = SistemaBiblioteca()
+    sistema.libros = sistema.libros.copia_vacia()
+    for libro in generar_libros(cantidad):
+        sistema.libros.agregar(libro)
+    ruta = os.path.join(tempfile.mkdtemp(), "biblioteca.bin")
+    # Solo se guardan los órdenes de árboles ya construidos (recorrerlos no requiere ordenar)
+    sistema.precalentar_indices(SistemaBiblioteca.INDICES_GUARDADOS)
+    _, t_guardar = _cronometrar(sistema.guardar_datos, ruta, False, True, False)
+    _, t_con_indices = _cronometrar(sistema.guardar_datos, ruta, False, True, True)
+    print(f"guardar datos {t_guardar:6.2f} s  con órdenes de los árboles {t_con_indices:6.2f} s "
+          f"({os.path.getsize(ruta + '.indices') / 2**20:.1f} MiB)")
+    del sistema
+    gc.collect()
+
+    for con_orden in (False, True):
+        if not con_orden:
+            os.rename(ruta + '.indices', ruta + '.indices.aparte')
+        else:
+            os.rename(ruta + '.indices.aparte', ruta + '.indices')
+        sistema = SistemaBiblioteca()
+        _, t_carga = _cronometrar(sistema.cargar_datos, ruta)
+        _, t_arboles = _cronometrar(sistema.precalentar_indices, SistemaBiblioteca.INDICES_GUARDADOS)
+        print(f"{'orden guardado' if con_orden else 'ordenando':<14}: carga {t_carga:6.2f} s  "
+              f"árboles ISBN/título/autor {t_arboles:6.2f} s")
+        del sistema
+        gc.collect()
+    os.remove(ruta)
+    os.remove(ruta + '.indices')
+
+
+def _mostrador(sistema, isbns, usuarios, operaciones, semilla, resultados, errores):
+    # Un mostrador de atención: 80% consultas, 10% préstamos y 10% devoluciones al azar
+    aleatorio = random.Random(semilla)
+    prestamos = devoluciones = 0
+    try:
+        for _ in range(operaciones):
+            accion = aleatorio.random()
+            usuario = aleatorio.choice(usuarios)
+            if accion < 0.4:
+                sistema.buscar_libro_por_isbn(aleatorio.choice(isbns))
+            elif accion < 0.6:
+                sistema.buscar_libros_por_titulo(aleatorio.choice("acfhjlmnrst"), 10)
+            elif accion < 0.8:
+                sistema.obtener_prestamos_activos_por_usuario(usuario)
+            elif accion < 0.9:
+                exito, _ = sistema.registrar_prestamo(aleatorio.choice(isbns), usuario, "2024-01-10")
+                prestamos += exito
+            else:
+                # Varios mostradores pueden intentar devolver el mismo préstamo: uno solo gana
+                activos = sistema.obtener_prestamos_activos_por_usuario(usuario)
+                if activos:
+                    exito, _ = sistema.registrar_devolucion(aleatorio.choice(activos).id_prestamo, "2024-01-20")
+                    devoluciones += exito
+    except Exception as e:
+        errores.append(repr(e))
+    resultados.append((prestamos, devoluciones))
+
+
+def _verificar_invariantes(sistema, prestamos_iniciales, resultados):
+    # Lista de invariantes que no se cumplen (vacía si todo está bien)
+    fallas = []
+    prestamos = sistema.listar_todos_los_prestamos()
+    nuevos = len(prestamos) - prestamos_iniciales
+    if nuevos != sum(p for p, _ in resultados):
+        fallas.append(f"{nuevos} préstamos en el historial y {sum(p for p, _ in resultados)} confirmados")
+    if len({prestamo.id_prestamo for prestamo in prestamos}) != len(prestamos):
+        fallas.append("IDs de préstamo repetidos")
+    if sistema.contador_prestamos != len(prestamos) + 1:
+        fallas.append("contador de préstamos desfasado")
+    devueltos = sum(not prestamo.activo for prestamo in prestamos)
+    if devueltos != sum(d for _, d in resultados):
+        fallas.append(f"{devueltos} préstamos devueltos y {sum(d for _, d in resultados)} devoluciones confirmadas")
+    activos_por_libro = {}
+    for prestamo in prestamos:
+        if prestamo.activo:
+            activos_por_libro[prestamo.isbn_libro] = activos_por_libro.get(prestamo.isbn_libro, 0) + 1
+    if any(cantidad > 1 for cantidad in activos_por_libro.values()):
+        fallas.append("libros prestados dos veces")
+    if any(libro.disponible == (libro.isbn in activos_por_libro) for libro in sistema.listar_libros()):
+        fallas.append("disponibilidad que no coincide con los préstamos activos")
+    return fallas
+
+
+def prueba_concurrencia(cantidad_libros=500, hilos=(1, 2, 4, 8), operaciones=100000):
+    """
+    Varios mostradores (hilos) atendiendo a la vez sobre el mismo sistema. Mide las
+    operaciones por segundo y verifica al final que ningún libro quedó prestado dos
+    veces, que no se repitieron IDs de préstamo y que cada préstamo y devolución
+    confirmados quedaron registrados.
+    """
+    print("=== Concurrencia: mostradores atendiendo en paralelo ===")
+    libros = generar_libros(cantidad_libros)
+    isbns = [libro.isbn for libro in libros]
+    usuarios = [f"M{i:04d}" for i in range(200)]
+    intervalo = sys.getswitchinterval()
+    sys.setswitchinterval(1e-5)  # Cambios de hilo muy frecuentes: más intercalaciones posibles
+    try:
+        for cantidad_hilos in hilos:
+            sistema = SistemaBiblioteca()
+            for libro in libros:
+                sistema.agregar_libro(libro.isbn, libro.titulo, libro.autor, libro.año_publicacion, libro.genero)
+            for id_usuario in usuarios:
+                sistema.agregar_usuario(id_usuario, f"Usuario {id_usuario}", f"{id_usuario}@email.com")
+            sistema.precalentar_indices()
+            prestamos_iniciales = len(sistema.prestamos)
+
+            resultados, errores = [], []
+            mostradores = [threading.Thread(target=_mostrador, args=(
+                sistema, isbns, usuarios, operaciones // cantidad_hilos, semilla, resultados, errores))
+                for semilla in range(cantidad_hilos)]
+            inicio = time.perf_counter()
+            for mostrador in mostradores:
+                mostrador.start()
+            for mostrador in mostradores:
+                mostrador.join()
+            transcurrido = time.perf_counter() - inicio
+
+            fallas = errores + _verificar_invariantes(sistema, prestamos_iniciales, resultados)
+            print(f"{cantidad_hilos} hilo(s): {operaciones / transcurrido:9.0f} op/s  "
+                  f"préstamos {sum(p for p, _ in resultados):5d}  devoluciones {sum(d for _, d in resultados):5d}  "
+                  f"invariantes {'ok' if not fallas else '; '.join(fallas)}")
+    finally:
+        sys.setswitchinterval(intervalo)
+
+
+def prueba_catalogo_particionado(cantidad=10**6, particiones=(1, 2, 4), consultas=400, hilos=4):
+    """
+    Rendimiento de búsquedas costosas (páginas profundas por título y rangos de un
+    año) con varios hilos consultando a la vez: índices en el proceso del sistema
+    frente al catálogo repartido en procesos. La mejora depende de los núcleos
+    disponibles: con uno solo, repartir agrega la comunicación entre procesos.
+    """
+    print(f"=== Catálogo particionado ({os.cpu_count()} núcleo(s), {hilos} hilos consultando) ===")
+    sistema = SistemaBiblioteca()
+    sistema.libros = sistema.libros.copia_vacia()
+    for libro in generar_libros(cantidad):
+        sistema.libros.agregar(libro)
+    sistema.precalentar_indices(('arbol_libros_titulo', 'indice_años'))
+    aleatorio = random.Random(7)
+    palabras = ["amor", "guerra", "noche", "mar", "ciudad", "sombra", "tiempo", "fuego"]
+    trabajo = [(aleatorio.choice(palabras), aleatorio.randint(1800, 2030)) for _ in range(consultas)]
+
+    def consultar(tanda):
+        for palabra, año in tanda:
+            sistema.buscar_libros_por_titulo(palabra, 20, desplazamiento=2000)
+            sistema.buscar_libros_por_rango_años(año, año)
+
+    def medir():
+        tandas = [trabajo[i::hilos] for i in range(hilos)]
+        consultores = [threading.Thread(target=consultar, args=(tanda,)) for tanda in tandas]
+        inicio = time.perf_counter()
+        for consultor in consultores:
+            consultor.start()
+        for consultor in consultores:
+            consultor.join()
+        return 2 * consultas / (time.perf_counter() - inicio)
+
+    print(f"{'sin particionar':<16}: {medir():8.0f} consultas/s")
+    for cantidad_particiones in particiones:
+        _, t_carga = _cronometrar(sistema.particionar_catalogo, cantidad_particiones)
+        print(f"{cantidad_particiones} partición(es)  : {medir():8.0f} consultas/s  (repartir {t_carga:.2f} s)")
+    sistema.cerrar_particiones()
+
+
+async def _generar_carga(ruta_socket, isbns, usuarios, solicitudes, ventana, semilla):
+    # Una conexión que envía `ventana` solicitudes seguidas y luego lee sus respuestas:
+    # 90% consultas, 10% préstamos y devoluciones. Retorna la cantidad de errores
+    aleatorio = random.Random(semilla)
+    lector, escritor = await asyncio.open_unix_connection(ruta_socket, limit=1 << 24)
+    errores = 0
+    for inicio in range(0, solicitudes, ventana):
+        lote = []
+        for id_solicitud in range(inicio, min(inicio + ventana, solicitudes)):
+            accion = aleatorio.random()
+            usuario = aleatorio.choice(usuarios)
+            if accion < 0.4:
+                op, args = 'buscar_libro_por_isbn', [aleatorio.choice(isbns)]
+            elif accion < 0.7:
+                op, args = 'buscar_libros_por_titulo', [aleatorio.choice("acfhjlmnrst"), 10]
+            elif accion < 0.9:
+                op, args = 'obtener_prestamos_activos_por_usuario', [usuario]
+            elif accion < 0.95:
+                op, args = 'registrar_prestamo', [aleatorio.choice(isbns), usuario, "2024-01-10"]
+            else:
+                op, args = 'registrar_devolucion', [f"P{aleatorio.randint(1, solicitudes):03d}", "2024-01-20"]
+            lote.append(codificar({'id': id_solicitud, 'op': op, 'args': args}))
+        escritor.write(b''.join(lote))
+        for _ in lote:
+            errores += not decodificar(await lector.readline())['ok']
+    escritor.close()
+    await escritor.wait_closed()
+    return errores
+
+
+def prueba_servidor(cantidad_libros=10**5, conexiones=(1, 8), ventanas=(1, 32), solicitudes=20000):
+    """
+    Solicitudes por segundo que atiende el servidor (servidor.py, en otro proceso y
+    por un socket Unix) con varias conexiones a la vez, esperando cada respuesta
+    (ventana 1) o enviando varias solicitudes seguidas por conexión.
+    """
+    print("=== Servidor: solicitudes por segundo ===")
+    directorio = tempfile.mkdtemp()
+    archivo = os.path.join(directorio, "biblioteca.json")
+    ruta_socket = os.path.join(directorio, "biblioteca.sock")
+    sistema = SistemaBiblioteca()
+    sistema.libros = sistema.libros.copia_vacia()
+    for libro in generar_libros(cantidad_libros):
+        sistema.libros.agregar(libro)
+    usuarios = [f"M{i:04d}" for i in range(200)]
+    for id_usuario in usuarios:
+        sistema.agregar_usuario(id_usuario, f"Usuario {id_usuario}", f"{id_usuario}@email.com")
+    sistema.guardar_datos(archivo, compacto=True, indices=False)
+    isbns = [libro.isbn for libro in sistema.libros]
+    del sistema
+
+    programa = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'servidor.py')
+    servidor = subprocess.Popen([sys.executable, programa, '--socket', ruta_socket, '--archivo', archivo,
+                                 '--autoguardado', '3600'], stdout=subprocess.PIPE, text=True)
+    try:
+        while not servidor.stdout.readline().startswith("Servidor escuchando"):
+            pass
+        for cantidad_conexiones in conexiones:
+            for ventana in ventanas:
+                async def cargar():
+                    return await asyncio.gather(*(
+                        _generar_carga(ruta_socket, isbns, usuarios, solicitudes // cantidad_conexiones, ventana, i)
+                        for i in range(cantidad_conexiones)))
+                errores, transcurrido = _cronometrar(asyncio.run, cargar())
+                print(f"{cantidad_conexiones} conexión(es), ventana {ventana:3d}: "
+                      f"{solicitudes / transcurrido:8.0f} solicitudes/s  (errores: {sum(errores)})")
+    finally:
+        servidor.terminate()
+        servidor.wait()
+
+
+# Punto de entrada: permite limitar los tamaños por línea de comandos (ej. 10000 100000)
+if __name__ == "__main__":
+    tamanios = tuple(int(arg) for arg in sys.argv[1:]) or (10**5, 10**6)
+    prueba_construccion_masiva(tamanios)
+    prueba_busquedas_iterativas(tamanios[0])
+    prueba_memoria_modelos(tamanios[-1])
+    prueba_almacen_columnar(tamanios[-1])
+    prueba_retrasos()
+    prueba_cola_vencimientos()
+    prueba_top_k_por_año(tamanios[-1])
+    prueba_persistencia(tamanios[0])
+    prueba_diario()
+    prueba_compactacion(tamanios[0])
+    prueba_instantanea_binaria(tamanios[0], 5 * tamanios[0])
+    prueba_sqlite(tamanios[0])
+    prueba_autoguardado(tamanios[0])
+    prueba_indices_perezosos(tamanios[-1], 2 * tamanios[-1])
+    prueba_ordenes_guardados(tamanios[-1])
+    prueba_concurrencia()
+    prueba_catalogo_particionado(tamanios[-1])
+    prueba_servidor(tamanios[0])
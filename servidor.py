@@ -0,0 +1,202 @@
+import argparse
+import asyncio
+import contextlib
+import functools
+import os
+import signal
+from concurrent.futures import ThreadPoolExecutor
+
+from main import SistemaBiblioteca
+from protocolo import LIMITE_LINEA, PUERTO, codificar, decodificar
+
+# Consultas: se atienden en un grupo de hilos, varias a la vez (cerrojo de lectura del sistema)
+CONSULTAS = frozenset({
+    'buscar_libro_por_isbn', 'buscar_libros_por_titulo', 'buscar_libros_por_autor', 'buscar_libros_por_texto',
+    'buscar_libros_por_rango_años', 'listar_libros', 'listar_libros_disponibles',
+    'buscar_usuario_por_id', 'buscar_usuarios_por_nombre', 'listar_usuarios',
+    'obtener_prestamos_vencidos', 'obtener_prestamos_por_vencer', 'obtener_prestamos_activos',
+    'obtener_prestamos_activos_por_usuario', 'obtener_prestamos_activos_por_libro', 'buscar_prestamo_por_id',
+    'listar_todos_los_prestamos', 'calcular_retrasos', 'generar_estadisticas_por_año',
+    'obtener_libros_mas_antiguos', 'obtener_libros_mas_recientes', 'obtener_libros_por_antiguedad',
+    'hay_cambios_sin_guardar',
+})
+# Operaciones que modifican datos: un único hilo las ejecuta de a una, en orden de llegada
+ESCRITURAS = frozenset({
+    'agregar_libro', 'actualizar_libro', 'eliminar_libro', 'agregar_usuario', 'actualizar_usuario',
+    'eliminar_usuario', 'registrar_prestamo', 'registrar_devolucion',
+})
+# Solicitudes en curso por conexión (más allá de esto se deja de leer hasta que terminen)
+EN_CURSO_POR_CONEXION = 256
+# Respuestas pendientes de enviar por conexión a partir de las cuales se deja de leerle solicitudes
+ALTA_MAREA = 64 * 1024
+
+
+class ServidorBiblioteca:
+    """
+    Servidor asyncio que atiende a varios mostradores sobre un mismo SistemaBiblioteca
+    (ver protocolo.py). Cada conexión puede enviar muchas solicitudes sin esperar las
+    respuestas: se despachan apenas llegan y cada respuesta sale, con su id, en
+    cuanto está lista (puede adelantarse a la de una solicitud anterior).
+
+    El bucle de eventos no ejecuta operaciones del sistema: las consultas van a un
+    grupo de hilos y las escrituras a un hilo propio, así una escritura nunca
+    detiene la atención de las demás conexiones.
+    """
+
+    def __init__(self, sistema, archivo=None, hilos_consultas=4):
+        """
+        Args:
+            sistema (SistemaBiblioteca): Sistema a exponer
+            archivo (str, optional): Archivo de datos del servidor (guardar_cambios y
+                cargar_datos de los clientes usan siempre este)
+            hilos_consultas (int): Hilos que atienden consultas
+        """
+        self.sistema = sistema
+        self.archivo = archivo
+        self._consultas = ThreadPoolExecutor(hilos_consultas, thread_name_prefix='consulta')
+        self._escrituras = ThreadPoolExecutor(1, thread_name_prefix='escritura')
+        self._servidor = None
+        self.solicitudes_atendidas = 0
+
+    async def iniciar(self, host='127.0.0.1', puerto=PUERTO, ruta_socket=None):
+        """
+        Empieza a aceptar conexiones por TCP en localhost o por un socket Unix.
+
+        Returns:
+            asyncio.Server: Servidor ya escuchando
+        """
+        if ruta_socket is not None:
+            self._servidor = await asyncio.start_unix_server(self._atender, ruta_socket, limit=LIMITE_LINEA)
+        else:
+            self._servidor = await asyncio.start_server(self._atender, host, puerto, limit=LIMITE_LINEA)
+        return self._servidor
+
+    def cerrar(self):
+        # Deja de aceptar conexiones y termina los hilos de trabajo
+        if self._servidor is not None:
+            self._servidor.close()
+        self._consultas.shutdown(wait=True)
+        self._escrituras.shutdown(wait=True)
+
+    async def _atender(self, lector, escritor):
+        # Lee solicitudes de una conexión y despacha cada una en su propia tarea
+        en_curso = asyncio.Semaphore(EN_CURSO_POR_CONEXION)
+        tareas = set()
+        escritor.transport.set_write_buffer_limits(high=ALTA_MAREA)
+        try:
+            while linea := await lector.readline():
+                await en_curso.acquire()
+                tarea = asyncio.ensure_future(self._responder(linea, escritor))
+                tareas.add(tarea)
+                tarea.add_done_callback(tareas.discard)
+                tarea.add_done_callback(lambda _: en_curso.release())
+                # Si el cliente no lee sus respuestas, dejar de leerle solicitudes
+                await escritor.drain()
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            if tareas:
+                await asyncio.gather(*tareas, return_exceptions=True)
+            escritor.close()
+
+    async def _responder(self, linea, escritor):
+        # Ejecuta una solicitud fuera del bucle de eventos y escribe su respuesta
+        id_solicitud = None
+        try:
+            solicitud = decodificar(linea)
+            id_solicitud = solicitud.get('id')
+            ejecutor, funcion, cerrojo = self._operacion(solicitud['op'], solicitud.get('args', ()),
+                                                         solicitud.get('kwargs', {}))
+            respuesta = await asyncio.get_running_loop().run_in_executor(
+                ejecutor, self._ejecutar, id_solicitud, funcion, cerrojo)
+        except Exception as e:
+            respuesta = codificar({'id': id_solicitud, 'ok': False, 'error': f"{type(e).__name__}: {e}"})
+        self.solicitudes_atendidas += 1
+        if not escritor.is_closing():
+            escritor.write(respuesta)
+            # La solicitud sigue ocupando su lugar en la conexión hasta que la respuesta
+            # baja de ALTA_MAREA: un cliente que no lee deja de poder enviar solicitudes
+            with contextlib.suppress(ConnectionError):
+                await escritor.drain()
+
+    def _ejecutar(self, id_solicitud, funcion, cerrojo):
+        # Corre en un hilo de trabajo: ejecuta la operación y codifica la respuesta. Las
+        # consultas se codifican con el cerrojo de lectura tomado: los libros que retornan
+        # no cambian mientras se convierten a JSON
+        try:
+            with cerrojo:
+                return codificar({'id': id_solicitud, 'ok': True, 'resultado': funcion()})
+        except Exception as e:
+            return codificar({'id': id_solicitud, 'ok': False, 'error': f"{type(e).__name__}: {e}"})
+
+    def _operacion(self, op, args, kwargs):
+        # (ejecutor, función sin argumentos, cerrojo) para una operación pedida por un cliente.
+        # Las escrituras toman ellas mismas el cerrojo de escritura
+        if op in CONSULTAS:
+            return (self._consultas, functools.partial(getattr(self.sistema, op), *args, **kwargs),
+                    self.sistema._cerrojo_datos.lectura())
+        if op in ESCRITURAS:
+            return (self._escrituras, functools.partial(getattr(self.sistema, op), *args, **kwargs),
+                    contextlib.nullcontext())
+        if op == 'guardar_cambios':
+            return (self._consultas, functools.partial(self._con_archivo, self.sistema.guardar_cambios, forzar=True),
+                    contextlib.nullcontext())
+        if op == 'cargar_datos':
+            return (self._escrituras, functools.partial(self._con_archivo, self.sistema.cargar_datos),
+                    contextlib.nullcontext())
+        raise ValueError(f"Operación desconocida: {op}")
+
+    def _con_archivo(self, metodo, **kwargs):
+        # guardar_cambios y cargar_datos sobre el archivo del servidor, nunca uno del cliente
+        if self.archivo is None:
+            return False, "El servidor no tiene un archivo de datos"
+        return metodo(self.archivo, **kwargs)
+
+
+async def _servir(servidor, host, puerto, ruta_socket):
+    # Atiende hasta recibir SIGINT o SIGTERM
+    await servidor.iniciar(host, puerto, ruta_socket)
+    print(f"Servidor escuchando en {ruta_socket or f'{host}:{puerto}'}", flush=True)
+    detener = asyncio.Event()
+    bucle = asyncio.get_running_loop()
+    for senal in (signal.SIGINT, signal.SIGTERM):
+        try:
+            bucle.add_signal_handler(senal, detener.set)
+        except (NotImplementedError, RuntimeError):
+            pass  # Sin señales en este sistema: Ctrl+C llega como KeyboardInterrupt
+    try:
+        await detener.wait()
+    finally:
+        servidor.cerrar()
+
+
+def main():
+    """Inicia el servidor con el archivo de datos indicado (y autoguardado)"""
+    parser = argparse.ArgumentParser(description="Servidor del sistema de biblioteca")
+    parser.add_argument('--host', default='127.0.0.1', help="Dirección TCP (por defecto, solo localhost)")
+    parser.add_argument('--puerto', type=int, default=PUERTO)
+    parser.add_argument('--socket', dest='ruta_socket', help="Escuchar en este socket Unix en lugar de TCP")
+    parser.add_argument('--archivo', default='biblioteca_data.json', help="Archivo de datos")
+    parser.add_argument('--autoguardado', type=float, default=30.0, help="Segundos entre autoguardados")
+    opciones = parser.parse_args()
+
+    sistema = SistemaBiblioteca()
+    if os.path.exists(opciones.archivo):
+        exito, mensaje = sistema.cargar_datos(opciones.archivo)
+        print(mensaje)
+        if not exito:
+            return
+    sistema.iniciar_autoguardado(opciones.archivo, opciones.autoguardado)
+    sistema.precalentar_indices(en_segundo_plano=True)
+    servidor = ServidorBiblioteca(sistema, opciones.archivo)
+    try:
+        asyncio.run(_servir(servidor, opciones.host, opciones.puerto, opciones.ruta_socket))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sistema.detener_autoguardado()
+        print(sistema.guardar_cambios(opciones.archivo)[1])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1071 @@
+import functools
+import sqlite3
+import threading
+from datetime import date
+from itertools import chain, islice
+
+from estructuras import normalizar_texto, tokenizar
+from libro import Libro
+from usuario import Usuario
+from prestamo import DIAS_PRESTAMO, Prestamo, calcular_retrasos, fecha_a_dia
+from persistencia import escribir_atomico, escribir_json_streaming, leer_json_streaming
+from formato_binario import InstantaneaBinaria, es_archivo_binario, escribir_instantanea_binaria
+
+# Esquema de la base de datos. Cada consulta del sistema tiene su índice secundario:
+# título y autor en minúsculas (búsqueda por prefijo, ordenada y paginada), año,
+# préstamos por libro/usuario/estado y fecha de préstamo (estadísticas por año).
+# Las palabras de los libros y los trigramas de los nombres de usuario se guardan
+# en tablas propias, como IndiceInvertido e IndiceTrigramas en memoria.
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS libros (
+    isbn TEXT NOT NULL UNIQUE,
+    titulo TEXT NOT NULL,
+    autor TEXT NOT NULL,
+    año_publicacion INTEGER NOT NULL,
+    genero TEXT NOT NULL,
+    disponible INTEGER NOT NULL,
+    titulo_clave TEXT NOT NULL,
+    autor_clave TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS libros_titulo ON libros (titulo_clave, isbn);
+CREATE INDEX IF NOT EXISTS libros_autor ON libros (autor_clave, isbn);
+DROP INDEX IF EXISTS libros_año;
+CREATE INDEX IF NOT EXISTS libros_año_isbn ON libros (año_publicacion, isbn);
+
+CREATE TABLE IF NOT EXISTS palabras_libros (
+    palabra TEXT NOT NULL,
+    isbn TEXT NOT NULL,
+    ocurrencias INTEGER NOT NULL,
+    PRIMARY KEY (palabra, isbn)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS palabras_libros_isbn ON palabras_libros (isbn);
+
+CREATE TABLE IF NOT EXISTS usuarios (
+    id_usuario TEXT NOT NULL UNIQUE,
+    nombre TEXT NOT NULL,
+    contacto TEXT NOT NULL,
+    nombre_normalizado TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS trigramas_usuarios (
+    trigrama TEXT NOT NULL,
+    id_usuario TEXT NOT NULL,
+    PRIMARY KEY (trigrama, id_usuario)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS trigramas_usuarios_id ON trigramas_usuarios (id_usuario);
+
+CREATE TABLE IF NOT EXISTS prestamos (
+    id_prestamo TEXT NOT NULL UNIQUE,
+    isbn_libro TEXT NOT NULL,
+    id_usuario TEXT NOT NULL,
+    dia_prestamo INTEGER NOT NULL,
+    dia_devolucion INTEGER,
+    activo INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS prestamos_dia ON prestamos (dia_prestamo);
+CREATE INDEX IF NOT EXISTS prestamos_activos_libro ON prestamos (isbn_libro) WHERE activo = 1;
+CREATE INDEX IF NOT EXISTS prestamos_activos_usuario ON prestamos (id_usuario) WHERE activo = 1;
+CREATE INDEX IF NOT EXISTS prestamos_activos_dia ON prestamos (dia_prestamo) WHERE activo = 1;
+
+CREATE TABLE IF NOT EXISTS metadatos (
+    clave TEXT PRIMARY KEY,
+    valor INTEGER NOT NULL
+);
+"""
+
+# Columnas en el orden en que se leen para armar cada objeto
+_LIBRO = "isbn, titulo, autor, año_publicacion, genero, disponible"
+_USUARIO = "id_usuario, nombre, contacto"
+_PRESTAMO = "id_prestamo, isbn_libro, id_usuario, dia_prestamo, dia_devolucion, activo"
+
+_INSERTAR_LIBRO = ("INSERT INTO libros (isbn, titulo, autor, año_publicacion, genero, disponible, "
+                   "titulo_clave, autor_clave) VALUES (?, ?, ?, ?, ?, ?, ?, ?)")
+_INSERTAR_USUARIO = "INSERT INTO usuarios (id_usuario, nombre, contacto, nombre_normalizado) VALUES (?, ?, ?, ?)"
+_INSERTAR_PRESTAMO = f"INSERT INTO prestamos ({_PRESTAMO}) VALUES (?, ?, ?, ?, ?, ?)"
+
+_TANDA = 4096  # Registros por executemany en las cargas
+
+# Campos que actualizar_libro / actualizar_usuario aceptan (los mismos atributos del objeto)
+_CAMPOS_LIBRO = Libro.__slots__
+_CAMPOS_USUARIO = Usuario.__slots__
+
+
+def _crear_libro(fila):
+    libro = Libro(fila[0], fila[1], fila[2], fila[3], fila[4])
+    libro.disponible = bool(fila[5])
+    return libro
+
+
+def _crear_usuario(fila):
+    return Usuario(fila[0], fila[1], fila[2])
+
+
+def _crear_prestamo(fila):
+    return Prestamo.desde_dias(fila[0], fila[1], fila[2], fila[3], fila[4], bool(fila[5]))
+
+
+def _fila_libro(libro):
+    return (libro.isbn, libro.titulo, libro.autor, libro.año_publicacion, libro.genero,
+            1 if libro.disponible else 0, libro.titulo.lower(), libro.autor.lower())
+
+
+def _fila_usuario(usuario):
+    return (usuario.id_usuario, usuario.nombre, usuario.contacto, normalizar_texto(usuario.nombre))
+
+
+def _fila_prestamo(prestamo):
+    return (prestamo.id_prestamo, prestamo.isbn_libro, prestamo.id_usuario, prestamo.dia_prestamo,
+            prestamo.dia_devolucion, 1 if prestamo.activo else 0)
+
+
+def _palabras_libro(libro):
+    # Filas (palabra, isbn, ocurrencias) del índice de texto, como IndiceInvertido
+    conteo = {}
+    for campo in ('titulo', 'autor', 'genero'):
+        for palabra in tokenizar(getattr(libro, campo)):
+            conteo[palabra] = conteo.get(palabra, 0) + 1
+    return [(palabra, libro.isbn, ocurrencias) for palabra, ocurrencias in conteo.items()]
+
+
+def _trigramas_usuario(usuario):
+    # Filas (trigrama, id_usuario) del índice de nombres, como IndiceTrigramas
+    texto = normalizar_texto(usuario.nombre)
+    return [(trigrama, usuario.id_usuario) for trigrama in {texto[i:i + 3] for i in range(len(texto) - 2)}]
+
+
+def _tandas(registros, tamanio=_TANDA):
+    # Agrupa un iterable en listas de hasta `tamanio` elementos
+    iterador = iter(registros)
+    while tanda := list(islice(iterador, tamanio)):
+        yield tanda
+
+
+def _con_conexion(metodo):
+    """
+    Decorador de los métodos que usan la conexión: se ejecutan con el cerrojo de la
+    conexión tomado, así un único objeto sqlite3 se puede usar desde varios hilos
+    (interfaz, autoguardado, hilos del servidor) sin intercalar sentencias ni
+    transacciones de distintas operaciones.
+    """
+    @functools.wraps(metodo)
+    def envoltura(self, *args, **kwargs):
+        with self._cerrojo:
+            return metodo(self, *args, **kwargs)
+    return envoltura
+
+
+def _siguiente_prefijo(prefijo):
+    # Menor texto mayor que todos los que empiezan con el prefijo (None si no hay cota)
+    while prefijo and ord(prefijo[-1]) == 0x10FFFF:
+        prefijo = prefijo[:-1]
+    if not prefijo:
+        return None
+    return prefijo[:-1] + chr(ord(prefijo[-1]) + 1)
+
+
+class SistemaBibliotecaSQLite:
+    """
+    Sistema de biblioteca guardado en una base de datos SQLite en disco.
+    Misma interfaz que SistemaBiblioteca (mismos métodos, argumentos y resultados),
+    pero los datos no se cargan en memoria: cada consulta usa los índices de la base
+    y cada operación que modifica datos se confirma en su propia transacción
+    (durable al retornar). Los libros, usuarios y préstamos retornados son copias;
+    para modificarlos se usan los métodos actualizar_*.
+
+    Se puede usar desde varios hilos. El autoguardado y el precalentamiento de
+    índices no hacen falta (sus métodos existen y no hacen nada); no tiene diario
+    de operaciones ni catálogo particionado (abrir_diario, compactar_diario y
+    particionar_catalogo son solo de SistemaBiblioteca).
+    """
+
+    def __init__(self, ruta='biblioteca.db', sincronizacion='FULL'):
+        """
+        Abre (o crea) la base de datos del sistema.
+
+        Args:
+            ruta (str): Archivo de la base de datos (':memory:' para una base temporal)
+            sincronizacion (str): PRAGMA synchronous de SQLite: 'FULL' confirma cada
+                operación en disco; 'NORMAL' es más rápido pero una caída del sistema
+                operativo puede perder las últimas operaciones (nunca corrompe la base)
+        """
+        self.ruta = ruta
+        # Las sentencias se preparan una sola vez y quedan en la caché de la conexión.
+        # La conexión se comparte entre hilos: cada operación la usa con _cerrojo tomado
+        self._cerrojo = threading.RLock()
+        self.conexion = sqlite3.connect(ruta, cached_statements=256, check_same_thread=False)
+        self.conexion.execute("PRAGMA journal_mode=WAL")
+        self.conexion.execute(f"PRAGMA synchronous={sincronizacion}")
+        nueva = self.conexion.execute(
+            "SELECT count(*) FROM sqlite_master WHERE name = 'libros'").fetchone()[0] == 0
+        with self.conexion:
+            self.conexion.executescript(_ESQUEMA)
+            self.conexion.execute("INSERT OR IGNORE INTO metadatos VALUES ('contador_prestamos', 1)")
+
+        # Una base nueva empieza con los mismos datos de ejemplo que SistemaBiblioteca
+        if nueva:
+            self.agregar_datos_ejemplo()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+    @_con_conexion
+    def cerrar(self):
+        # Cierra la conexión con la base de datos
+        self.conexion.close()
+
+    def _consultar(self, sql, parametros=(), crear=_crear_libro):
+        # Ejecuta una consulta y arma un objeto por fila
+        return [crear(fila) for fila in self.conexion.execute(sql, parametros)]
+
+    def _uno(self, sql, parametros, crear):
+        fila = self.conexion.execute(sql, parametros).fetchone()
+        return None if fila is None else crear(fila)
+
+    @property
+    def contador_prestamos(self):
+        # Contador para generar IDs únicos de préstamos (guardado en la base)
+        with self._cerrojo:
+            return self.conexion.execute(
+                "SELECT valor FROM metadatos WHERE clave = 'contador_prestamos'").fetchone()[0]
+
+    @_con_conexion
+    def agregar_datos_ejemplo(self):
+        """
+        Agrega datos de ejemplo al sistema para pruebas y demostración.
+        """
+        libros_ejemplo = [
+            Libro("978-0142437230", "1984", "George Orwell", 1949, "Ciencia Ficción"),
+            Libro("978-0061120084", "To Kill a Mockingbird", "Harper Lee", 1960, "Ficción"),
+            Libro("978-0544003415", "The Hobbit", "J.R.R. Tolkien", 1937, "Fantasía"),
+            Libro("978-0451524935", "The Great Gatsby", "F. Scott Fitzgerald", 1925, "Ficción"),
+            Libro("978-0141439518", "Pride and Prejudice", "Jane Austen", 1813, "Romance")
+        ]
+        usuarios_ejemplo = [
+            Usuario("U001", "Juan Pérez", "juan@email.com"),
+            Usuario("U002", "María García", "maria@email.com"),
+            Usuario("U003", "Carlos Rodríguez", "carlos@email.com"),
+            Usuario("U004", "Ana López", "ana@email.com")
+        ]
+        with self.conexion:
+            self._insertar(libros_ejemplo, usuarios_ejemplo, [])
+
+    def _insertar(self, libros, usuarios, prestamos):
+        # Inserta registros con sus índices de texto (dentro de la transacción del llamador),
+        # en tandas para que las cargas grandes no ejecuten una sentencia por fila
+        ejecutar = self.conexion.executemany
+        for tanda in _tandas(libros):
+            ejecutar(_INSERTAR_LIBRO, map(_fila_libro, tanda))
+            ejecutar("INSERT INTO palabras_libros VALUES (?, ?, ?)", chain.from_iterable(map(_palabras_libro, tanda)))
+        for tanda in _tandas(usuarios):
+            ejecutar(_INSERTAR_USUARIO, map(_fila_usuario, tanda))
+            ejecutar("INSERT INTO trigramas_usuarios VALUES (?, ?)", chain.from_iterable(map(_trigramas_usuario, tanda)))
+        for tanda in _tandas(prestamos):
+            ejecutar(_INSERTAR_PRESTAMO, map(_fila_prestamo, tanda))
+
+    # ===== MÉTODOS PARA LIBROS =====
+
+    @_con_conexion
+    def agregar_libro(self, isbn, titulo, autor, año_publicacion, genero):
+        """
+        Agrega un nuevo libro al sistema.
+
+        Args:
+            isbn (str): ISBN único del libro
+            titulo (str): Título del libro
+            autor (str): Autor del libro
+            año_publicacion (int): Año de publicación
+            genero (str): Género del libro
+
+        Returns:
+            tuple: (éxito, mensaje) indicando si la operación fue exitosa
+        """
+        try:
+            with self.conexion:
+                self._insertar([Libro(isbn, titulo, autor, año_publicacion, genero)], [], [])
+        except sqlite3.IntegrityError:
+            return False, "Ya existe un libro con este ISBN"
+        return True, "Libro agregado exitosamente"
+
+    @_con_conexion
+    def buscar_libro_por_isbn(self, isbn):
+        """
+        Busca un libro por su ISBN (índice único de la tabla).
+
+        Args:
+            isbn (str): ISBN a buscar
+
+        Returns:
+            Libro: El libro encontrado o None si no existe
+        """
+        return self._uno(f"SELECT {_LIBRO} FROM libros WHERE isbn = ?", (isbn,), _crear_libro)
+
+    def _buscar_prefijo(self, columna, prefijo, limite, desplazamiento, cursor):
+        # Búsqueda por prefijo sobre el índice (columna, isbn), en el mismo orden y con la
+        # misma paginación que ArbolAVLLibros.buscar_prefijo
+        prefijo = prefijo.lower()
+        condiciones = [f"{columna} >= ?"]
+        parametros = [prefijo]
+        siguiente = _siguiente_prefijo(prefijo)
+        if siguiente is not None:
+            condiciones.append(f"{columna} < ?")
+            parametros.append(siguiente)
+        if cursor is not None and tuple(cursor) >= (prefijo, ''):
+            condiciones.append(f"({columna}, isbn) > (?, ?)")
+            parametros.extend(cursor)
+        sql = (f"SELECT {_LIBRO} FROM libros WHERE {' AND '.join(condiciones)} "
+               f"ORDER BY {columna}, isbn LIMIT ? OFFSET ?")
+        parametros.extend((-1 if limite is None else max(limite, 0), desplazamiento))
+        return self._consultar(sql, parametros)
+
+    @_con_conexion
+    def buscar_libros_por_titulo(self, titulo, limite=None, desplazamiento=0, cursor=None):
+        """
+        Busca libros cuyo título empieza con el texto dado (sin distinguir mayúsculas).
+
+        Args:
+            titulo (str): Título o parte del título a buscar
+            limite (int, optional): Tamaño máximo de la página de resultados
+            desplazamiento (int): Cantidad de resultados a saltar
+            cursor (tuple, optional): Cursor del último libro de la página anterior
+                                      (ver cursor_libro)
+
+        Returns:
+            list: Lista de libros que coinciden con el título, en orden alfabético
+        """
+        return self._buscar_prefijo('titulo_clave', titulo, limite, desplazamiento, cursor)
+
+    @_con_conexion
+    def buscar_libros_por_autor(self, autor, limite=None, desplazamiento=0, cursor=None):
+        """
+        Busca libros cuyo autor empieza con el texto dado (sin distinguir mayúsculas).
+
+        Args:
+            autor (str): Autor o parte del nombre del autor a buscar
+            limite (int, optional): Tamaño máximo de la página de resultados
+            desplazamiento (int): Cantidad de resultados a saltar
+            cursor (tuple, optional): Cursor del último libro de la página anterior
+                                      (ver cursor_libro)
+
+        Returns:
+            list: Lista de libros que coinciden con el autor, en orden alfabético
+        """
+        return self._buscar_prefijo('autor_clave', autor, limite, desplazamiento, cursor)
+
+    @_con_conexion
+    def buscar_libros_por_texto(self, consulta, limite=None):
+        """
+        Busca libros por palabras contenidas en el título, el autor o el género,
+        sin importar su posición, mayúsculas ni acentos (tabla de palabras).
+
+        Args:
+            consulta (str): Una o más palabras a buscar
+            limite (int, optional): Máximo de libros a retornar
+
+        Returns:
+            list: Lista de libros ordenados por relevancia
+        """
+        palabras = list(dict.fromkeys(tokenizar(consulta)))
+        if not palabras:
+            return []
+        marcas = ', '.join('?' * len(palabras))
+        # Ranking de IndiceInvertido.buscar: si algún libro tiene todas las palabras solo
+        # cuentan esos; si no, los que tienen alguna
+        palabras_presentes = self.conexion.execute(
+            f"SELECT count(DISTINCT palabra) FROM palabras_libros WHERE palabra IN ({marcas})", palabras).fetchone()[0]
+        sql = (f"SELECT {', '.join('l.' + c for c in _LIBRO.split(', '))}, "
+               f"count(*) AS coincidencias, sum(p.ocurrencias) AS ocurrencias "
+               f"FROM palabras_libros p JOIN libros l ON l.isbn = p.isbn "
+               f"WHERE p.palabra IN ({marcas}) GROUP BY p.isbn ")
+        parametros = list(palabras)
+        if palabras_presentes == len(palabras):
+            completos = self.conexion.execute(sql + "HAVING count(*) = ? LIMIT 1",
+                                              parametros + [len(palabras)]).fetchone()
+            if completos is not None:
+                sql += "HAVING count(*) = ? "
+                parametros.append(len(palabras))
+        sql += "ORDER BY coincidencias DESC, ocurrencias DESC, l.titulo_clave, l.isbn LIMIT ?"
+        parametros.append(-1 if limite is None else limite)
+        return self._consultar(sql, parametros)
+
+    def cursor_libro(self, libro, indice='titulo'):
+        """
+        Obtiene el cursor de paginación de un libro para continuar una búsqueda.
+
+        Args:
+            libro (Libro): Último libro de la página ya mostrada
+            indice (str): Índice de la búsqueda: 'titulo' o 'autor'
+
+        Returns:
+            tuple: Cursor a pasar en el parámetro cursor de la siguiente búsqueda
+        """
+        clave = libro.autor if indice == 'autor' else libro.titulo
+        return (clave.lower(), libro.isbn)
+
+    @_con_conexion
+    def buscar_libros_por_rango_años(self, año_inicio, año_fin):
+        """
+        Busca libros publicados en un rango de años específico.
+
+        Args:
+            año_inicio (int): Año inicial del rango
+            año_fin (int): Año final del rango
+
+        Returns:
+            list: Lista de libros dentro del rango de años, ordenados por año
+        """
+        return list(self.iterar_libros_por_rango_años(año_inicio, año_fin))
+
+    def iterar_libros_por_rango_años(self, año_inicio, año_fin):
+        """
+        Recorre los libros de un rango de años en orden de año sin armar la lista completa.
+
+        Args:
+            año_inicio (int): Año inicial del rango
+            año_fin (int): Año final del rango
+
+        Returns:
+            generator: Libros del rango en orden de año (recorrido del índice por año)
+        """
+        # Las filas se leen en tandas, cada una con el cerrojo tomado: entre tandas otros
+        # hilos pueden usar la conexión
+        with self._cerrojo:
+            filas = self.conexion.execute(
+                f"SELECT {_LIBRO} FROM libros WHERE año_publicacion BETWEEN ? AND ? "
+                f"ORDER BY año_publicacion, isbn", (año_inicio, año_fin))
+        while True:
+            with self._cerrojo:
+                tanda = filas.fetchmany(_TANDA)
+            if not tanda:
+                return
+            yield from map(_crear_libro, tanda)
+
+    @_con_conexion
+    def listar_libros(self):
+        """
+        Obtiene todos los libros del sistema.
+
+        Returns:
+            list: Lista de todos los libros
+        """
+        return self._consultar(f"SELECT {_LIBRO} FROM libros ORDER BY rowid")
+
+    @_con_conexion
+    def listar_libros_disponibles(self):
+        """
+        Obtiene todos los libros disponibles para préstamo.
+
+        Returns:
+            list: Lista de libros disponibles
+        """
+        return self._consultar(f"SELECT {_LIBRO} FROM libros WHERE disponible = 1 ORDER BY rowid")
+
+    @_con_conexion
+    def actualizar_libro(self, isbn, nuevos_datos):
+        """
+        Actualiza la información de un libro existente.
+
+        Args:
+            isbn (str): ISBN del libro a actualizar
+            nuevos_datos (dict): Diccionario con los campos a actualizar
+
+        Returns:
+            tuple: (éxito, mensaje) indicando si la operación fue exitosa
+        """
+        libro = self.buscar_libro_por_isbn(isbn)
+        if not libro:
+            return False, "Libro no encontrado"
+        for campo, valor in nuevos_datos.items():
+            if campo in _CAMPOS_LIBRO:
+                setattr(libro, campo, valor)
+
+        try:
+            with self.conexion:
+                self.conexion.execute(
+                    "UPDATE libros SET isbn = ?, titulo = ?, autor = ?, año_publicacion = ?, genero = ?, "
+                    "disponible = ?, titulo_clave = ?, autor_clave = ? WHERE isbn = ?",
+                    _fila_libro(libro) + (isbn,))
+                if libro.isbn != isbn:
+                    # Como en SistemaBiblioteca, el libro con ISBN nuevo pasa al final del listado
+                    self.conexion.execute("UPDATE libros SET rowid = (SELECT max(rowid) + 1 FROM libros) "
+                                          "WHERE isbn = ?", (libro.isbn,))
+                # Reindexar las palabras si cambió algún campo de texto o el ISBN
+                if libro.isbn != isbn or any(campo in nuevos_datos for campo in ('titulo', 'autor', 'genero')):
+                    self.conexion.execute("DELETE FROM palabras_libros WHERE isbn = ?", (isbn,))
+                    self.conexion.executemany("INSERT INTO palabras_libros VALUES (?, ?, ?)",
+                                              _palabras_libro(libro))
+        except sqlite3.IntegrityError:
+            return False, "Ya existe un libro con este ISBN"
+        return True, "Libro actualizado exitosamente"
+
+    @_con_conexion
+    def eliminar_libro(self, isbn):
+        """
+        Elimina un libro del sistema.
+
+        Args:
+            isbn (str): ISBN del libro a eliminar
+
+        Returns:
+            tuple: (éxito, mensaje) indicando si la operación fue exitosa
+        """
+        if self.obtener_prestamos_activos_por_libro(isbn):
+            return False, "No se puede eliminar el libro porque tiene préstamos activos"
+        with self.conexion:
+            if self.conexion.execute("DELETE FROM libros WHERE isbn = ?", (isbn,)).rowcount == 0:
+                return False, "Libro no encontrado"
+            self.conexion.execute("DELETE FROM palabras_libros WHERE isbn = ?", (isbn,))
+        return True, "Libro eliminado exitosamente"
+
+    # ===== MÉTODOS PARA USUARIOS =====
+
+    @_con_conexion
+    def agregar_usuario(self, id_usuario, nombre, contacto):
+        """
+        Agrega un nuevo usuario al sistema.
+
+        Args:
+            id_usuario (str): ID único del usuario
+            nombre (str): Nombre completo del usuario
+            contacto (str): Información de contacto (email, teléfono, etc.)
+
+        Returns:
+            tuple: (éxito, mensaje) indicando si la operación fue exitosa
+        """
+        try:
+            with self.conexion:
+                self._insertar([], [Usuario(id_usuario, nombre, contacto)], [])
+        except sqlite3.IntegrityError:
+            return False, "Ya existe un usuario con este ID"
+        return True, "Usuario agregado exitosamente"
+
+    @_con_conexion
+    def buscar_usuario_por_id(self, id_usuario):
+        """
+        Busca un usuario por su ID.
+
+        Args:
+            id_usuario (str): ID del usuario a buscar
+
+        Returns:
+            Usuario: El usuario encontrado o None si no existe
+        """
+        return self._uno(f"SELECT {_USUARIO} FROM usuarios WHERE id_usuario = ?", (id_usuario,), _crear_usuario)
+
+    @_con_conexion
+    def buscar_usuarios_por_nombre(self, nombre):
+        """
+        Busca usuarios por nombre (búsqueda parcial, sin distinguir mayúsculas ni acentos)
+        usando la tabla de trigramas.
+
+        Args:
+            nombre (str): Nombre o parte del nombre a buscar
+
+        Returns:
+            list: Lista de usuarios que coinciden con el nombre
+        """
+        consulta = normalizar_texto(nombre)
+        trigramas = list({consulta[i:i + 3] for i in range(len(consulta) - 2)})
+        if not trigramas:
+            # Consultas muy cortas no tienen trigramas: se revisan los nombres normalizados
+            return self._consultar(f"SELECT {_USUARIO} FROM usuarios WHERE instr(nombre_normalizado, ?) > 0 "
+                                   f"ORDER BY rowid", (consulta,), _crear_usuario)
+        # Usuarios que tienen todos los trigramas de la consulta; luego se verifica la subcadena
+        marcas = ', '.join('?' * len(trigramas))
+        return self._consultar(
+            f"SELECT {_USUARIO} FROM usuarios WHERE id_usuario IN ("
+            f"SELECT id_usuario FROM trigramas_usuarios WHERE trigrama IN ({marcas}) "
+            f"GROUP BY id_usuario HAVING count(*) = ?) AND instr(nombre_normalizado, ?) > 0 ORDER BY rowid",
+            trigramas + [len(trigramas), consulta], _crear_usuario)
+
+    @_con_conexion
+    def listar_usuarios(self):
+        """
+        Obtiene todos los usuarios del sistema.
+
+        Returns:
+            list: Lista de todos los usuarios
+        """
+        return self._consultar(f"SELECT {_USUARIO} FROM usuarios ORDER BY rowid", (), _crear_usuario)
+
+    @_con_conexion
+    def actualizar_usuario(self, id_usuario, nuevos_datos):
+        """
+        Actualiza la información de un usuario existente.
+
+        Args:
+            id_usuario (str): ID del usuario a actualizar
+            nuevos_datos (dict): Diccionario con los campos a actualizar
+
+        Returns:
+            tuple: (éxito, mensaje) indicando si la operación fue exitosa
+        """
+        usuario = self.buscar_usuario_por_id(id_usuario)
+        if not usuario:
+            return False, "Usuario no encontrado"
+        for campo, valor in nuevos_datos.items():
+            if campo in _CAMPOS_USUARIO:
+                setattr(usuario, campo, valor)
+
+        try:
+            with self.conexion:
+                self.conexion.execute(
+                    "UPDATE usuarios SET id_usuario = ?, nombre = ?, contacto = ?, nombre_normalizado = ? "
+                    "WHERE id_usuario = ?", _fila_usuario(usuario) + (id_usuario,))
+                if usuario.id_usuario != id_usuario:
+                    # Como en SistemaBiblioteca, el usuario con ID nuevo pasa al final del listado
+                    self.conexion.execute("UPDATE usuarios SET rowid = (SELECT max(rowid) + 1 FROM usuarios) "
+                                          "WHERE id_usuario = ?", (usuario.id_usuario,))
+                # Reindexar el nombre si cambió el nombre o el ID
+                if 'nombre' in nuevos_datos or usuario.id_usuario != id_usuario:
+                    self.conexion.execute("DELETE FROM trigramas_usuarios WHERE id_usuario = ?", (id_usuario,))
+                    self.conexion.executemany("INSERT INTO trigramas_usuarios VALUES (?, ?)",
+                                              _trigramas_usuario(usuario))
+        except sqlite3.IntegrityError:
+            return False, "Ya existe un usuario con este ID"
+        return True, "Usuario actualizado exitosamente"
+
+    @_con_conexion
+    def eliminar_usuario(self, id_usuario):
+        """
+        Elimina un usuario del sistema.
+
+        Args:
+            id_usuario (str): ID del usuario a eliminar
+
+        Returns:
+            tuple: (éxito, mensaje) indicando si la operación fue exitosa
+        """
+        if self.obtener_prestamos_activos_por_usuario(id_usuario):
+            return False, "No se puede eliminar el usuario porque tiene préstamos activos"
+        with self.conexion:
+            if self.conexion.execute("DELETE FROM usuarios WHERE id_usuario = ?", (id_usuario,)).rowcount == 0:
+                return False, "Usuario no encontrado"
+            self.conexion.execute("DELETE FROM trigramas_usuarios WHERE id_usuario = ?", (id_usuario,))
+        return True, "Usuario eliminado exitosamente"
+
+    # ===== MÉTODOS PARA PRÉSTAMOS =====
+
+    @_con_conexion
+    def registrar_prestamo(self, isbn_libro, id_usuario, fecha_prestamo):
+        """
+        Registra un nuevo préstamo en el sistema.
+
+        Args:
+            isbn_libro (str): ISBN del libro a prestar
+            id_usuario (str): ID del usuario que solicita el préstamo
+            fecha_prestamo (str): Fecha del préstamo en formato YYYY-MM-DD
+
+        Returns:
+            tuple: (éxito, mensaje) indicando si la operación fue exitosa
+        """
+        libro = self.buscar_libro_por_isbn(isbn_libro)
+        if not libro:
+            return False, "Libro no encontrado"
+        if not libro.disponible:
+            return False, "El libro no está disponible"
+        if not self.buscar_usuario_por_id(id_usuario):
+            return False, "Usuario no encontrado"
+        try:
+            dia_prestamo = fecha_a_dia(fecha_prestamo)
+        except ValueError:
+            return False, "Fecha inválida, use el formato YYYY-MM-DD"
+
+        # Préstamo, contador y disponibilidad del libro en una sola transacción
+        with self.conexion:
+            contador = self.conexion.execute(
+                "UPDATE metadatos SET valor = valor + 1 WHERE clave = 'contador_prestamos' "
+                "RETURNING valor - 1").fetchone()[0]
+            id_prestamo = f"P{contador:03d}"
+            self.conexion.execute(_INSERTAR_PRESTAMO, (id_prestamo, isbn_libro, id_usuario, dia_prestamo, None, 1))
+            self.conexion.execute("UPDATE libros SET disponible = 0 WHERE isbn = ?", (isbn_libro,))
+        return True, f"Préstamo registrado exitosamente. ID: {id_prestamo}"
+
+    @_con_conexion
+    def registrar_devolucion(self, id_prestamo, fecha_devolucion):
+        """
+        Registra la devolución de un préstamo.
+
+        Args:
+            id_prestamo (str): ID del préstamo a devolver
+            fecha_devolucion (str): Fecha de devolución en formato YYYY-MM-DD
+
+        Returns:
+            tuple: (éxito, mensaje) indicando si la operación fue exitosa
+        """
+        prestamo = self._uno(f"SELECT {_PRESTAMO} FROM prestamos WHERE id_prestamo = ? AND activo = 1",
+                             (id_prestamo,), _crear_prestamo)
+        if not prestamo:
+            return False, "Préstamo no encontrado o ya devuelto"
+        try:
+            prestamo.registrar_devolucion(fecha_devolucion)
+        except ValueError:
+            return False, "Fecha inválida, use el formato YYYY-MM-DD"
+
+        with self.conexion:
+            self.conexion.execute("UPDATE prestamos SET dia_devolucion = ?, activo = 0 WHERE id_prestamo = ?",
+                                  (prestamo.dia_devolucion, id_prestamo))
+            self.conexion.execute("UPDATE libros SET disponible = 1 WHERE isbn = ?", (prestamo.isbn_libro,))
+        return True, "Devolución registrada exitosamente"
+
+    @_con_conexion
+    def obtener_prestamos_vencidos(self, fecha=None):
+        """
+        Obtiene los préstamos activos cuya fecha límite ya pasó, del más atrasado al más reciente.
+
+        Args:
+            fecha (str, optional): Fecha de referencia YYYY-MM-DD (por defecto, hoy)
+
+        Returns:
+            list: Préstamos activos vencidos a esa fecha
+        """
+        # Vence el día dia_prestamo + DIAS_PRESTAMO: la condición se expresa sobre el índice
+        dia = self._dia_referencia(fecha)
+        return self._consultar(f"SELECT {_PRESTAMO} FROM prestamos WHERE activo = 1 AND dia_prestamo < ? "
+                               f"ORDER BY dia_prestamo, rowid", (dia - DIAS_PRESTAMO,), _crear_prestamo)
+
+    @_con_conexion
+    def obtener_prestamos_por_vencer(self, dias, fecha=None):
+        """
+        Obtiene los préstamos activos que vencen dentro de los próximos días.
+
+        Args:
+            dias (int): Cantidad de días hacia adelante (0 = solo los que vencen ese día)
+            fecha (str, optional): Fecha de referencia YYYY-MM-DD (por defecto, hoy)
+
+        Returns:
+            list: Préstamos activos que vencen en el rango, ordenados por fecha límite
+        """
+        dia = self._dia_referencia(fecha) - DIAS_PRESTAMO
+        return self._consultar(f"SELECT {_PRESTAMO} FROM prestamos WHERE activo = 1 "
+                               f"AND dia_prestamo BETWEEN ? AND ? ORDER BY dia_prestamo, rowid",
+                               (dia, dia + dias), _crear_prestamo)
+
+    def _dia_referencia(self, fecha):
+        # Número de día de una fecha YYYY-MM-DD (hoy si no se indica)
+        if fecha is None:
+            return date.today().toordinal()
+        return fecha_a_dia(fecha)
+
+    @_con_conexion
+    def calcular_retrasos(self, fecha_referencia=None):
+        """
+        Calcula los días de retraso de todo el historial de préstamos en una sola pasada.
+
+        Args:
+            fecha_referencia (str, optional): Fecha YYYY-MM-DD contra la que se miden los
+                préstamos activos (si es None, solo cuentan los préstamos devueltos)
+
+        Returns:
+            dict: Retraso por préstamo ('retrasos', en el orden del historial) y totales
+        """
+        return calcular_retrasos(self.listar_todos_los_prestamos(), fecha_referencia)
+
+    @_con_conexion
+    def obtener_prestamos_activos(self):
+        """
+        Obtiene todos los préstamos que están activos (no devueltos).
+
+        Returns:
+            list: Lista de préstamos activos
+        """
+        return self._consultar(f"SELECT {_PRESTAMO} FROM prestamos WHERE activo = 1 ORDER BY rowid",
+                               (), _crear_prestamo)
+
+    @_con_conexion
+    def obtener_prestamos_activos_por_usuario(self, id_usuario):
+        """
+        Obtiene los préstamos activos de un usuario específico.
+
+        Args:
+            id_usuario (str): ID del usuario
+
+        Returns:
+            list: Lista de préstamos activos del usuario
+        """
+        return self._consultar(f"SELECT {_PRESTAMO} FROM prestamos WHERE id_usuario = ? AND activo = 1 "
+                               f"ORDER BY rowid", (id_usuario,), _crear_prestamo)
+
+    @_con_conexion
+    def obtener_prestamos_activos_por_libro(self, isbn_libro):
+        """
+        Obtiene los préstamos activos de un libro específico.
+
+        Args:
+            isbn_libro (str): ISBN del libro
+
+        Returns:
+            list: Lista de préstamos activos del libro
+        """
+        return self._consultar(f"SELECT {_PRESTAMO} FROM prestamos WHERE isbn_libro = ? AND activo = 1 "
+                               f"ORDER BY rowid", (isbn_libro,), _crear_prestamo)
+
+    @_con_conexion
+    def buscar_prestamo_por_id(self, id_prestamo):
+        """
+        Busca un préstamo (activo o finalizado) por su ID.
+
+        Args:
+            id_prestamo (str): ID del préstamo
+
+        Returns:
+            Prestamo: El préstamo encontrado o None si no existe
+        """
+        return self._uno(f"SELECT {_PRESTAMO} FROM prestamos WHERE id_prestamo = ?", (id_prestamo,),
+                         _crear_prestamo)
+
+    @_con_conexion
+    def listar_todos_los_prestamos(self):
+        """
+        Obtiene todos los préstamos del sistema (activos e inactivos).
+
+        Returns:
+            list: Lista completa de préstamos
+        """
+        return self._consultar(f"SELECT {_PRESTAMO} FROM prestamos ORDER BY rowid", (), _crear_prestamo)
+
+    # ===== MÉTODOS DE REPORTES AVANZADOS =====
+
+    @_con_conexion
+    def generar_estadisticas_por_año(self, año_inicio, año_fin):
+        """
+        Genera estadísticas de libros y préstamos para un rango de años.
+
+        Args:
+            año_inicio (int): Año inicial del rango
+            año_fin (int): Año final del rango
+
+        Returns:
+            dict: Estadísticas agregadas para el rango especificado
+        """
+        total_libros = self.conexion.execute(
+            "SELECT count(*) FROM libros WHERE año_publicacion BETWEEN ? AND ?", (año_inicio, año_fin)).fetchone()[0]
+        # Los préstamos se cuentan por el año de su fecha: rango de días sobre el índice
+        total_prestamos = 0
+        desde, hasta = max(año_inicio, date.min.year), min(año_fin, date.max.year)
+        if desde <= hasta:
+            total_prestamos = self.conexion.execute(
+                "SELECT count(*) FROM prestamos WHERE dia_prestamo BETWEEN ? AND ?",
+                (date(desde, 1, 1).toordinal(), date(hasta, 12, 31).toordinal())).fetchone()[0]
+        return {'total_libros': total_libros, 'total_prestamos': total_prestamos}
+
+    @_con_conexion
+    def obtener_libros_mas_antiguos(self, limite=5):
+        """
+        Obtiene los libros más antiguos del sistema.
+
+        Args:
+            limite (int): Número máximo de libros a retornar
+
+        Returns:
+            list: Lista de los libros más antiguos
+        """
+        return self.obtener_libros_por_antiguedad(limite)
+
+    @_con_conexion
+    def obtener_libros_mas_recientes(self, limite=5):
+        """
+        Obtiene los libros más recientes del sistema.
+
+        Args:
+            limite (int): Número máximo de libros a retornar
+
+        Returns:
+            list: Lista de los libros más recientes
+        """
+        return self.obtener_libros_por_antiguedad(limite, mas_recientes=True)
+
+    @_con_conexion
+    def obtener_libros_por_antiguedad(self, limite=5, mas_recientes=False, genero=None,
+                                      solo_disponibles=False):
+        """
+        Obtiene los libros más antiguos (o más recientes) que cumplen los filtros,
+        recorriendo el índice por año y deteniéndose al completar el límite.
+
+        Args:
+            limite (int): Número máximo de libros a retornar
+            mas_recientes (bool): Si se buscan los más recientes en lugar de los más antiguos
+            genero (str, optional): Solo libros de este género (sin distinguir mayúsculas)
+            solo_disponibles (bool): Solo libros disponibles para préstamo
+
+        Returns:
+            list: Lista de libros ordenada por año de publicación
+        """
+        # Dentro de un mismo año, en orden de ISBN (igual que IndiceAños.primeros)
+        orden = "año_publicacion DESC, isbn" if mas_recientes else "año_publicacion, isbn"
+        filtro = "WHERE disponible = 1 " if solo_disponibles else ""
+        libros = map(_crear_libro, self.conexion.execute(f"SELECT {_LIBRO} FROM libros {filtro}ORDER BY {orden}"))
+        if genero is not None:
+            # Minúsculas de Python (la función lower de SQLite solo cubre ASCII)
+            genero = genero.lower()
+            libros = (libro for libro in libros if libro.genero.lower() == genero)
+        return list(islice(libros, max(limite, 0)))
+
+    # ===== PERSISTENCIA DE DATOS =====
+
+    @_con_conexion
+    def guardar_datos(self, archivo='biblioteca_data.json', compacto=False, binario=None):
+        """
+        Exporta todos los datos a un archivo JSON o a una instantánea binaria (los mismos
+        formatos que SistemaBiblioteca). Los registros se leen de la base por flujo.
+
+        Args:
+            archivo (str): Ruta del archivo donde guardar los datos
+            compacto (bool): Si se guarda sin indentación
+            binario (bool, optional): Si se guarda en formato binario (por defecto, si la
+                ruta termina en '.bin')
+
+        Returns:
+            tuple: (éxito, mensaje) indicando si la operación fue exitosa
+        """
+        if binario is None:
+            binario = archivo.endswith('.bin')
+
+        def registros(sql, crear):
+            return map(crear, self.conexion.execute(sql))
+
+        try:
+            # Una sola transacción de lectura: las tres tablas corresponden al mismo instante
+            with self.conexion:
+                self.conexion.execute("BEGIN")
+                libros = registros(f"SELECT {_LIBRO} FROM libros ORDER BY rowid", _crear_libro)
+                usuarios = registros(f"SELECT {_USUARIO} FROM usuarios ORDER BY rowid", _crear_usuario)
+                prestamos = registros(f"SELECT {_PRESTAMO} FROM prestamos ORDER BY rowid", _crear_prestamo)
+                contador = self.contador_prestamos
+                if binario:
+                    escribir_atomico(archivo, lambda f: escribir_instantanea_binaria(
+                        f, libros, usuarios, prestamos, contador), binario=True)
+                else:
+                    escribir_atomico(archivo, lambda f: escribir_json_streaming(f, [
+                        ('libros', (libro.to_dict() for libro in libros)),
+                        ('usuarios', (usuario.to_dict() for usuario in usuarios)),
+                        ('prestamos', (prestamo.to_dict() for prestamo in prestamos)),
+                        ('contador_prestamos', contador)], compacto))
+            return True, "Datos guardados exitosamente"
+        except Exception as e:
+            return False, f"Error al guardar datos: {str(e)}"
+
+    @_con_conexion
+    def cargar_datos(self, archivo='biblioteca_data.json'):
+        """
+        Reemplaza el contenido de la base por el de un archivo JSON o una instantánea
+        binaria, en una sola transacción (si la carga falla la base queda como estaba).
+
+        Args:
+            archivo (str): Ruta del archivo desde donde cargar los datos
+
+        Returns:
+            tuple: (éxito, mensaje) indicando si la operación fue exitosa
+        """
+        try:
+            with self.conexion:
+                for tabla in ('libros', 'palabras_libros', 'usuarios', 'trigramas_usuarios', 'prestamos'):
+                    self.conexion.execute(f"DELETE FROM {tabla}")
+                if es_archivo_binario(archivo):
+                    with InstantaneaBinaria(archivo) as instantanea:
+                        self._insertar(instantanea.iterar_libros(), instantanea.iterar_usuarios(),
+                                       instantanea.iterar_prestamos())
+                        contador = instantanea.contador_prestamos
+                else:
+                    contador = self._cargar_json(archivo)
+                self.conexion.execute("UPDATE metadatos SET valor = ? WHERE clave = 'contador_prestamos'",
+                                      (contador,))
+            return True, "Datos cargados exitosamente"
+        except FileNotFoundError:
+            return False, "Archivo de datos no encontrado"
+        except Exception as e:
+            return False, f"Error al cargar datos: {str(e)}"
+
+    def _cargar_json(self, archivo):
+        # Inserta los registros de un archivo JSON en tandas a medida que se leen;
+        # retorna el contador de préstamos
+        contador = None
+        pendientes = {'libros': [], 'usuarios': [], 'prestamos': []}
+        clases = {'libros': Libro, 'usuarios': Usuario, 'prestamos': Prestamo}
+        with open(archivo, 'r', encoding='utf-8') as f:
+            for seccion, valor in leer_json_streaming(f):
+                if seccion in pendientes:
+                    tanda = pendientes[seccion]
+                    tanda.append(clases[seccion].from_dict(valor))
+                    if len(tanda) >= _TANDA:
+                        self._insertar_seccion(seccion, tanda)
+                        pendientes[seccion] = []
+                elif seccion == 'contador_prestamos':
+                    contador = valor
+        for seccion, tanda in pendientes.items():
+            self._insertar_seccion(seccion, tanda)
+        if contador is None:
+            raise KeyError('contador_prestamos')
+        return contador
+
+    def _insertar_seccion(self, seccion, registros):
+        # Inserta los registros de una sección del archivo de datos
+        self._insertar(registros if seccion == 'libros' else (),
+                       registros if seccion == 'usuarios' else (),
+                       registros if seccion == 'prestamos' else ())
+
+    # ===== AUTOGUARDADO (cada operación ya queda guardada en la base) =====
+
+    def hay_cambios_sin_guardar(self):
+        """
+        Indica si hubo operaciones que modificaron datos desde el último guardado.
+
+        Returns:
+            bool: Siempre False: cada operación se confirma en la base al ejecutarse
+        """
+        return False
+
+    def guardar_cambios(self, archivo='biblioteca_data.json', compacto=False, forzar=False):
+        """
+        Exporta los datos a un archivo solo si se fuerza: sin forzar no hay nada
+        pendiente, la base ya tiene todas las operaciones.
+
+        Args:
+            archivo (str): Ruta del archivo (instantánea binaria si termina en '.bin')
+            compacto (bool): Si el JSON se guarda sin indentación
+            forzar (bool): Si se exporta de todos modos
+
+        Returns:
+            tuple: (éxito, mensaje) indicando si la operación fue exitosa
+        """
+        if not forzar:
+            return True, "No hay cambios que guardar"
+        return self.guardar_datos(archivo, compacto)
+
+    def iniciar_autoguardado(self, archivo='biblioteca_data.json', intervalo=30.0, compacto=True):
+        # Cada operación ya es durable al retornar: no hay nada que guardar periódicamente
+        return True, "Cada operación se guarda en la base de datos"
+
+    def detener_autoguardado(self):
+        pass
+
+    def precalentar_indices(self, nombres=None, en_segundo_plano=False):
+        # Los índices de la base ya están construidos en disco
+        return True, "Índices construidos"
+
+
+# Bloque de prueba para verificar el sistema sobre SQLite
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    print("=== Prueba del sistema sobre SQLite ===")
+    ruta = os.path.join(tempfile.mkdtemp(), "biblioteca.db")
+
+    with SistemaBibliotecaSQLite(ruta) as sistema:
+        print(sistema.agregar_libro("978-0451526342", "Animal Farm", "George Orwell", 1945, "Sátira"))
+        print(sistema.registrar_prestamo("978-0451526342", "U001", "2024-01-05"))
+        print(f"Por autor 'george': {[libro.titulo for libro in sistema.buscar_libros_por_autor('george')]}")
+        print(f"Texto 'orwell farm': {[libro.titulo for libro in sistema.buscar_libros_por_texto('orwell farm')]}")
+        print(f"Usuarios 'perez': {[usuario.nombre for usuario in sistema.buscar_usuarios_por_nombre('perez')]}")
+
+    # Los datos siguen ahí al volver a abrir la base
+    with SistemaBibliotecaSQLite(ruta) as sistema:
+        print(f"Vencidos al 2024-02-01: {[str(p) for p in sistema.obtener_prestamos_vencidos('2024-02-01')]}")
+        print(f"Estadísticas 1900-2024: {sistema.generar_estadisticas_por_año(1900, 2024)}")
+        print(sistema.registrar_devolucion("P001", "2024-02-01"))
+        print(f"Disponibles: {len(sistema.listar_libros_disponibles())}")
+
+    print("=== Prueba completada ===")
@@ -0,0 +1 @@
+# Pruebas del sistema de biblioteca: python -m unittest discover tests (o python -m pytest)
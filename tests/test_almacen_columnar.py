@@ -0,0 +1,90 @@
+import gc
+import unittest
+
+from almacen_columnar import AlmacenColumnarLibros
+from libro import Libro
+from main import SistemaBiblioteca
+from tests.test_estructuras import libros_aleatorios
+
+
+def sistema_columnar(libros):
+    sistema = SistemaBiblioteca(AlmacenColumnarLibros())
+    for libro in libros:
+        sistema.agregar_libro(libro.isbn, libro.titulo, libro.autor, libro.año_publicacion, libro.genero)
+    return sistema
+
+
+class TestVistas(unittest.TestCase):
+    def setUp(self):
+        self.almacen = AlmacenColumnarLibros()
+        for libro in libros_aleatorios(200):
+            self.almacen.agregar(libro)
+
+    def test_no_retiene_las_vistas(self):
+        # Los índices guardan ISBN, así que nadie más mantiene vivas las vistas
+        libros = self.almacen.listar()
+        self.assertEqual(len(self.almacen._vistas), 200)
+        del libros
+        gc.collect()
+        self.assertEqual(len(self.almacen._vistas), 0)
+
+    def test_misma_vista_mientras_se_usa(self):
+        libro = self.almacen.buscar("000007")
+        self.assertIs(self.almacen.buscar("000007"), libro)
+        libro.disponible = False
+        self.assertFalse(self.almacen.buscar("000007").disponible)
+
+    def test_vista_en_uso_conserva_los_datos_al_eliminar(self):
+        libro = self.almacen.buscar("000007")
+        titulo = libro.titulo
+        self.assertTrue(self.almacen.eliminar("000007"))
+        self.assertTrue(self.almacen.agregar(Libro("N-1", "Reutiliza la fila", "Autor", 2000, "g")))
+        self.assertEqual((libro.isbn, libro.titulo), ("000007", titulo))
+
+
+class TestIndicesSinVistas(unittest.TestCase):
+    def setUp(self):
+        self.sistema = sistema_columnar(libros_aleatorios(300))
+
+    def test_indices_construidos_no_retienen_vistas(self):
+        self.sistema.precalentar_indices()
+        gc.collect()
+        self.assertEqual(len(self.sistema.libros._vistas), 0)
+        resultado = self.sistema.buscar_libros_por_titulo("sol", limite=5)
+        self.assertEqual(len(self.sistema.libros._vistas), len(resultado))
+
+    def test_rango_sin_indice_recorre_la_columna(self):
+        por_columna = self.sistema.buscar_libros_por_rango_años(1960, 1985)
+        self.assertIsNone(self.sistema._indice_construido('indice_años'))
+        self.sistema.precalentar_indices(('indice_años',))
+        por_indice = self.sistema.buscar_libros_por_rango_años(1960, 1985)
+        self.assertEqual([libro.isbn for libro in por_columna], [libro.isbn for libro in por_indice])
+        años = [libro.año_publicacion for libro in por_columna]
+        self.assertEqual(años, sorted(años))
+        self.assertTrue(all(1960 <= año <= 1985 for año in años))
+        self.assertEqual(len(por_columna), 
+                         sum(1960 <= libro.año_publicacion <= 1985 for libro in self.sistema.listar_libros()))
+
+    def test_busquedas_iguales_a_las_de_registros(self):
+        registros = SistemaBiblioteca()
+        for libro in libros_aleatorios(300):
+            registros.agregar_libro(libro.isbn, libro.titulo, libro.autor, libro.año_publicacion, libro.genero)
+        for sistema in (self.sistema, registros):
+            sistema.actualizar_libro("000010", {'isbn': "X-10", 'año_publicacion': 1990})
+            sistema.actualizar_libro("000011", {'titulo': "Sol nuevo"})
+            sistema.eliminar_libro("000012")
+        consultas = (
+            lambda s: s.buscar_libros_por_titulo("sol"),
+            lambda s: s.buscar_libros_por_autor("eva", limite=7),
+            lambda s: s.buscar_libros_por_texto("mar noche"),
+            lambda s: s.buscar_libros_por_rango_años(1985, 1995),
+            lambda s: list(s.iterar_libros_por_rango_años(1950, 1960)),
+            lambda s: s.obtener_libros_por_antiguedad(5, mas_recientes=True, genero="novela"),
+        )
+        for consulta in consultas:
+            self.assertEqual([libro.isbn for libro in consulta(self.sistema)],
+                             [libro.isbn for libro in consulta(registros)])
+
+
+if __name__ == '__main__':
+    unittest.main()
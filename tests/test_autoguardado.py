@@ -0,0 +1,104 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import main
+from main import SistemaBiblioteca
+
+
+def esperar(condicion, tiempo=5.0):
+    # Espera a que se cumpla una condición que depende de otro hilo
+    limite = time.monotonic() + tiempo
+    while not condicion():
+        if time.monotonic() > limite:
+            raise AssertionError("La condición no se cumplió a tiempo")
+        time.sleep(0.01)
+
+
+class TestGuardarCambios(unittest.TestCase):
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp()
+        self.archivo = os.path.join(self.directorio, 'datos.json')
+        self.sistema = SistemaBiblioteca()
+        # Cuenta las escrituras reales sin cambiar lo que hacen
+        parche = mock.patch.object(main, 'escribir_atomico', wraps=main.escribir_atomico)
+        self.escrituras = parche.start()
+        self.addCleanup(parche.stop)
+
+    def tearDown(self):
+        self.sistema.detener_autoguardado()
+        shutil.rmtree(self.directorio)
+
+    def test_sin_cambios_no_escribe(self):
+        self.assertFalse(self.sistema.hay_cambios_sin_guardar())
+        self.assertEqual(self.sistema.guardar_cambios(self.archivo), (True, "No hay cambios que guardar"))
+        self.assertFalse(os.path.exists(self.archivo))
+        self.assertEqual(self.escrituras.call_count, 0)
+
+    def test_guarda_una_sola_vez_por_cambio(self):
+        self.assertTrue(self.sistema.agregar_usuario("U9", "Nuevo", "n@email.com")[0])
+        self.assertTrue(self.sistema.hay_cambios_sin_guardar())
+        self.assertEqual(self.sistema.guardar_cambios(self.archivo), (True, "Datos guardados exitosamente"))
+        self.assertFalse(self.sistema.hay_cambios_sin_guardar())
+        modificado = os.stat(self.archivo).st_mtime_ns
+        self.assertEqual(self.sistema.guardar_cambios(self.archivo), (True, "No hay cambios que guardar"))
+        self.assertEqual(os.stat(self.archivo).st_mtime_ns, modificado)
+        self.assertEqual(self.escrituras.call_count, 1)
+        # Forzado se escribe aunque no haya cambios
+        self.assertEqual(self.sistema.guardar_cambios(self.archivo, forzar=True)[1], "Datos guardados exitosamente")
+        self.assertEqual(self.escrituras.call_count, 2)
+
+    def test_operacion_fallida_no_es_un_cambio(self):
+        self.assertFalse(self.sistema.agregar_usuario("U001", "Repetido", "r@email.com")[0])
+        self.assertFalse(self.sistema.eliminar_libro("no existe")[0])
+        self.assertFalse(self.sistema.hay_cambios_sin_guardar())
+
+    def test_guardar_datos_cuenta_como_guardado(self):
+        self.sistema.agregar_usuario("U9", "Nuevo", "n@email.com")
+        self.assertTrue(self.sistema.guardar_datos(self.archivo)[0])
+        self.assertEqual(self.sistema.guardar_cambios(self.archivo)[1], "No hay cambios que guardar")
+
+    def test_error_al_escribir_deja_los_cambios_pendientes(self):
+        self.sistema.agregar_usuario("U9", "Nuevo", "n@email.com")
+        self.escrituras.side_effect = OSError("disco lleno")
+        exito, mensaje = self.sistema.guardar_cambios(self.archivo)
+        self.assertFalse(exito)
+        self.assertIn("disco lleno", mensaje)
+        self.assertTrue(self.sistema.hay_cambios_sin_guardar())
+        self.escrituras.side_effect = None
+        self.assertEqual(self.sistema.guardar_cambios(self.archivo)[1], "Datos guardados exitosamente")
+
+    def test_autoguardado_solo_escribe_despues_de_un_cambio(self):
+        self.assertTrue(self.sistema.iniciar_autoguardado(self.archivo, intervalo=0.01)[0])
+        self.assertFalse(self.sistema.iniciar_autoguardado(self.archivo, intervalo=0.01)[0])
+        esperar(lambda: self.sistema.resultado_autoguardado is not None)
+        time.sleep(0.1)
+        self.assertEqual(self.sistema.resultado_autoguardado, (True, "No hay cambios que guardar"))
+        self.assertEqual(self.escrituras.call_count, 0)
+
+        self.sistema.agregar_libro("A-1", "Autoguardado", "Autor", 2020, "g")
+        esperar(lambda: not self.sistema.hay_cambios_sin_guardar())
+        time.sleep(0.1)  # Varios intervalos más sin cambios
+        self.assertEqual(self.escrituras.call_count, 1)
+        self.sistema.detener_autoguardado()
+
+        cargado = SistemaBiblioteca()
+        self.assertTrue(cargado.cargar_datos(self.archivo)[0])
+        self.assertEqual(cargado.buscar_libro_por_isbn("A-1").titulo, "Autoguardado")
+
+    def test_detener_espera_al_hilo(self):
+        self.sistema.iniciar_autoguardado(self.archivo, intervalo=0.01)
+        hilo = self.sistema._autoguardado
+        self.sistema.detener_autoguardado()
+        self.assertFalse(hilo.is_alive())
+        self.sistema.agregar_usuario("U9", "Nuevo", "n@email.com")
+        time.sleep(0.05)
+        self.assertEqual(self.escrituras.call_count, 0)
+        self.assertTrue(self.sistema.iniciar_autoguardado(self.archivo, intervalo=0.01)[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
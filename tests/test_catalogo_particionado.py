@@ -0,0 +1,140 @@
+import unittest
+
+from catalogo_particionado import CatalogoParticionado, particion_de
+from main import SistemaBiblioteca
+
+
+def isbn_en(particion, particiones, prefijo='T'):
+    # Primer ISBN de prueba que le corresponde a una partición
+    i = 0
+    while particion_de(f"{prefijo}-{i}", particiones) != particion:
+        i += 1
+    return f"{prefijo}-{i}"
+
+
+class _FallaAlRecibir:
+    # Conexión que falla al recibir la próxima respuesta (la deja sin leer)
+    def __init__(self, conexion):
+        self.conexion = conexion
+        self.closed = False
+
+    def send_bytes(self, mensaje):
+        self.conexion.send_bytes(mensaje)
+
+    def recv(self):
+        raise OSError("falla simulada")
+
+    def close(self):
+        self.closed = True
+        self.conexion.close()
+
+
+class TestFallaDeParticion(unittest.TestCase):
+    def setUp(self):
+        self.sistema = SistemaBiblioteca()
+        exito, mensaje = self.sistema.particionar_catalogo(2)
+        self.assertTrue(exito, mensaje)
+        self.catalogo = self.sistema.catalogo_particionado
+
+    def tearDown(self):
+        self.sistema.cerrar_particiones()
+
+    def matar(self, particion):
+        self.catalogo._procesos[particion].terminate()
+        self.catalogo._procesos[particion].join()
+
+    def test_agregar_falla_sin_modificar_el_sistema(self):
+        self.matar(0)
+        isbn = isbn_en(0, 2)
+        exito, mensaje = self.sistema.agregar_libro(isbn, "Título", "Autor", 2000, "g")
+        self.assertFalse(exito)
+        self.assertIn("catálogo particionado", mensaje)
+        self.assertIsNone(self.sistema.buscar_libro_por_isbn(isbn))
+        self.assertFalse(self.sistema.hay_cambios_sin_guardar())
+        # La otra partición sigue atendiendo
+        otro = isbn_en(1, 2)
+        self.assertTrue(self.sistema.agregar_libro(otro, "Otro", "Autor", 2000, "g")[0])
+        self.assertEqual(self.catalogo.buscar_isbn(otro)[0], otro)
+
+    def test_actualizar_y_eliminar_fallan_sin_modificar_el_sistema(self):
+        isbn = isbn_en(0, 2)
+        self.assertTrue(self.sistema.agregar_libro(isbn, "Título", "Autor", 2000, "g")[0])
+        self.matar(0)
+        exito, _ = self.sistema.actualizar_libro(isbn, {'titulo': 'Nuevo', 'año_publicacion': 1990})
+        self.assertFalse(exito)
+        libro = self.sistema.buscar_libro_por_isbn(isbn)
+        self.assertEqual((libro.titulo, libro.año_publicacion), ("Título", 2000))
+        self.assertFalse(self.sistema.eliminar_libro(isbn)[0])
+        self.assertIsNotNone(self.sistema.buscar_libro_por_isbn(isbn))
+
+    def test_cambio_de_isbn_vuelve_a_la_particion_de_origen(self):
+        isbn = isbn_en(1, 2)
+        self.assertTrue(self.sistema.agregar_libro(isbn, "Título", "Autor", 2000, "g")[0])
+        self.matar(0)
+        exito, _ = self.sistema.actualizar_libro(isbn, {'isbn': isbn_en(0, 2, 'N')})
+        self.assertFalse(exito)
+        self.assertEqual(self.catalogo.buscar_isbn(isbn), (isbn, "Título", "Autor", 2000))
+        self.assertIsNotNone(self.sistema.buscar_libro_por_isbn(isbn))
+
+    def test_difusion_descarta_respuestas_pendientes(self):
+        cantidad = self.catalogo.contar()
+        self.catalogo._conexiones[0] = _FallaAlRecibir(self.catalogo._conexiones[0])
+        with self.assertRaises(OSError):
+            self.catalogo.buscar_prefijo('titulo', '')
+        # La partición 1 no quedó con una respuesta vieja: responde a lo que se le pide
+        self.assertEqual(self.catalogo._pedir(1, 'contar'), self.catalogo._pedir(1, 'contar'))
+        self.assertEqual(self.catalogo._pedir(1, 'buscar_isbn', 'inexistente'), None)
+        # La partición que falló queda cerrada y se informa
+        with self.assertRaises(RuntimeError):
+            self.catalogo.contar()
+        self.assertGreater(cantidad, 0)
+
+    def test_error_dentro_de_la_particion(self):
+        with self.assertRaises(RuntimeError):
+            self.catalogo.buscar_prefijo('inexistente', 'a')
+        # Todas respondieron: las conexiones siguen en orden
+        self.assertEqual(self.catalogo.contar(), len(self.sistema.libros))
+
+
+class TestCatalogoParticionado(unittest.TestCase):
+    def test_busquedas_iguales_a_las_locales(self):
+        sistema = SistemaBiblioteca()
+        for i in range(200):
+            sistema.agregar_libro(f"B-{i}", f"Libro {i % 17}", f"Autor {i % 5}", 1950 + i % 40, "g")
+        titulos = sistema.buscar_libros_por_titulo("libro 1", limite=10)
+        años = sistema.buscar_libros_por_rango_años(1960, 1970)
+        with CatalogoParticionado(3) as catalogo:
+            sistema.catalogo_particionado = catalogo
+            catalogo.cargar(sistema.libros)
+            self.assertEqual(sistema.buscar_libros_por_titulo("libro 1", limite=10), titulos)
+            self.assertEqual(sorted(libro.isbn for libro in sistema.buscar_libros_por_rango_años(1960, 1970)),
+                             sorted(libro.isbn for libro in años))
+            sistema.catalogo_particionado = None
+
+    def test_paginas_por_cursor_iguales_a_las_locales(self):
+        sistema = SistemaBiblioteca()
+        for i in range(120):
+            sistema.agregar_libro(f"B-{i}", f"Libro {i % 9}", f"Autor {i % 4}", 2000, "g")
+
+        def paginar(buscar, prefijo, indice):
+            paginas, cursor = [], None
+            while True:
+                pagina = buscar(prefijo, limite=8, cursor=cursor)
+                if not pagina:
+                    return paginas
+                paginas.extend(libro.isbn for libro in pagina)
+                cursor = sistema.cursor_libro(pagina[-1], indice)
+
+        locales = [paginar(sistema.buscar_libros_por_titulo, "libro", 'titulo'),
+                   paginar(sistema.buscar_libros_por_autor, "autor 2", 'autor')]
+        self.assertEqual(locales[0], [libro.isbn for libro in sistema.buscar_libros_por_titulo("libro")])
+        with CatalogoParticionado(3) as catalogo:
+            sistema.catalogo_particionado = catalogo
+            catalogo.cargar(sistema.libros)
+            self.assertEqual([paginar(sistema.buscar_libros_por_titulo, "libro", 'titulo'),
+                              paginar(sistema.buscar_libros_por_autor, "autor 2", 'autor')], locales)
+            sistema.catalogo_particionado = None
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import os
+import tempfile
+import unittest
+
+from almacen_columnar import AlmacenColumnarLibros
+from estructuras import AlmacenRegistros
+from libro import Libro
+from main import SistemaBiblioteca
+from tests.test_formato_binario import estado
+
+
+def sistemas():
+    # El mismo sistema de ejemplo sobre cada tipo de almacén de libros
+    yield 'registros', SistemaBiblioteca()
+    yield 'columnar', SistemaBiblioteca(AlmacenColumnarLibros())
+    with tempfile.TemporaryDirectory() as directorio:
+        archivo = os.path.join(directorio, 'datos.bin')
+        SistemaBiblioteca().guardar_datos(archivo)
+        sistema = SistemaBiblioteca()
+        sistema.cargar_datos(archivo)
+        yield 'instantánea', sistema
+
+
+def consultas(sistema):
+    # Resultados de las búsquedas que usan los índices perezosos
+    return {
+        'titulo': [libro.isbn for libro in sistema.buscar_libros_por_titulo('')],
+        'autor': [libro.isbn for libro in sistema.buscar_libros_por_autor('')],
+        'años': [libro.isbn for libro in sistema.buscar_libros_por_rango_años(0, 3000)],
+        'texto': [libro.isbn for libro in sistema.buscar_libros_por_texto('mockingbird')],
+        'nombres': [usuario.id_usuario for usuario in sistema.buscar_usuarios_por_nombre('a')],
+        'activos U002': [p.id_prestamo for p in sistema.obtener_prestamos_activos_por_usuario('U002')],
+    }
+
+
+class TestClavesDuplicadas(unittest.TestCase):
+    def test_isbn_de_otro_libro(self):
+        for nombre, sistema in sistemas():
+            with self.subTest(nombre):
+                consultas(sistema)  # Con los índices ya construidos
+                antes = estado(sistema), consultas(sistema)
+                version = sistema.version_datos
+                exito, mensaje = sistema.actualizar_libro('978-0142437230',
+                                                          {'isbn': '978-0061120084', 'titulo': 'Otro'})
+                self.assertEqual((exito, mensaje), (False, "Ya existe un libro con este ISBN"))
+                self.assertEqual((estado(sistema), consultas(sistema)), antes)
+                self.assertEqual(sistema.version_datos, version)  # No cuenta como modificación
+                # Un ISBN libre se sigue aceptando
+                self.assertTrue(sistema.actualizar_libro('978-0142437230', {'isbn': 'N-1'})[0])
+                self.assertEqual(sistema.buscar_libro_por_isbn('N-1').titulo, "1984")
+
+    def test_id_de_otro_usuario(self):
+        for nombre, sistema in sistemas():
+            with self.subTest(nombre):
+                sistema.registrar_prestamo('978-0061120084', 'U002', '2024-01-10')
+                consultas(sistema)
+                antes = estado(sistema), consultas(sistema)
+                exito, mensaje = sistema.actualizar_usuario('U001', {'id_usuario': 'U002', 'nombre': 'X'})
+                self.assertEqual((exito, mensaje), (False, "Ya existe un usuario con este ID"))
+                self.assertEqual((estado(sistema), consultas(sistema)), antes)
+                self.assertEqual(sistema.buscar_usuario_por_id('U001').nombre, "Juan Pérez")
+                self.assertTrue(sistema.actualizar_usuario('U001', {'id_usuario': 'U009'})[0])
+                self.assertEqual(len(sistema.listar_usuarios()), 4)
+
+    def test_almacenes_rechazan_clave_ocupada(self):
+        for nombre, sistema in sistemas():
+            with self.subTest(nombre):
+                almacen = sistema.libros
+                self.assertFalse(almacen.actualizar('978-0142437230', {'isbn': '978-0061120084'}))
+                self.assertEqual(almacen.buscar('978-0142437230').isbn, '978-0142437230')
+                libro = almacen.buscar('978-0142437230')
+                libro.isbn = '978-0061120084'
+                self.assertFalse(almacen.reubicar('978-0142437230', libro))
+                libro.isbn = '978-0142437230'
+                self.assertEqual(len(almacen), 5)
+                self.assertEqual(almacen.buscar('978-0061120084').titulo, "To Kill a Mockingbird")
+
+    def test_reubicar_en_almacen_de_registros(self):
+        almacen = AlmacenRegistros('isbn')
+        primero, segundo = Libro('A', 't', 'a', 2000, 'g'), Libro('B', 't', 'a', 2000, 'g')
+        almacen.agregar(primero)
+        almacen.agregar(segundo)
+        primero.isbn = 'B'
+        self.assertFalse(almacen.reubicar('A', primero))
+        self.assertIs(almacen.buscar('A'), primero)
+        self.assertIs(almacen.buscar('B'), segundo)
+        primero.isbn = 'C'
+        self.assertTrue(almacen.reubicar('A', primero))
+        self.assertEqual([libro.isbn for libro in almacen], ['B', 'C'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+import threading
+import time
+import unittest
+
+from concurrencia import CerrojoLecturaEscritura
+from main import SistemaBiblioteca
+
+
+class TestCerrojoLecturaEscritura(unittest.TestCase):
+    def setUp(self):
+        self.cerrojo = CerrojoLecturaEscritura()
+
+    def test_lectores_simultaneos(self):
+        dentro = threading.Barrier(3, timeout=5)
+
+        def lector():
+            with self.cerrojo.lectura():
+                dentro.wait()  # Solo pasa si los tres leen a la vez
+
+        hilos = [threading.Thread(target=lector) for _ in range(3)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join(5)
+        self.assertFalse(dentro.broken)
+
+    def test_escritor_excluye_lectores(self):
+        eventos = []
+        leyendo = threading.Event()
+
+        def escritor():
+            leyendo.wait(5)
+            with self.cerrojo.escritura():
+                eventos.append('escribe')
+
+        hilo = threading.Thread(target=escritor)
+        hilo.start()
+        with self.cerrojo.lectura():
+            leyendo.set()
+            time.sleep(0.1)
+            eventos.append('termina de leer')
+        hilo.join(5)
+        self.assertEqual(eventos, ['termina de leer', 'escribe'])
+
+    def test_escritor_tiene_preferencia(self):
+        eventos = []
+        escritor_esperando = threading.Event()
+
+        def escritor():
+            escritor_esperando.set()
+            with self.cerrojo.escritura():
+                eventos.append('escritor')
+
+        def lector_nuevo():
+            with self.cerrojo.lectura():
+                eventos.append('lector nuevo')
+
+        with self.cerrojo.lectura():
+            hilo_escritor = threading.Thread(target=escritor)
+            hilo_escritor.start()
+            escritor_esperando.wait(5)
+            while not self.cerrojo._escritores_esperando:
+                time.sleep(0.01)
+            hilo_lector = threading.Thread(target=lector_nuevo)
+            hilo_lector.start()
+            time.sleep(0.1)
+            self.assertEqual(eventos, [])  # El lector nuevo espera detrás del escritor
+        hilo_escritor.join(5)
+        hilo_lector.join(5)
+        self.assertEqual(eventos, ['escritor', 'lector nuevo'])
+
+    def test_reentrante(self):
+        with self.cerrojo.escritura():
+            with self.cerrojo.escritura():
+                with self.cerrojo.lectura():
+                    pass
+        with self.cerrojo.lectura():
+            with self.cerrojo.lectura():
+                pass
+        # Quedó libre: otro hilo puede escribir
+        def escritor():
+            with self.cerrojo.escritura():
+                pass
+
+        hilo = threading.Thread(target=escritor)
+        hilo.start()
+        hilo.join(5)
+        self.assertFalse(hilo.is_alive())
+
+    def test_lectura_no_pasa_a_escritura(self):
+        with self.cerrojo.lectura():
+            with self.assertRaises(RuntimeError):
+                self.cerrojo.adquirir_escritura()
+
+    def test_liberar_sin_tener(self):
+        with self.assertRaises(RuntimeError):
+            self.cerrojo.liberar_lectura()
+        with self.assertRaises(RuntimeError):
+            self.cerrojo.liberar_escritura()
+
+
+class TestSistemaConcurrente(unittest.TestCase):
+    def test_rango_de_años_mientras_se_escribe(self):
+        sistema = SistemaBiblioteca()
+        for i in range(2000):
+            sistema.agregar_libro(f"R-{i}", f"Libro {i}", "Autor", 1900 + i % 100, "g")
+        errores = []
+
+        def escritor():
+            try:
+                for i in range(2000):
+                    sistema.agregar_libro(f"N-{i}", f"Nuevo {i}", "Autor", 1900 + i % 100, "g")
+                    sistema.eliminar_libro(f"R-{i}")
+            except Exception as error:
+                errores.append(error)
+
+        hilo = threading.Thread(target=escritor)
+        hilo.start()
+        try:
+            while hilo.is_alive():
+                años = [libro.año_publicacion for libro in sistema.iterar_libros_por_rango_años(1900, 1999)]
+                self.assertEqual(años, sorted(años))
+        finally:
+            hilo.join()
+        self.assertEqual(errores, [])
+        self.assertEqual(len(list(sistema.iterar_libros_por_rango_años(1900, 1999))),
+                         len(sistema.buscar_libros_por_rango_años(1900, 1999)))
+
+    def test_recorrido_no_retiene_el_cerrojo(self):
+        sistema = SistemaBiblioteca()
+        libros = sistema.iterar_libros_por_rango_años(0, 3000)
+        next(libros)
+        # Con el recorrido a medias, el mismo hilo todavía puede escribir
+        exito, mensaje = sistema.agregar_libro("X-1", "Otro", "Autor", 2000, "g")
+        self.assertTrue(exito, mensaje)
+        list(libros)
+
+    def test_listar_prestamos_es_una_copia(self):
+        sistema = SistemaBiblioteca()
+        sistema.registrar_prestamo("978-0142437230", "U001", "2023-01-05")
+        prestamos = sistema.listar_todos_los_prestamos()
+        prestamos.clear()
+        self.assertEqual(len(sistema.listar_todos_los_prestamos()), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,162 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import main
+from diario import DiarioOperaciones, leer_diario
+from main import SistemaBiblioteca
+from tests.test_formato_binario import estado
+
+
+def operar(sistema, desde=0):
+    # Mezcla de operaciones que se registran en el diario (y una que falla y no se registra)
+    for i in range(desde, desde + 5):
+        assert sistema.agregar_libro(f"D-{i}", f"Diario {i}", "Autor", 2000 + i, "g")[0]
+    assert not sistema.agregar_libro(f"D-{desde}", "Repetido", "Autor", 2000, "g")[0]
+    assert sistema.agregar_usuario(f"Z{desde}", "Lectora", "z@email.com")[0]
+    assert sistema.registrar_prestamo(f"D-{desde}", f"Z{desde}", "2024-02-01")[0]
+    assert sistema.actualizar_libro(f"D-{desde + 1}", {'titulo': 'Cambiado'})[0]
+    assert sistema.eliminar_libro(f"D-{desde + 2}")[0]
+
+
+class TestDiario(unittest.TestCase):
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp()
+        self.archivo = os.path.join(self.directorio, 'datos.json')
+        self.abiertos = []
+
+    def tearDown(self):
+        for sistema in self.abiertos:
+            sistema.cerrar_diario()
+        shutil.rmtree(self.directorio)
+
+    def abrir(self, archivo=None, **opciones):
+        sistema = SistemaBiblioteca()
+        exito, mensaje = sistema.abrir_diario(archivo or self.archivo, **opciones)
+        self.assertTrue(exito, mensaje)
+        self.abiertos.append(sistema)
+        return sistema, mensaje
+
+    def caer(self, sistema):
+        # Simula una caída: el proceso muere sin cerrar el diario ni guardar
+        sistema.diario._archivo.close()
+        self.abiertos.remove(sistema)
+
+    def archivos(self):
+        return sorted(os.listdir(self.directorio))
+
+    def test_recupera_operaciones_tras_una_caida(self):
+        for archivo in (self.archivo, os.path.join(self.directorio, 'datos.bin')):
+            sistema, _ = self.abrir(archivo)
+            operar(sistema)
+            antes = estado(sistema)
+            self.caer(sistema)
+            recuperado, mensaje = self.abrir(archivo)
+            self.assertIn("(9 operaciones recuperadas)", mensaje)
+            self.assertEqual(estado(recuperado), antes)
+            # Al abrir se compacta: el diario queda vacío y una nueva caída no recupera nada
+            self.assertEqual(list(leer_diario(archivo + '.diario')), [])
+            self.caer(recuperado)
+            self.assertIn("(0 operaciones", self.abrir(archivo)[1])
+
+    def test_descarta_la_ultima_linea_incompleta(self):
+        sistema, _ = self.abrir()
+        operar(sistema)
+        antes = estado(sistema)
+        sistema.diario._archivo.write('{"n":99,"op":"agregar_li')
+        self.caer(sistema)
+        recuperado, _ = self.abrir()
+        self.assertEqual(estado(recuperado), antes)
+        # La siguiente operación no queda pegada a la línea descartada
+        self.assertTrue(recuperado.agregar_usuario("Z9", "Otro", "o@email.com")[0])
+        self.assertEqual([entrada['op'] for entrada in leer_diario(self.archivo + '.diario')],
+                         ['agregar_usuario'])
+
+    def test_compacta_al_llegar_al_umbral(self):
+        sistema, _ = self.abrir(umbral_compactacion=4)
+        operar(sistema)
+        sistema._compactacion.join()
+        # Solo quedan en el diario las operaciones posteriores a la última compactación
+        self.assertEqual(len(list(leer_diario(self.archivo + '.diario'))), 1)
+        self.assertEqual(self.archivos(), ['datos.json', 'datos.json.diario'])
+        antes = estado(sistema)
+        self.caer(sistema)
+        recuperado, mensaje = self.abrir()
+        self.assertIn("(1 operaciones recuperadas)", mensaje)
+        self.assertEqual(estado(recuperado), antes)
+
+    def test_compactacion_no_espera_a_la_instantanea(self):
+        # La instantánea se arma en otro hilo desde la anterior más los diarios rotados:
+        # mientras tanto se puede seguir modificando el sistema
+        for archivo in (self.archivo, os.path.join(self.directorio, 'datos.bin')):
+            sistema, _ = self.abrir(archivo, umbral_compactacion=10 ** 9)
+            operar(sistema)
+            compactado = estado(sistema)
+            continuar = threading.Event()
+            reconstruir = SistemaBiblioteca._reconstruir_instantanea
+            def esperar_y_reconstruir(*args):
+                self.assertTrue(continuar.wait(5))
+                return reconstruir(*args)
+            with mock.patch.object(SistemaBiblioteca, '_reconstruir_instantanea', side_effect=esperar_y_reconstruir), \
+                    mock.patch.object(sistema, '_secciones_datos', side_effect=AssertionError("copia del estado")):
+                self.assertEqual(sistema.compactar_diario(), (True, "Compactación iniciada"))
+                operar(sistema, desde=10)
+                continuar.set()
+                sistema._compactacion.join()
+            antes = estado(sistema)
+            # La instantánea tiene el estado del momento en que se rotó el diario
+            cargado = SistemaBiblioteca()
+            self.assertTrue(cargado.cargar_datos(archivo)[0])
+            self.assertEqual(estado(cargado), compactado)
+            self.assertEqual(len(list(leer_diario(archivo + '.diario'))), 9)
+            self.caer(sistema)
+            recuperado, mensaje = self.abrir(archivo)
+            self.assertIn("(9 operaciones recuperadas)", mensaje)
+            self.assertEqual(estado(recuperado), antes)
+
+    def test_compactacion_fallida_conserva_el_diario_rotado(self):
+        sistema, _ = self.abrir(umbral_compactacion=10 ** 9)
+        operar(sistema)
+        with mock.patch.object(main, 'escribir_atomico', side_effect=OSError("disco lleno")):
+            exito, _ = sistema.compactar_diario(en_segundo_plano=False)
+        self.assertFalse(exito)
+        self.assertEqual(self.archivos(), ['datos.json', 'datos.json.diario', 'datos.json.diario.9'])
+        operar(sistema, desde=10)
+        antes = estado(sistema)
+        self.caer(sistema)
+        # Se reaplican el diario rotado y luego el actual; la compactación al abrir los borra
+        recuperado, mensaje = self.abrir()
+        self.assertIn("(18 operaciones recuperadas)", mensaje)
+        self.assertEqual(estado(recuperado), antes)
+        self.assertEqual(self.archivos(), ['datos.json', 'datos.json.diario'])
+
+    def test_guardar_datos_no_duplica_operaciones(self):
+        # Lo que ya está en el archivo guardado no se reaplica al recuperar
+        sistema, _ = self.abrir()
+        operar(sistema)
+        self.assertTrue(sistema.guardar_datos(self.archivo)[0])
+        operar(sistema, desde=10)
+        antes = estado(sistema)
+        self.caer(sistema)
+        recuperado, mensaje = self.abrir()
+        self.assertIn("(9 operaciones recuperadas)", mensaje)
+        self.assertEqual(estado(recuperado), antes)
+
+    def test_operacion_desconocida(self):
+        diario = DiarioOperaciones(self.archivo + '.diario')
+        diario.registrar('borrar_todo')
+        diario.cerrar()
+        exito, mensaje = SistemaBiblioteca().abrir_diario(self.archivo)
+        self.assertFalse(exito)
+        self.assertIn("borrar_todo", mensaje)
+
+    def test_politica_desconocida(self):
+        with self.assertRaises(ValueError):
+            DiarioOperaciones(self.archivo + '.diario', sincronizar='a veces')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,188 @@
+import random
+import unittest
+
+from estructuras import ArbolAVLLibros, IndiceInvertido
+from libro import Libro
+
+
+def libros_aleatorios(cantidad, semilla=1):
+    aleatorio = random.Random(semilla)
+    palabras = ['sol', 'luna', 'mar', 'río', 'Río', 'noche', 'día', 'canción']
+    return [Libro(f"{i:06d}", ' '.join(aleatorio.choices(palabras, k=3)),
+                  aleatorio.choice(['Ana Sol', 'Luis Mar', 'Eva']), 1950 + i % 70,
+                  aleatorio.choice(['novela', 'poesía del mar']))
+            for i in range(cantidad)]
+
+
+def verificar_avl(prueba, nodo):
+    # Comprueba alturas y balance de cada nodo; retorna la altura del subárbol
+    if nodo is None:
+        return 0
+    izquierda = verificar_avl(prueba, nodo.izquierda)
+    derecha = verificar_avl(prueba, nodo.derecha)
+    prueba.assertEqual(nodo.altura, 1 + max(izquierda, derecha))
+    prueba.assertLessEqual(abs(izquierda - derecha), 1)
+    return nodo.altura
+
+
+def en_orden(arbol):
+    return [(nodo.clave, nodo.isbn) for nodo in arbol.recorrer_desde('')]
+
+
+def esperado(arbol, libros):
+    return sorted((arbol.obtener_clave(libro), libro.isbn) for libro in libros)
+
+
+class TestArbolAVL(unittest.TestCase):
+    def setUp(self):
+        self.libros = libros_aleatorios(300)
+        self.aleatorio = random.Random(7)
+
+    def test_eliminar_mantiene_balance_y_orden(self):
+        for tipo_clave in ('isbn', 'titulo', 'autor'):
+            arbol = ArbolAVLLibros(tipo_clave)
+            for libro in self.libros:
+                arbol.insertar(libro)
+            restantes = list(self.libros)
+            self.aleatorio.shuffle(restantes)
+            while restantes:
+                libro = restantes.pop()
+                self.assertTrue(arbol.eliminar(arbol.obtener_clave(libro), libro))
+                self.assertFalse(arbol.eliminar(arbol.obtener_clave(libro), libro))
+                if len(restantes) % 25 == 0:
+                    verificar_avl(self, arbol.raiz)
+                    self.assertEqual(en_orden(arbol), esperado(arbol, restantes))
+            self.assertIsNone(arbol.raiz)
+
+    def test_eliminar_con_claves_repetidas(self):
+        # Muchos libros con el mismo autor: se elimina exactamente el del ISBN pedido
+        arbol = ArbolAVLLibros('autor')
+        arbol.construir(self.libros)
+        for libro in self.libros[::2]:
+            self.assertTrue(arbol.eliminar(arbol.obtener_clave(libro), libro))
+        verificar_avl(self, arbol.raiz)
+        self.assertEqual(en_orden(arbol), esperado(arbol, self.libros[1::2]))
+
+    def test_reindexar(self):
+        arbol = ArbolAVLLibros('titulo')
+        arbol.construir(self.libros)
+        for libro in self.aleatorio.sample(self.libros, 100):
+            anterior = arbol.obtener_clave(libro)
+            libro.titulo = f"Nuevo {self.aleatorio.random()}"
+            self.assertTrue(arbol.reindexar(anterior, libro))
+        verificar_avl(self, arbol.raiz)
+        self.assertEqual(en_orden(arbol), esperado(arbol, self.libros))
+
+    def test_cambio_de_isbn(self):
+        # Los nodos guardan el ISBN: el libro ya modificado se mueve con el ISBN anterior
+        for tipo_clave in ('isbn', 'autor'):
+            libros = libros_aleatorios(300)
+            arbol = ArbolAVLLibros(tipo_clave)
+            arbol.construir(libros)
+            for i, libro in enumerate(libros[::7]):
+                anterior = arbol.obtener_clave(libro), libro.isbn
+                libro.isbn = f"9{i:05d}"
+                self.assertTrue(arbol.reindexar(anterior[0], libro, anterior[1]))
+            verificar_avl(self, arbol.raiz)
+            self.assertEqual(en_orden(arbol), esperado(arbol, libros))
+            if tipo_clave == 'isbn':
+                self.assertIsNone(arbol.buscar("000007"))
+                self.assertEqual(arbol.buscar("900001"), "900001")
+
+    def test_construir_igual_que_insertar(self):
+        insertado = ArbolAVLLibros('titulo')
+        for libro in self.libros:
+            insertado.insertar(libro)
+        construido = ArbolAVLLibros('titulo')
+        construido.construir(self.libros)
+        verificar_avl(self, insertado.raiz)
+        verificar_avl(self, construido.raiz)
+        self.assertEqual(en_orden(insertado), en_orden(construido))
+
+    def test_insercion_ordenada_sin_limite_de_profundidad(self):
+        # Claves crecientes: el peor caso de rotaciones, sin recursión
+        arbol = ArbolAVLLibros('isbn')
+        cantidad = 20000
+        for i in range(cantidad):
+            arbol.insertar(Libro(f"{i:08d}", "t", "a", 2000, "g"))
+        self.assertLessEqual(verificar_avl(self, arbol.raiz), 1.45 * cantidad.bit_length())
+        self.assertEqual(arbol.buscar(f"{cantidad - 1:08d}"), f"{cantidad - 1:08d}")
+
+
+class TestBuscarPrefijo(unittest.TestCase):
+    def setUp(self):
+        self.libros = libros_aleatorios(300)
+        self.arboles = {tipo_clave: ArbolAVLLibros(tipo_clave) for tipo_clave in ('titulo', 'autor')}
+        self.por_isbn = {libro.isbn: libro for libro in self.libros}
+        for arbol in self.arboles.values():
+            arbol.construir(self.libros)
+
+    def todos(self, arbol, prefijo):
+        # Resultado de referencia: filtrar y ordenar la colección completa
+        prefijo = prefijo.lower()
+        return [libro.isbn for libro in sorted(self.libros, key=lambda libro: (arbol.obtener_clave(libro), libro.isbn))
+                if arbol.obtener_clave(libro).startswith(prefijo)]
+
+    def test_sin_limite_igual_a_filtrar(self):
+        for arbol in self.arboles.values():
+            for prefijo in ('', 's', 'sol', 'Luna m', 'r', 'Ana', 'eva', 'x', 'río río'):
+                self.assertEqual(arbol.buscar_prefijo(prefijo), self.todos(arbol, prefijo), prefijo)
+
+    def test_limite_y_desplazamiento(self):
+        arbol = self.arboles['titulo']
+        todos = self.todos(arbol, 'mar')
+        self.assertTrue(todos)
+        for limite in (0, 1, 5, len(todos) + 1):
+            for desplazamiento in (0, 3, len(todos) - 1, len(todos) + 2):
+                self.assertEqual(arbol.buscar_prefijo('mar', limite, desplazamiento),
+                                 todos[desplazamiento:desplazamiento + limite], (limite, desplazamiento))
+
+    def test_paginas_por_cursor(self):
+        for arbol in self.arboles.values():
+            for prefijo in ('l', 'luis', 'día'):
+                paginas, cursor = [], None
+                while True:
+                    pagina = arbol.buscar_prefijo(prefijo, 7, cursor=cursor)
+                    if not pagina:
+                        break
+                    paginas.extend(pagina)
+                    cursor = arbol.cursor_de(self.por_isbn[pagina[-1]])
+                self.assertEqual(paginas, self.todos(arbol, prefijo), prefijo)
+
+    def test_cursor_sigue_valido_tras_cambios(self):
+        # Se elimina el último libro mostrado y se agrega uno antes del cursor
+        arbol = self.arboles['autor']
+        todos = self.todos(arbol, 'eva')
+        ultimo = self.por_isbn[arbol.buscar_prefijo('eva', 10)[-1]]
+        cursor = arbol.cursor_de(ultimo)
+        arbol.eliminar(arbol.obtener_clave(ultimo), ultimo)
+        arbol.insertar(Libro("", "Otro", "Eva", 2000, "g"))
+        self.assertEqual(arbol.buscar_prefijo('eva', 5, cursor=cursor), todos[10:15])
+
+    def test_cursor_de_otro_prefijo(self):
+        # Un cursor anterior al rango del prefijo empieza desde el principio del rango
+        arbol = self.arboles['titulo']
+        cursor = arbol.cursor_de(self.por_isbn[self.todos(arbol, 'día')[0]])
+        self.assertEqual(arbol.buscar_prefijo('sol', 4, cursor=cursor), self.todos(arbol, 'sol')[:4])
+
+
+class TestIndiceInvertido(unittest.TestCase):
+    def setUp(self):
+        self.indice = IndiceInvertido()
+        for libro in libros_aleatorios(400):
+            self.indice.agregar(libro)
+
+    def test_limite_igual_al_inicio_del_orden_completo(self):
+        for consulta in ('sol', 'mar luna', 'rio noche', 'poesia', 'cancion sol mar'):
+            todos = self.indice.buscar(consulta)
+            self.assertTrue(todos, consulta)
+            for limite in (0, 1, 7, len(todos), len(todos) + 5):
+                self.assertEqual(self.indice.buscar(consulta, limite), todos[:limite],
+                                 (consulta, limite))
+
+    def test_sin_coincidencias(self):
+        self.assertEqual(self.indice.buscar('inexistente', 5), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
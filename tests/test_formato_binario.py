@@ -0,0 +1,132 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from almacen_columnar import AlmacenColumnarLibros
+from formato_binario import AlmacenInstantanea, HistorialInstantanea
+from main import SistemaBiblioteca
+
+
+def sistema_con_datos():
+    sistema = SistemaBiblioteca()
+    for i in range(60):
+        sistema.agregar_libro(f"B-{i:03d}", f"Título {i}", f"Autor {i % 7}", 1950 + i, "Género")
+    for i in range(5):
+        sistema.agregar_usuario(f"X{i}", f"Lector {i}", f"x{i}@email.com")
+    for i in range(40):
+        exito, mensaje = sistema.registrar_prestamo(f"B-{i:03d}", f"X{i % 5}", f"2023-{1 + i % 12:02d}-10")
+        assert exito, mensaje
+    for i in range(0, 40, 3):
+        sistema.registrar_devolucion(f"P{i + 1:03d}", "2024-01-20")
+    return sistema
+
+
+def estado(sistema):
+    # Todo lo que se puede consultar, como diccionarios (para comparar dos sistemas)
+    return {
+        'libros': [libro.to_dict() for libro in sistema.listar_libros()],
+        'usuarios': [usuario.to_dict() for usuario in sistema.listar_usuarios()],
+        'prestamos': [prestamo.to_dict() for prestamo in sistema.listar_todos_los_prestamos()],
+        'activos': sorted(prestamo.id_prestamo for prestamo in sistema.obtener_prestamos_activos()),
+        'por_usuario': {f"X{i}": [p.id_prestamo for p in sistema.obtener_prestamos_activos_por_usuario(f"X{i}")]
+                        for i in range(5)},
+        'vencidos': [p.id_prestamo for p in sistema.obtener_prestamos_vencidos('2024-06-01')],
+        'retrasos': sistema.calcular_retrasos('2024-06-01'),
+        'disponibles': [libro.isbn for libro in sistema.listar_libros_disponibles()],
+        'contador': sistema.contador_prestamos,
+    }
+
+
+class TestCargaPerezosa(unittest.TestCase):
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp()
+        self.binario = os.path.join(self.directorio, 'datos.bin')
+        self.json = os.path.join(self.directorio, 'datos.json')
+        original = sistema_con_datos()
+        self.assertTrue(original.guardar_datos(self.binario)[0])
+        self.assertTrue(original.guardar_datos(self.json)[0])
+
+    def tearDown(self):
+        shutil.rmtree(self.directorio)
+
+    def cargar(self, archivo):
+        sistema = SistemaBiblioteca()
+        exito, mensaje = sistema.cargar_datos(archivo)
+        self.assertTrue(exito, mensaje)
+        return sistema
+
+    def test_cargar_no_decodifica_registros(self):
+        sistema = self.cargar(self.binario)
+        self.assertIsInstance(sistema.libros, AlmacenInstantanea)
+        self.assertIsInstance(sistema.usuarios, AlmacenInstantanea)
+        self.assertIsInstance(sistema.prestamos, HistorialInstantanea)
+        for registros in (sistema.libros, sistema.usuarios, sistema.prestamos):
+            self.assertTrue(all(objeto is None for objeto in registros._objetos))
+        # Una búsqueda por clave decodifica solo ese registro
+        libro = sistema.buscar_libro_por_isbn("B-010")
+        self.assertEqual(libro.titulo, "Título 10")
+        self.assertEqual(sum(objeto is not None for objeto in sistema.libros._objetos), 1)
+        self.assertIs(sistema.buscar_libro_por_isbn("B-010"), libro)
+
+    def test_mismo_estado_que_el_json(self):
+        self.assertEqual(estado(self.cargar(self.binario)), estado(self.cargar(self.json)))
+
+    def test_operaciones_iguales_que_con_el_json(self):
+        perezoso = self.cargar(self.binario)
+        completo = self.cargar(self.json)
+        for sistema in (perezoso, completo):
+            self.assertTrue(sistema.agregar_libro("N-1", "Nuevo", "Autor", 2001, "g")[0])
+            self.assertFalse(sistema.agregar_libro("B-050", "Repetido", "Autor", 2001, "g")[0])
+            self.assertTrue(sistema.actualizar_libro("B-045", {'isbn': 'B-999', 'titulo': 'Movido'})[0])
+            self.assertTrue(sistema.actualizar_libro("B-046", {'autor': 'Otra'})[0])
+            self.assertTrue(sistema.eliminar_libro("B-055")[0])
+            self.assertTrue(sistema.actualizar_usuario("X1", {'nombre': 'Cambiado'})[0])
+            self.assertTrue(sistema.registrar_prestamo("B-050", "X2", "2024-03-01")[0])
+            self.assertTrue(sistema.registrar_devolucion("P002", "2024-03-05")[0])
+            self.assertFalse(sistema.registrar_devolucion("P004", "2024-03-05")[0])  # Ya devuelto
+            self.assertEqual(sistema.buscar_prestamo_por_id("P041").isbn_libro, "B-050")
+        self.assertEqual(estado(perezoso), estado(completo))
+        self.assertEqual([libro.isbn for libro in perezoso.buscar_libros_por_titulo("tít")],
+                         [libro.isbn for libro in completo.buscar_libros_por_titulo("tít")])
+
+    def test_guardar_sobre_el_mismo_archivo(self):
+        sistema = self.cargar(self.binario)
+        self.assertTrue(sistema.registrar_prestamo("B-050", "X2", "2024-03-01")[0])
+        antes = estado(sistema)
+        self.assertTrue(sistema.guardar_datos(self.binario)[0])
+        # Los registros ya no se leen del archivo reemplazado
+        for registros in (sistema.libros, sistema.usuarios, sistema.prestamos):
+            self.assertFalse(registros.usa_archivo(self.binario))
+        self.assertEqual(estado(sistema), antes)
+        self.assertEqual(estado(self.cargar(self.binario)), antes)
+
+    def test_historial_como_lista(self):
+        sistema = self.cargar(self.binario)
+        completo = self.cargar(self.json)
+        self.assertEqual(len(sistema.prestamos), len(completo.prestamos))
+        self.assertEqual(sistema.prestamos[-1].to_dict(), completo.prestamos[-1].to_dict())
+        self.assertEqual([p.id_prestamo for p in sistema.prestamos[5:9]],
+                         [p.id_prestamo for p in completo.prestamos[5:9]])
+        with self.assertRaises(IndexError):
+            sistema.prestamos[len(sistema.prestamos)]
+
+    def test_almacen_columnar_carga_los_libros(self):
+        sistema = SistemaBiblioteca(AlmacenColumnarLibros())
+        self.assertTrue(sistema.cargar_datos(self.binario)[0])
+        self.assertIsInstance(sistema.libros, AlmacenColumnarLibros)
+        self.assertEqual(estado(sistema), estado(self.cargar(self.json)))
+
+    def test_archivo_dañado(self):
+        with open(self.binario, 'rb') as f:
+            contenido = f.read()
+        with open(self.binario, 'wb') as f:
+            f.write(contenido[:len(contenido) // 2])
+        sistema = SistemaBiblioteca()
+        exito, _ = sistema.cargar_datos(self.binario)
+        self.assertFalse(exito)
+        self.assertIsNotNone(sistema.buscar_libro_por_isbn("978-0142437230"))  # Datos anteriores intactos
+
+
+if __name__ == '__main__':
+    unittest.main()
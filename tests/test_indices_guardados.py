@@ -0,0 +1,127 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from main import SistemaBiblioteca
+
+
+def recorrido(arbol):
+    return [(nodo.clave, nodo.isbn) for nodo in arbol.recorrer_desde('')]
+
+
+def sistema_con_libros(cantidad=500, semilla=1):
+    sistema = SistemaBiblioteca()
+    aleatorio = random.Random(semilla)
+    for i in range(cantidad):
+        sistema.agregar_libro(f"{aleatorio.randint(0, 10**9)}-{i}",
+                              aleatorio.choice(['El', 'la', 'Zeta', 'año']) + str(aleatorio.random()),
+                              aleatorio.choice(['Ana', 'bob', 'Cé']), 1990 + i % 30, 'g')
+    return sistema
+
+
+class TestIndicesGuardados(unittest.TestCase):
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp()
+        self.archivo = os.path.join(self.directorio, 'datos.json')
+        self.indices = self.archivo + '.indices'
+
+    def tearDown(self):
+        shutil.rmtree(self.directorio)
+
+    def test_sin_pedirlo_no_se_escriben(self):
+        sistema = sistema_con_libros()
+        sistema.precalentar_indices()
+        self.assertTrue(sistema.guardar_datos(self.archivo)[0])
+        self.assertFalse(os.path.exists(self.indices))
+
+    def test_solo_arboles_construidos(self):
+        sistema = sistema_con_libros()
+        # Ningún árbol construido: no hay nada que guardar (no se ordena para guardar)
+        self.assertTrue(sistema.guardar_datos(self.archivo, indices=True)[0])
+        self.assertFalse(os.path.exists(self.indices))
+
+        sistema.precalentar_indices(['arbol_libros_titulo'])
+        self.assertTrue(sistema.guardar_datos(self.archivo, indices=True)[0])
+        otro = SistemaBiblioteca()
+        self.assertTrue(otro.cargar_datos(self.archivo)[0])
+        self.assertEqual(set(otro._ordenes_guardados[1]), {'arbol_libros_titulo'})
+        self.assertEqual(recorrido(otro.arbol_libros_titulo), recorrido(sistema.arbol_libros_titulo))
+
+    def test_carga_con_orden_guardado(self):
+        for extension in ('.json', '.bin'):
+            archivo = os.path.join(self.directorio, 'datos' + extension)
+            sistema = sistema_con_libros()
+            sistema.precalentar_indices(SistemaBiblioteca.INDICES_GUARDADOS)
+            self.assertTrue(sistema.guardar_datos(archivo, indices=True)[0])
+            otro = SistemaBiblioteca()
+            self.assertTrue(otro.cargar_datos(archivo)[0])
+            self.assertIsNotNone(otro._ordenes_guardados)
+            for nombre in SistemaBiblioteca.INDICES_GUARDADOS:
+                self.assertEqual(recorrido(getattr(otro, nombre)), recorrido(getattr(sistema, nombre)), nombre)
+
+    def test_huella_distinta_se_ignora(self):
+        sistema = sistema_con_libros()
+        sistema.precalentar_indices(SistemaBiblioteca.INDICES_GUARDADOS)
+        self.assertTrue(sistema.guardar_datos(self.archivo, indices=True)[0])
+        indices_viejos = open(self.indices, 'rb').read()
+
+        # Los datos cambian y el .indices anterior vuelve a quedar junto al archivo nuevo
+        sistema.agregar_libro("999", "Nuevo", "X", 2000, 'g')
+        self.assertTrue(sistema.guardar_datos(self.archivo)[0])
+        with open(self.indices, 'wb') as f:
+            f.write(indices_viejos)
+
+        otro = SistemaBiblioteca()
+        self.assertTrue(otro.cargar_datos(self.archivo)[0])
+        self.assertIsNone(otro._ordenes_guardados)
+        self.assertIn(('nuevo', '999'), recorrido(otro.arbol_libros_titulo))
+        self.assertEqual(recorrido(otro.arbol_libros_titulo), recorrido(sistema.arbol_libros_titulo))
+
+    def test_modificar_tras_cargar_invalida_el_orden(self):
+        sistema = sistema_con_libros()
+        sistema.precalentar_indices(SistemaBiblioteca.INDICES_GUARDADOS)
+        sistema.guardar_datos(self.archivo, indices=True)
+        otro = SistemaBiblioteca()
+        otro.cargar_datos(self.archivo)
+        otro.agregar_libro("998", "Otro", "Y", 2001, "g")
+        self.assertIsNone(otro._orden_guardado('arbol_libros_titulo'))
+        self.assertIn(('otro', '998'), recorrido(otro.arbol_libros_titulo))
+
+    def test_guardar_sin_indices_borra_el_anterior(self):
+        sistema = sistema_con_libros()
+        sistema.precalentar_indices(SistemaBiblioteca.INDICES_GUARDADOS)
+        sistema.guardar_datos(self.archivo, indices=True)
+        self.assertTrue(os.path.exists(self.indices))
+        sistema.agregar_libro("997", "Más", "Z", 2002, "g")
+        self.assertTrue(sistema.guardar_cambios(self.archivo)[0])
+        self.assertFalse(os.path.exists(self.indices))
+
+    def test_autoguardado_actualiza_los_ordenes(self):
+        sistema = sistema_con_libros()
+        sistema.precalentar_indices(SistemaBiblioteca.INDICES_GUARDADOS)
+        sistema.guardar_datos(self.archivo, indices=True)
+        sistema.agregar_libro("996", "Autoguardado", "W", 2003, "g")
+        self.assertTrue(sistema.guardar_cambios(self.archivo, indices=True)[0])
+        otro = SistemaBiblioteca()
+        otro.cargar_datos(self.archivo)
+        self.assertIsNotNone(otro._ordenes_guardados)
+        self.assertEqual(recorrido(otro.arbol_libros_autor), recorrido(sistema.arbol_libros_autor))
+
+    def test_orden_cargado_se_conserva_sin_construir_el_arbol(self):
+        sistema = sistema_con_libros()
+        sistema.precalentar_indices(SistemaBiblioteca.INDICES_GUARDADOS)
+        sistema.guardar_datos(self.archivo, indices=True)
+        otro = SistemaBiblioteca()
+        otro.cargar_datos(self.archivo)
+        # Sin usar los árboles ni modificar datos: el orden leído sigue valiendo
+        self.assertTrue(otro.guardar_datos(self.archivo, indices=True)[0])
+        tercero = SistemaBiblioteca()
+        tercero.cargar_datos(self.archivo)
+        self.assertEqual(set(tercero._ordenes_guardados[1]), set(SistemaBiblioteca.INDICES_GUARDADOS))
+        self.assertEqual(recorrido(tercero.arbol_libros_isbn), recorrido(sistema.arbol_libros_isbn))
+
+
+if __name__ == '__main__':
+    unittest.main()
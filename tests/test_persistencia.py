@@ -0,0 +1,88 @@
+import io
+import json
+import unittest
+from unittest import mock
+
+import persistencia
+from persistencia import escribir_json_streaming, leer_json_streaming
+
+
+DATOS = {
+    'libros': [{'isbn': '1', 'titulo': 'Año "uno"', 'año_publicacion': 1999, 'disponible': True},
+               {'isbn': '2', 'titulo': 'B\\n', 'etiquetas': ['a', {'b': None}], 'vacio': {}},
+               {}],
+    'usuarios': [],
+    'configuracion': {'zona': 'América/Lima', 'límites': {'prestamos': 3, 'dias': [7, 14]}, 'tasa': 0.5},
+    'plano': {'a': 1, 'b': 'dos'},
+    'vacia': {},
+    'nombre': 'biblioteca',
+    'contador_prestamos': 12,
+    'nulo': None,
+}
+
+
+def escribir(datos, compacto):
+    salida = io.StringIO()
+    escribir_json_streaming(salida, [(clave, iter(valor) if isinstance(valor, list) else valor)
+                                     for clave, valor in datos.items()], compacto)
+    return salida.getvalue()
+
+
+def leer(texto):
+    datos = {}
+    for clave, valor in leer_json_streaming(io.StringIO(texto)):
+        datos.setdefault(clave, [])
+        datos[clave].append(valor)
+    return datos
+
+
+def agrupar(datos):
+    # Forma en que leer_json_streaming entrega los datos: los arreglos elemento por elemento
+    return {clave: list(valor) if isinstance(valor, list) else [valor]
+            for clave, valor in datos.items() if valor != []}
+
+
+class TestEscrituraJSON(unittest.TestCase):
+    def test_legible_igual_a_json_dump(self):
+        self.assertEqual(escribir(DATOS, False), json.dumps(DATOS, indent=2, ensure_ascii=False))
+
+    def test_compacto_lo_lee_json_load(self):
+        self.assertEqual(json.loads(escribir(DATOS, True)), DATOS)
+
+
+class TestLecturaJSON(unittest.TestCase):
+    def test_ida_y_vuelta(self):
+        for texto in (escribir(DATOS, False), escribir(DATOS, True),
+                      json.dumps(DATOS), json.dumps(DATOS, indent=4, ensure_ascii=False)):
+            self.assertEqual(leer(texto), agrupar(DATOS))
+
+    def test_bloques_pequeños(self):
+        # Valores cortados entre bloques, incluidos números al final del buffer
+        texto = json.dumps(DATOS, indent=2, ensure_ascii=False)
+        for tamanio in (1, 2, 3, 7):
+            with mock.patch.object(persistencia, 'TAMANIO_BLOQUE', tamanio):
+                self.assertEqual(leer(texto), agrupar(DATOS))
+                self.assertEqual(leer('{"n": 12345}'), {'n': [12345]})
+
+    def test_objeto_vacio(self):
+        self.assertEqual(leer('  {\n}\n'), {})
+
+    def test_rechaza_lo_que_rechaza_json_load(self):
+        for texto in ('{"a": 1} x', '{"a": 1}}', '{"a": [1]}{"b": 2}', '{} 0', '{"a": 1',
+                      '{"a" 1}', '', '{"a": [1 2]}'):
+            with self.assertRaises(ValueError, msg=texto):
+                json.loads(texto)
+            with mock.patch.object(persistencia, 'TAMANIO_BLOQUE', 4):
+                with self.assertRaises(ValueError, msg=texto):
+                    leer(texto)
+
+    def test_solo_objetos(self):
+        with self.assertRaises(ValueError):
+            leer('[1, 2]')
+
+    def test_espacios_al_final(self):
+        self.assertEqual(leer('{"a": 1}\n\n  \t'), {'a': [1]})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import date
+
+from main import SistemaBiblioteca
+from prestamo import Prestamo, dia_a_fecha, fecha_a_dia
+
+
+class TestFechaADia(unittest.TestCase):
+    def test_formato_completo(self):
+        self.assertEqual(fecha_a_dia('2023-01-05'), date(2023, 1, 5).toordinal())
+        self.assertEqual(dia_a_fecha(fecha_a_dia('2024-02-29')), '2024-02-29')
+        self.assertIsNone(fecha_a_dia(None))
+
+    def test_fechas_sin_ceros_como_strptime(self):
+        # Formas que aceptaba datetime.strptime(fecha, "%Y-%m-%d")
+        for fecha in ('2023-1-5', '2023-01-5', '2023-1-05'):
+            self.assertEqual(fecha_a_dia(fecha), date(2023, 1, 5).toordinal(), fecha)
+
+    def test_fechas_invalidas(self):
+        for fecha in ('2023-02-30', '2023/01/05', '05-01-2023', '', 'hoy'):
+            with self.assertRaises(ValueError, msg=fecha):
+                fecha_a_dia(fecha)
+
+    def test_prestamo_con_fecha_antigua(self):
+        prestamo = Prestamo.from_dict({'id_prestamo': 'P001', 'isbn_libro': '1', 'id_usuario': 'U1',
+                                       'fecha_prestamo': '2023-1-5', 'fecha_devolucion': '2023-2-1',
+                                       'activo': False})
+        self.assertEqual(prestamo.fecha_prestamo, '2023-01-05')
+        self.assertEqual(prestamo.fecha_devolucion, '2023-02-01')
+
+
+class TestCargaConFechasAntiguas(unittest.TestCase):
+    def test_archivo_con_fecha_sin_ceros_se_carga(self):
+        sistema = SistemaBiblioteca()
+        sistema.registrar_prestamo("978-0142437230", "U001", "2023-01-05")
+        with tempfile.TemporaryDirectory() as directorio:
+            archivo = os.path.join(directorio, 'datos.json')
+            self.assertTrue(sistema.guardar_datos(archivo)[0])
+            with open(archivo, encoding='utf-8') as f:
+                datos = json.load(f)
+            datos['prestamos'][0]['fecha_prestamo'] = '2023-1-5'
+            with open(archivo, 'w', encoding='utf-8') as f:
+                json.dump(datos, f)
+
+            otro = SistemaBiblioteca()
+            exito, mensaje = otro.cargar_datos(archivo)
+            self.assertTrue(exito, mensaje)
+            self.assertEqual(otro.buscar_prestamo_por_id('P001').fecha_prestamo, '2023-01-05')
+
+
+if __name__ == '__main__':
+    unittest.main()
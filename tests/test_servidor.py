@@ -0,0 +1,138 @@
+import asyncio
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import unittest
+
+from cliente import ClienteBiblioteca, ErrorServidor
+from main import SistemaBiblioteca
+from protocolo import codificar, decodificar
+from servidor import ServidorBiblioteca
+
+
+@unittest.skipUnless(hasattr(socket, 'AF_UNIX'), "Requiere sockets Unix")
+class TestServidor(unittest.TestCase):
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp()
+        self.archivo = os.path.join(self.directorio, 'datos.json')
+        self.ruta_socket = os.path.join(self.directorio, 'servidor.sock')
+        self.sistema = SistemaBiblioteca()
+        self.servidor = ServidorBiblioteca(self.sistema, self.archivo)
+        # El servidor corre en su propio bucle de eventos, en otro hilo
+        self.bucle = asyncio.new_event_loop()
+        self.hilo = threading.Thread(target=self.bucle.run_forever, daemon=True)
+        self.hilo.start()
+        self.ejecutar(self.servidor.iniciar(ruta_socket=self.ruta_socket))
+
+    def tearDown(self):
+        self.ejecutar(self._detener())
+        self.servidor.cerrar()
+        self.bucle.call_soon_threadsafe(self.bucle.stop)
+        self.hilo.join()
+        self.bucle.close()
+        shutil.rmtree(self.directorio)
+
+    def ejecutar(self, corrutina):
+        return asyncio.run_coroutine_threadsafe(corrutina, self.bucle).result(5)
+
+    async def _detener(self):
+        # Deja de aceptar conexiones y corta las que quedaron abiertas
+        self.servidor._servidor.close()
+        tareas = asyncio.all_tasks() - {asyncio.current_task()}
+        for tarea in tareas:
+            tarea.cancel()
+        await asyncio.gather(*tareas, return_exceptions=True)
+
+    def cliente(self):
+        cliente = ClienteBiblioteca(ruta_socket=self.ruta_socket, tiempo_espera=5)
+        self.addCleanup(cliente.cerrar)
+        return cliente
+
+    def bloquear(self, nombre, hasta):
+        # Reemplaza una consulta del sistema por una que espera a `hasta` antes de ejecutarse
+        original = getattr(self.sistema, nombre)
+        def bloqueada(*args, **kwargs):
+            self.assertTrue(hasta.wait(5))
+            return original(*args, **kwargs)
+        setattr(self.sistema, nombre, bloqueada)
+
+    def test_respuestas_fuera_de_orden_por_id(self):
+        continuar = threading.Event()
+        self.bloquear('buscar_libros_por_titulo', continuar)
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conexion:
+            conexion.settimeout(5)
+            conexion.connect(self.ruta_socket)
+            entrada = conexion.makefile('rb')
+            conexion.sendall(codificar({'id': 1, 'op': 'buscar_libros_por_titulo', 'args': ['1984']})
+                             + codificar({'id': 2, 'op': 'buscar_libro_por_isbn', 'args': ['978-0061120084']}))
+            # La segunda solicitud se responde mientras la primera sigue en curso
+            segunda = decodificar(entrada.readline())
+            self.assertEqual(segunda['id'], 2)
+            self.assertEqual(segunda['resultado'].titulo, "To Kill a Mockingbird")
+            continuar.set()
+            primera = decodificar(entrada.readline())
+            self.assertEqual(primera['id'], 1)
+            self.assertEqual([libro.isbn for libro in primera['resultado']], ['978-0142437230'])
+            entrada.close()
+
+    def test_cliente_ubica_las_respuestas_por_id(self):
+        # La primera consulta termina después de que se ejecuta la segunda
+        segunda_ejecutada = threading.Event()
+        self.bloquear('buscar_libros_por_titulo', segunda_ejecutada)
+        original = self.sistema.listar_usuarios
+        def listar_usuarios():
+            segunda_ejecutada.set()
+            return original()
+        self.sistema.listar_usuarios = listar_usuarios
+        libros, usuarios = self.cliente().llamar_varias([('buscar_libros_por_titulo', ('1984',), {}),
+                                                        ('listar_usuarios', (), {})])
+        self.assertEqual([libro.titulo for libro in libros], ["1984"])
+        self.assertEqual(len(usuarios), 4)
+
+    def test_rechaza_operaciones_fuera_de_la_lista(self):
+        cliente = self.cliente()
+        otro_archivo = os.path.join(self.directorio, 'otro.json')
+        for operacion, args in (('guardar_datos', (otro_archivo,)), ('abrir_diario', (otro_archivo,)),
+                                ('_reconstruir_indices', ()), ('__init__', ())):
+            with self.subTest(operacion):
+                with self.assertRaisesRegex(ErrorServidor, f"Operación desconocida: {operacion}"):
+                    cliente.llamar(operacion, *args)
+        self.assertEqual(os.listdir(self.directorio), ['servidor.sock'])
+        self.assertIsNone(self.sistema.diario)
+        # La conexión sigue atendiendo solicitudes válidas
+        self.assertEqual(cliente.buscar_libro_por_isbn('978-0142437230').titulo, "1984")
+
+    def test_guardar_cambios_usa_el_archivo_del_servidor(self):
+        cliente = self.cliente()
+        self.assertTrue(cliente.agregar_libro('S-1', "Servido", "Autor", 2020, "g")[0])
+        ruta_cliente = os.path.join(self.directorio, 'del_cliente.json')
+        self.assertEqual(cliente.llamar('guardar_cambios', ruta_cliente, archivo=ruta_cliente),
+                         [True, "Datos guardados exitosamente"])
+        self.assertFalse(os.path.exists(ruta_cliente))
+        cargado = SistemaBiblioteca()
+        self.assertTrue(cargado.cargar_datos(self.archivo)[0])
+        self.assertEqual(cargado.buscar_libro_por_isbn('S-1').titulo, "Servido")
+
+    def test_un_solo_prestamo_del_mismo_libro(self):
+        usuarios = ['U001', 'U002', 'U003', 'U004'] * 2
+        clientes = [self.cliente() for _ in usuarios]
+        salida = threading.Barrier(len(clientes))
+        resultados = []
+        def prestar(cliente, id_usuario):
+            salida.wait()
+            resultados.append(cliente.registrar_prestamo('978-0142437230', id_usuario, '2024-01-10'))
+        hilos = [threading.Thread(target=prestar, args=par) for par in zip(clientes, usuarios)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        self.assertEqual(len(resultados), len(clientes))
+        self.assertEqual(sum(exito for exito, _ in resultados), 1)
+        self.assertEqual(len(self.sistema.obtener_prestamos_activos_por_libro('978-0142437230')), 1)
+        self.assertFalse(self.sistema.buscar_libro_por_isbn('978-0142437230').disponible)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+import random
+import types
+import unittest
+
+from main import SistemaBiblioteca
+from sistema_sqlite import SistemaBibliotecaSQLite
+
+PALABRAS = ['Sol', 'Luna', 'Mar', 'Árbol', 'Pérez', 'casa', 'Über', 'noche']
+
+
+def normalizar(resultado):
+    # Libros, usuarios y préstamos como diccionarios, para comparar los dos sistemas
+    if hasattr(resultado, 'to_dict'):
+        return resultado.to_dict()
+    if isinstance(resultado, types.GeneratorType):
+        return list(map(normalizar, resultado))
+    if isinstance(resultado, (list, tuple)):
+        return type(resultado)(map(normalizar, resultado))
+    if isinstance(resultado, dict):
+        return {clave: normalizar(valor) for clave, valor in resultado.items()}
+    return resultado
+
+
+class TestMismosResultados(unittest.TestCase):
+    """Las mismas operaciones sobre SistemaBiblioteca y SistemaBibliotecaSQLite dan lo mismo"""
+
+    def setUp(self):
+        self.memoria = SistemaBiblioteca()
+        self.sqlite = SistemaBibliotecaSQLite(':memory:')
+        self.addCleanup(self.sqlite.cerrar)
+        self.aleatorio = random.Random(7)
+
+    def ambos(self, metodo, *args, **kwargs):
+        en_memoria = normalizar(getattr(self.memoria, metodo)(*args, **kwargs))
+        en_sqlite = normalizar(getattr(self.sqlite, metodo)(*args, **kwargs))
+        if metodo == 'buscar_usuarios_por_nombre':
+            # Sin un orden definido
+            en_memoria, en_sqlite = (sorted(usuarios, key=lambda u: u['id_usuario'])
+                                     for usuarios in (en_memoria, en_sqlite))
+        self.assertEqual(en_memoria, en_sqlite, f"{metodo}{args}{kwargs}")
+        return en_memoria
+
+    def consultar_todo(self):
+        # Todas las consultas públicas de los dos sistemas
+        azar = self.aleatorio
+        prefijo = azar.choice(PALABRAS).lower()[:azar.randrange(1, 4)]
+        isbn = f"I{azar.randrange(60)}"
+        id_usuario = f"U{azar.randrange(20)}"
+        self.ambos('buscar_libro_por_isbn', isbn)
+        self.ambos('buscar_libros_por_titulo', prefijo)
+        self.ambos('buscar_libros_por_autor', prefijo, limite=3, desplazamiento=1)
+        pagina = self.memoria.buscar_libros_por_titulo(prefijo, limite=2)
+        if pagina:
+            cursor = self.memoria.cursor_libro(pagina[-1])
+            self.assertEqual(cursor, self.sqlite.cursor_libro(pagina[-1]))
+            self.ambos('buscar_libros_por_titulo', prefijo, limite=2, cursor=cursor)
+        self.ambos('buscar_libros_por_texto', f"{azar.choice(PALABRAS)} {azar.choice(PALABRAS)}")
+        self.ambos('buscar_libros_por_texto', azar.choice(PALABRAS), limite=2)
+        self.ambos('buscar_libros_por_rango_años', 1920, 1950)
+        self.ambos('iterar_libros_por_rango_años', 1900, 1930)
+        self.ambos('listar_libros')
+        self.ambos('listar_libros_disponibles')
+        self.ambos('buscar_usuario_por_id', id_usuario)
+        self.ambos('buscar_usuarios_por_nombre', prefijo)
+        self.ambos('listar_usuarios')
+        self.ambos('obtener_prestamos_vencidos', '2024-06-01')
+        self.ambos('obtener_prestamos_por_vencer', 20, '2024-05-01')
+        self.ambos('calcular_retrasos', '2024-12-01')
+        self.ambos('obtener_prestamos_activos')
+        self.ambos('obtener_prestamos_activos_por_usuario', id_usuario)
+        self.ambos('obtener_prestamos_activos_por_libro', isbn)
+        self.ambos('buscar_prestamo_por_id', f"P{azar.randrange(1, 60):03d}")
+        self.ambos('listar_todos_los_prestamos')
+        self.ambos('generar_estadisticas_por_año', 1900, 2024)
+        self.ambos('obtener_libros_mas_antiguos', 3)
+        self.ambos('obtener_libros_mas_recientes', 3)
+        self.ambos('obtener_libros_por_antiguedad', 5, mas_recientes=azar.random() < .5,
+                   genero=azar.choice([None, 'FICCIÓN']), solo_disponibles=azar.random() < .5)
+        self.assertEqual(self.memoria.contador_prestamos, self.sqlite.contador_prestamos)
+
+    def test_claves_duplicadas(self):
+        self.consultar_todo()
+        self.assertEqual(self.ambos('actualizar_libro', '978-0142437230', {'isbn': '978-0061120084', 'titulo': 'Otro'}),
+                         (False, "Ya existe un libro con este ISBN"))
+        self.assertEqual(self.ambos('actualizar_usuario', 'U001', {'id_usuario': 'U002', 'nombre': 'Otro'}),
+                         (False, "Ya existe un usuario con este ID"))
+        self.consultar_todo()
+        # Cambiar a una clave libre, con un préstamo activo
+        self.assertTrue(self.ambos('registrar_prestamo', '978-0142437230', 'U001', '2024-01-10')[0])
+        self.assertTrue(self.ambos('actualizar_libro', '978-0142437230', {'isbn': 'I1'})[0])
+        self.assertTrue(self.ambos('actualizar_usuario', 'U001', {'id_usuario': 'U1'})[0])
+        self.ambos('obtener_prestamos_activos_por_libro', 'I1')
+        self.ambos('obtener_prestamos_activos_por_usuario', 'U1')
+        self.consultar_todo()
+
+    def test_secuencia_aleatoria(self):
+        azar = self.aleatorio
+        for _ in range(400):
+            operacion = azar.random()
+            isbn = f"I{azar.randrange(60)}"
+            id_usuario = f"U{azar.randrange(20)}"
+            if operacion < .2:
+                self.ambos('agregar_libro', isbn, ' '.join(azar.choices(PALABRAS, k=2)),
+                           f"{azar.choice(PALABRAS)} {azar.choice(PALABRAS)}", azar.randrange(1900, 2000),
+                           azar.choice(['Ficción', 'ficción', 'Drama']))
+            elif operacion < .27:
+                self.ambos('actualizar_libro', isbn, {'titulo': azar.choice(PALABRAS), 'genero': 'Drama'})
+            elif operacion < .32:
+                # A veces el ISBN nuevo ya es de otro libro
+                self.ambos('actualizar_libro', isbn, {'isbn': f"I{azar.randrange(60)}",
+                                                      'año_publicacion': azar.randrange(1900, 2000)})
+            elif operacion < .36:
+                self.ambos('eliminar_libro', isbn)
+            elif operacion < .45:
+                self.ambos('agregar_usuario', id_usuario, f"{azar.choice(PALABRAS)} {azar.choice(PALABRAS)}", 'c')
+            elif operacion < .5:
+                self.ambos('actualizar_usuario', id_usuario, azar.choice([{'nombre': azar.choice(PALABRAS)},
+                                                                          {'id_usuario': f"U{azar.randrange(20)}"}]))
+            elif operacion < .52:
+                self.ambos('eliminar_usuario', id_usuario)
+            elif operacion < .72:
+                self.ambos('registrar_prestamo', isbn, id_usuario,
+                           f"2024-0{azar.randrange(1, 10)}-1{azar.randrange(10)}")
+            elif operacion < .82:
+                self.ambos('registrar_devolucion', f"P{azar.randrange(1, 60):03d}", "2024-10-01")
+            else:
+                self.consultar_todo()
+        self.consultar_todo()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,6 +4,9 @@ class Usuario:
     Almacena la información básica de los usuarios que pueden realizar préstamos de libros.
     """
     
+    # Atributos fijos: sin __dict__ por instancia para reducir memoria
+    __slots__ = ('id_usuario', 'nombre', 'contacto')
+    
     def __init__(self, id_usuario, nombre, contacto):
         """
         Inicializa un nuevo usuario en el sistema.